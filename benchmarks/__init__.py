@@ -0,0 +1,4 @@
+# benchmarks/__init__.py
+"""
+Módulo de mediciones de rendimiento
+"""
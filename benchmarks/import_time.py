@@ -0,0 +1,98 @@
+# benchmarks/import_time.py - TIEMPO DE ARRANQUE DEL NÚCLEO SIN INTERFAZ
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from config import Config
+
+# Núcleo: simulación, modelos y optimizadores. Debe poder importarse sin
+# pantalla y sin pagar el arranque de Tk, matplotlib ni numpy.
+CORE_MODULES = [
+    "traffic_simulation",
+    "snapshot",
+    "genetic_algorithm",
+    "corridor_optimizer",
+    "checkpoint",
+    "optimizers.registry",
+    "optimizers.simulation_fitness",
+    "optimizers.noisy_evaluation",
+]
+FORBIDDEN_MODULES = ["tkinter", "matplotlib", "numpy"]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+loaded = [m for m in {forbidden!r} if m in sys.modules]
+print(elapsed * 1000, ",".join(loaded))
+"""
+
+
+def measure(modules, repeats=Config.IMPORT_REPEATS):
+    """
+    Importa `modules` en un intérprete nuevo `repeats` veces.
+    Retorna (mediana en ms, módulos prohibidos que se cargaron).
+    """
+    code = _PROBE.format(imports="\n".join(f"import {m}" for m in modules),
+                         forbidden=FORBIDDEN_MODULES)
+    times = []
+    loaded = set()
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout.split()
+        times.append(float(output[0]))
+        if len(output) > 1:
+            loaded.update(output[1].split(","))
+    return statistics.median(times), sorted(loaded)
+
+
+def slowest_imports(modules, top=10):
+    """Módulos con mayor tiempo acumulado según `python -X importtime`"""
+    code = "\n".join(f"import {m}" for m in modules)
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            check=True, capture_output=True, text=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el tiempo de importación del núcleo")
+    parser.add_argument("--budget-ms", type=float, default=Config.IMPORT_BUDGET_MS,
+                        help="Tiempo máximo permitido para importar todo el núcleo")
+    parser.add_argument("--repeats", type=int, default=Config.IMPORT_REPEATS)
+    parser.add_argument("--details", action="store_true",
+                        help="Muestra los imports más lentos (python -X importtime)")
+    args = parser.parse_args()
+
+    failed = False
+    for module in CORE_MODULES:
+        ms, loaded = measure([module], args.repeats)
+        flag = f"  ❌ carga {', '.join(loaded)}" if loaded else ""
+        print(f"   {module:<32} {ms:7.1f} ms{flag}")
+        failed |= bool(loaded)
+
+    total_ms, loaded = measure(CORE_MODULES, args.repeats)
+    within = total_ms <= args.budget_ms
+    print(f"{'✅' if within else '❌'} Núcleo completo: {total_ms:.1f} ms "
+          f"(presupuesto {args.budget_ms:.0f} ms)")
+    failed |= not within or bool(loaded)
+
+    if args.details or failed:
+        print("\n🐢 Imports más lentos (acumulado):")
+        for cumulative, name in slowest_imports(CORE_MODULES):
+            print(f"   {cumulative / 1000:7.1f} ms  {name}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+# benchmarks/suite.py - SUITE DE RENDIMIENTO CON LÍNEA BASE Y DETECCIÓN DE REGRESIONES
+"""
+    python -m benchmarks.suite --save benchmarks/baseline.json   # guardar línea base
+    python -m benchmarks.suite --compare benchmarks/baseline.json  # falla si empeora
+
+La línea base depende de la máquina: se genera en la misma donde se compara.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from config import Config
+
+BENCHMARKS = []
+
+
+def benchmark(func):
+    """Registra una función que retorna {métrica: (valor, unidad, 'lower'|'higher')}"""
+    BENCHMARKS.append(func)
+    return func
+
+
+def best_of(func, repeats=Config.BENCH_REPEATS):
+    """Mejor tiempo (segundos) de `repeats` ejecuciones: el menos afectado por ruido"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _populated_simulation(vehicles, seed=0, snapshots=True):
+    """Simulación con `vehicles` vehículos ya en la red, repartidos por los carriles"""
+    from traffic_simulation import TrafficSimulation
+
+    simulation = TrafficSimulation(total_vehicles=0, rng=random.Random(seed), snapshots=snapshots)
+    simulation.start()
+    rng = simulation.rng
+    for _ in range(vehicles):
+        simulation.spawn_vehicle()
+        vehicle = simulation.vehicles[-1]
+        # A lo largo de su recorrido, no todos amontonados en la entrada
+        t = rng.random()
+        vehicle.x += (vehicle.target_x - vehicle.x) * t * 0.9
+        vehicle.y += (vehicle.target_y - vehicle.y) * t * 0.9
+    return simulation
+
+
+# ==================== SIMULACIÓN ====================
+
+@benchmark
+def bench_update():
+    results = {}
+    for vehicles, ticks in ((100, 50), (1000, 10), (10000, 2)):
+        simulation = _populated_simulation(vehicles)
+        state = [(v.x, v.y, v.completed) for v in simulation.vehicles]
+        vehicles_list = simulation.vehicles[:]
+
+        def run():
+            # Mismo estado inicial en cada repetición
+            simulation.vehicles[:] = vehicles_list
+            for v, (x, y, completed) in zip(vehicles_list, state):
+                v.x, v.y, v.completed = x, y, completed
+            for _ in range(ticks):
+                simulation.update(Config.SIM_TIMESTEP)
+
+        results[f"update_{vehicles}_vehicles"] = (best_of(run) / ticks * 1000, "ms/tick", "lower")
+    return results
+
+
+@benchmark
+def bench_nearest_light():
+    from models.traffic_light import TrafficLight
+
+    results = {}
+    for side in (3, 10, 30):
+        simulation = _populated_simulation(1000, snapshots=False)
+        # Grilla side×side de semáforos separados como en el mapa original
+        simulation.traffic_lights = [
+            TrafficLight(r * side + c, 250 + c * 300, 200 + r * 250)
+            for r in range(side) for c in range(side)
+        ]
+        vehicles = simulation.vehicles
+
+        def run():
+            for vehicle in vehicles:
+                vehicle.get_nearest_light()
+
+        per_call = best_of(run) / len(vehicles)
+        results[f"nearest_light_{side * side}_lights"] = (per_call * 1e6, "us/call", "lower")
+    return results
+
+
+@benchmark
+def bench_actuated():
+    """Controladores actuados: debe costar menos que una evaluación del AG por segundo simulado"""
+    from models.traffic_light import TrafficLight
+
+    rng = random.Random(0)
+    lights = []
+    for k in range(1000):
+        light = TrafficLight(k, 0, 0, rng.randint(20, 50), rng.randint(0, 59))
+        light.set_actuated(True)
+        lights.append(light)
+    ticks = int(1 / Config.SIM_TIMESTEP)  # Un segundo simulado
+
+    def run():
+        for _ in range(ticks):
+            for light in lights:
+                if rng.random() < 0.3:
+                    light.detect(rng.random() < 0.5)
+                light.advance(Config.SIM_TIMESTEP)
+
+    return {"actuated_1000_lights_per_sim_second": (best_of(run) * 1000, "ms", "lower")}
+
+
+# ==================== OPTIMIZACIÓN ====================
+
+def _traffic_data():
+    simulation = _populated_simulation(60, snapshots=False)
+    return simulation.snapshot.traffic_data()
+
+
+@benchmark
+def bench_fitness():
+    from genetic_algorithm import GeneticAlgorithm
+
+    ga = GeneticAlgorithm(num_intersections=6)
+    data = _traffic_data()
+    rng = random.Random(0)
+    individuals = [[[rng.randint(Config.GA_MIN_GREEN_TIME, Config.GA_MAX_GREEN_TIME),
+                     rng.randint(0, Config.GA_CYCLE_TIME - 1)] for _ in range(6)]
+                   for _ in range(2000)]
+
+    def run():
+        for individual in individuals:
+            ga._fitness(individual, data)
+
+    return {"fitness_evals_per_second": (len(individuals) / best_of(run), "evals/s", "higher")}
+
+
+@benchmark
+def bench_ga_generation():
+    from genetic_algorithm import GeneticAlgorithm
+
+    data = _traffic_data()
+    results = {}
+    for population in (60, 120, 480):
+        def run():
+            random.seed(0)
+            ga = GeneticAlgorithm(num_intersections=6)
+            ga.population_size = population
+            ga.generations = 1  # Incluye crear y evaluar la población inicial
+            ga.optimize(data)
+
+        results[f"ga_generation_pop_{population}"] = (best_of(run) * 1000, "ms", "lower")
+    return results
+
+
+@benchmark
+def bench_robust():
+    from demand import DemandProfile
+    from optimizers.robust_evaluation import RobustBatchEvaluator, ScenarioBatch
+
+    evaluator = RobustBatchEvaluator(ScenarioBatch(DemandProfile.constant(0.4, 120), scenarios=32))
+    rng = random.Random(0)
+    plans = [[[rng.randint(20, 55), rng.randint(0, 59)] for _ in range(6)] for _ in range(4)]
+    ms = best_of(lambda: evaluator.summarize(plans), repeats=2) * 1000
+    return {"robust_4_plans_32_scenarios": (ms, "ms", "lower")}
+
+
+@benchmark
+def bench_ctm():
+    from optimizers.ctm import CTMEvaluator
+
+    evaluator = CTMEvaluator()  # Una hora de demanda base
+    rng = random.Random(0)
+    plans = [[[rng.randint(20, 55), rng.randint(0, 59)] for _ in range(6)]
+             for _ in range(Config.GA_POPULATION_SIZE)]
+    ms = best_of(lambda: evaluator.evaluate(plans), repeats=2) * 1000
+    return {"ctm_hour_ms_per_plan": (ms / len(plans), "ms", "lower")}
+
+
+# ==================== DIBUJO ====================
+
+@benchmark
+def bench_draw():
+    """Requiere Tk con pantalla (o Xvfb); si no hay, se omite"""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as exc:  # ImportError o TclError sin pantalla
+        print(f"   ⚠️ Dibujo omitido: {exc}")
+        return {}
+
+    from gui.renderer import SceneRenderer
+
+    try:
+        root.withdraw()
+        canvas = tk.Canvas(root, width=Config.CANVAS_WIDTH, height=Config.CANVAS_HEIGHT)
+        simulation = _populated_simulation(300)
+        renderer = SceneRenderer(canvas)
+        renderer.render(simulation)
+
+        def full():
+            simulation.draw(canvas)
+            root.update_idletasks()
+
+        def retained():
+            simulation.update(Config.SIM_TIMESTEP)
+            renderer.render(simulation)
+            root.update_idletasks()
+
+        full_ms = best_of(full) * 1000
+        canvas.delete("all")
+        renderer.clear()
+        retained_ms = best_of(retained) * 1000
+    finally:
+        root.destroy()
+    return {"draw_full_300_vehicles": (full_ms, "ms/frame", "lower"),
+            "render_retained_300_vehicles": (retained_ms, "ms/frame", "lower")}
+
+
+# ==================== LÍNEA BASE ====================
+
+def run_all(selected=None):
+    metrics = {}
+    for func in BENCHMARKS:
+        name = func.__name__[len("bench_"):]
+        if selected and name not in selected:
+            continue
+        print(f"⏱️ {name}...")
+        for metric, (value, unit, better) in func().items():
+            metrics[metric] = {"value": value, "unit": unit, "better": better}
+            print(f"   {metric:<34} {value:12.3f} {unit}")
+    return metrics
+
+
+def compare(metrics, baseline, threshold):
+    """Lista de (métrica, base, actual, cambio relativo) que empeoraron más que `threshold`"""
+    regressions = []
+    print(f"\n{'Métrica':<34}{'Base':>12}{'Actual':>12}{'Cambio':>10}")
+    for metric, current in metrics.items():
+        base = baseline.get(metric)
+        if base is None or base["value"] == 0:
+            print(f"{metric:<34}{'-':>12}{current['value']:>12.3f}{'nuevo':>10}")
+            continue
+        change = (current["value"] - base["value"]) / base["value"]
+        worse = change if current["better"] == "lower" else -change
+        mark = "❌" if worse > threshold else ("✅" if worse < -threshold else "  ")
+        print(f"{metric:<34}{base['value']:>12.3f}{current['value']:>12.3f}{change:>+9.1%} {mark}")
+        if worse > threshold:
+            regressions.append((metric, base["value"], current["value"], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de rendimiento",
+                                     epilog="Ver el docstring de benchmarks/suite.py")
+    parser.add_argument("--save", metavar="JSON", help="Guardar los resultados como línea base")
+    parser.add_argument("--compare", metavar="JSON", help="Comparar contra una línea base")
+    parser.add_argument("--threshold", type=float, default=Config.BENCH_THRESHOLD,
+                        help="Empeoramiento relativo tolerado (0.15 = 15%%)")
+    parser.add_argument("--only", nargs="*", help="Subconjunto: update, nearest_light, actuated, "
+                                                  "fitness, ga_generation, robust, ctm, draw")
+    args = parser.parse_args()
+
+    metrics = run_all(args.only)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"machine": platform.platform(), "python": platform.python_version(),
+                       "created": time.strftime("%Y-%m-%d %H:%M:%S"), "metrics": metrics},
+                      f, indent=2)
+        print(f"💾 Línea base guardada en {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["metrics"]
+        regressions = compare(metrics, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regresiones por encima de {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"\n✅ Sin regresiones por encima de {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# checkpoint.py - PUNTOS DE CONTROL DE OPTIMIZACIONES LARGAS
+import gzip
+import logging
+import os
+import pickle
+import queue
+import re
+import tempfile
+import threading
+
+log = logging.getLogger(__name__)
+
+CHECKPOINT_PATTERN = re.compile(r"^ga_gen(\d+)\.ckpt$")
+
+
+def checkpoint_path(directory, generation):
+    return os.path.join(directory, f"ga_gen{generation:05d}.ckpt")
+
+
+def list_checkpoints(directory):
+    """Checkpoints del directorio ordenados por generación"""
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    for name in os.listdir(directory):
+        match = CHECKPOINT_PATTERN.match(name)
+        if match:
+            found.append((int(match.group(1)), os.path.join(directory, name)))
+    return [path for _, path in sorted(found)]
+
+
+def latest_checkpoint(directory):
+    checkpoints = list_checkpoints(directory)
+    return checkpoints[-1] if checkpoints else None
+
+
+def save_checkpoint(path, state):
+    """Escritura atómica: archivo temporal en el mismo directorio + os.replace"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_checkpoint(path):
+    with gzip.open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class CheckpointWriter:
+    """
+    Escribe checkpoints en un hilo en segundo plano para no frenar el bucle
+    de optimización. Conserva solo los `keep` más recientes.
+    """
+
+    def __init__(self, directory, keep=2):
+        self.directory = directory
+        self.keep = keep
+        self.error = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, generation, state):
+        """`state` no debe modificarse después de enviarse"""
+        self._queue.put((generation, state))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            generation, state = item
+            try:
+                save_checkpoint(checkpoint_path(self.directory, generation), state)
+                for old in list_checkpoints(self.directory)[:-self.keep]:
+                    os.remove(old)
+            except OSError as exc:
+                self.error = exc
+                log.warning("⚠️ No se pudo guardar el checkpoint: %s", exc)
+
+    def close(self):
+        """Espera a que se escriban los checkpoints pendientes"""
+        self._queue.put(None)
+        self._thread.join()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Reanuda una optimización desde su último checkpoint")
+    parser.add_argument("directory", help="Directorio de checkpoints")
+    parser.add_argument("--generations", type=int, default=0,
+                        help="Generaciones adicionales a las planificadas originalmente")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    from genetic_algorithm import GeneticAlgorithm
+    result = GeneticAlgorithm.resume(args.directory, extra_generations=args.generations)
+    print(f"🎯 Mejor plan: {result['best_solution']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -68,6 +68,13 @@ class Config:
         {"id": 5, "x": 850, "y": 450},
     ]
 
+    # ==================== SEMÁFOROS Y VEHÍCULOS ====================
+    # Compartidos por la microsimulación y sus modelos vectorizados (robusto, CTM)
+    LIGHT_YELLOW_TIME        = 3    # Amarillo fijo (s); el ciclo es GA_CYCLE_TIME
+    VEHICLE_DETECTION_RADIUS = 80   # Se ve el semáforo (y lo cuenta el detector) (px)
+    VEHICLE_STOP_DISTANCE    = 35   # Línea de detención antes del semáforo (px)
+    VEHICLE_ARRIVAL_DISTANCE = 15   # A esta distancia del destino el vehículo sale (px)
+
     # ==================== ALGORITMO GENÉTICO ====================
     # ==================== ALGORITMO GENÉTICO ====================
     GA_POPULATION_SIZE = 120     # Población más grande para más diversidad
@@ -76,4 +83,114 @@ class Config:
     GA_CROSSOVER_RATE  = 0.82    # Alta tasa de cruce
     GA_MIN_GREEN_TIME  = 25      # Límites realistas
     GA_MAX_GREEN_TIME  = 50
-    GA_CYCLE_TIME      = 60
\ No newline at end of file
+    GA_CYCLE_TIME      = 60
+
+    # ==================== DEMANDA ====================
+    DEMAND_BASE_RATE     = 0.25  # Vehículos/s en toda la red con factor horario 1
+    DEMAND_SLICE_SECONDS = 600   # Segundos simulados por franja horaria en DemandProfile.daily
+    # Factor por hora del día (0 h … 23 h): puntas de mañana y tarde
+    DEMAND_HOURLY_SHAPE = [0.2, 0.15, 0.1, 0.1, 0.15, 0.4, 0.9, 1.6, 1.8, 1.2, 0.9, 0.9,
+                           1.0, 1.0, 0.9, 1.0, 1.3, 1.7, 1.9, 1.4, 0.9, 0.7, 0.5, 0.3]
+
+    # ==================== SEMÁFOROS ACTUADOS ====================
+    ACTUATED_MIN_GREEN = 8      # Verde mínimo (s) antes de poder cambiar
+    ACTUATED_MAX_FACTOR = 1.5   # Verde máximo = verde del plan × factor
+    ACTUATED_GAP = 2.5          # Segundos sin detecciones que terminan el verde
+
+    # ==================== CORREDORES (PROGRAMACIÓN DINÁMICA) ====================
+    CORRIDOR_MAX_SWEEPS = 10     # Barridos filas/columnas del descenso por coordenadas
+    GA_CORRIDOR_SEED    = True   # Sembrar la población del AG con la solución DP
+
+    # ==================== FITNESS POR SIMULACIÓN ====================
+    SIM_FITNESS_DURATION     = 40     # Segundos simulados por réplica
+    SIM_FITNESS_VEHICLES     = 30     # Vehículos iniciales por réplica
+    SIM_MIN_REPLICATIONS     = 2      # Réplicas iniciales por candidato
+    SIM_MAX_REPLICATIONS     = 8      # Tope de réplicas adaptativas
+    SIM_ELITE_FRACTION       = 0.1    # Fracción considerada élite en la carrera
+    SIM_RACING_Z             = 1.5    # Ancho del intervalo de confianza (en errores estándar)
+
+    # ==================== EVALUACIÓN ROBUSTA ====================
+    ROBUST_SCENARIOS   = 32      # Escenarios de demanda por lote
+    ROBUST_CVAR_ALPHA  = 0.9     # CVaR: media del peor 10 % de los escenarios
+    ROBUST_OBJECTIVE   = "cvar"  # Fitness para el AG: "mean", "worst" o "cvar"
+
+    # ==================== MODELO DE TRANSMISIÓN POR CELDAS ====================
+    CTM_DT           = 1.0   # Paso del CTM (s); las celdas miden lo recorrido en un paso
+    CTM_HORIZON      = 3600  # Segundos simulados por evaluación sin perfil explícito
+    CTM_CAPACITY     = 0.5   # Vehículos/s que cruzan un límite de celda (flujo de saturación)
+    CTM_JAM_DENSITY  = 7.0   # Vehículos por celda con la vía detenida
+    CTM_MIN_SPEARMAN = 0.7   # Correlación de rangos mínima en la calibración
+
+    # ==================== CHECKPOINTS ====================
+    GA_CHECKPOINT_EVERY = 10     # Generaciones entre checkpoints
+    GA_CHECKPOINT_KEEP  = 2      # Checkpoints conservados en disco
+
+    # ==================== VISTA (ZOOM / NIVEL DE DETALLE) ====================
+    VIEW_MIN_SCALE     = 0.05    # Zoom mínimo (alejado)
+    VIEW_MAX_SCALE     = 4.0     # Zoom máximo (acercado)
+    VIEW_ZOOM_STEP     = 1.15    # Factor por paso de la rueda del mouse
+    LOD_DOTS_SCALE     = 0.6     # Por debajo: vehículos como puntos
+    LOD_HEATMAP_SCALE  = 0.3     # Por debajo: solo mapa de calor por tramo
+    HEATMAP_COLORS     = ["#2c3e50", "#2ecc71", "#f1c40f", "#e67e22", "#e74c3c"]
+    HEATMAP_MAX_DENSITY = 3.0    # Vehículos cada 100 px para el color más intenso
+
+    # ==================== PLANIFICADOR DE FOTOGRAMAS ====================
+    SIM_TIMESTEP             = UPDATE_INTERVAL / 1000.0  # Paso fijo de la simulación (s)
+    SIM_MAX_STEPS_PER_FRAME  = 200   # Tope de pasos por fotograma (evita la espiral)
+    SIM_SPEED_MAX            = 10.0  # Multiplicador de velocidad máximo
+    RENDER_MAX_SKIPPED       = 3     # Fotogramas seguidos que se pueden saltar con carga
+    OVERLAY_REFRESH          = 0.25  # Segundos entre actualizaciones del overlay
+
+    # ==================== VIDEO SIN PANTALLA ====================
+    VIDEO_FPS        = 30       # Fotogramas por segundo simulado
+    VIDEO_SCALE      = 1.0      # Resolución relativa al canvas
+    VIDEO_FORMAT     = "png"    # Secuencia de imágenes: png | ppm
+    VIDEO_QUEUE_SIZE = 64       # Fotogramas en cola hacia el hilo escritor
+
+    # ==================== GRÁFICO EN VIVO ====================
+    CHART_REFRESH_HZ = 4        # Redibujados por segundo como máximo
+    CHART_MAX_POINTS = 600      # Puntos por serie tras el submuestreo LTTB
+
+    # ==================== OPTIMIZACIÓN EN SEGUNDO PLANO ====================
+    OPTIMIZATION_POLL_MS    = 100   # Cada cuánto revisa Tk la cola de progreso
+    OPTIMIZATION_POLL_BATCH = 500   # Mensajes atendidos como máximo por revisión
+    OPTIMIZATION_FITNESS    = "snapshot"  # "snapshot" (tráfico observado) o "sim" (microsimulación)
+
+    # ==================== RE-OPTIMIZACIÓN CONTINUA ====================
+    ROLLING_PERIOD          = 60    # Segundos simulados entre re-optimizaciones
+    ROLLING_TIME_BUDGET     = 5.0   # Segundos reales máximos por re-optimización
+    ROLLING_MAX_EVALUATIONS = 6000  # Evaluaciones máximas por re-optimización
+    ROLLING_OFFSET_STEP     = 10    # Segundos de offset corregidos por ciclo al transicionar
+
+    # ==================== CACHÉ DE PLANES ====================
+    PLAN_CACHE_PATH        = "plan_cache.json"
+    PLAN_CACHE_SIZE        = 500   # Entradas máximas (se descarta la usada hace más tiempo)
+    PLAN_CACHE_QUANTUM     = 2     # Vehículos por paso al cuantizar colas y flujos
+    PLAN_CACHE_TOLERANCE   = 1     # Distancia (en pasos) para reutilizar un plan tal cual
+    PLAN_CACHE_SEED_RADIUS = 3     # Distancia para usarlo solo como semilla del AG
+    PLAN_CACHE_SEEDS       = 5     # Semillas máximas tomadas del caché
+
+    # ==================== HORARIO DE PLANES ====================
+    SCHEDULE_WARMUP      = 120  # Segundos simulados de cada período antes de medir el tráfico
+    SCHEDULE_GENERATIONS = 60   # Generaciones del AG por período
+
+    # ==================== INSTANTÁNEAS ====================
+    SNAPSHOT_BUFFERS = 3        # Instantáneas retenidas (triple buffer)
+
+    # ==================== MÉTRICAS ====================
+    METRICS_INTERVAL      = 1.0   # Segundos simulados entre muestras de KPIs
+    METRICS_FLUSH_SECONDS = 2.0   # Cada cuánto escribe el hilo escritor (tiempo real)
+    METRICS_BUFFER        = 256   # Capacidad del anillo de muestras
+    METRICS_PORT          = 9108  # Puerto del endpoint /metrics (formato Prometheus)
+
+    # ==================== ARRANQUE ====================
+    IMPORT_BUDGET_MS = 60       # Importación en frío de todo el núcleo sin interfaz
+    IMPORT_REPEATS   = 5        # Mediciones por módulo (se toma la mediana)
+
+    # ==================== EXPERIMENTOS ====================
+    EXPERIMENT_WARMUP     = 30  # Segundos simulados antes de medir el tráfico
+    EXPERIMENT_EVALUATION = 60  # Segundos simulados para medir cada plan
+
+    # ==================== BENCHMARKS ====================
+    BENCH_REPEATS   = 5         # Repeticiones por medición (se toma la mejor)
+    BENCH_THRESHOLD = 0.15      # Empeoramiento relativo que se considera regresión
@@ -0,0 +1,206 @@
+# corridor_optimizer.py - OFFSETS ÓPTIMOS POR CORREDOR (PROGRAMACIÓN DINÁMICA)
+import logging
+import random
+import time
+from config import Config
+from genetic_algorithm import GeneticAlgorithm
+
+log = logging.getLogger(__name__)
+
+
+class CorridorOptimizer:
+    """
+    Optimiza la ola verde resolviendo cada corredor (fila o columna) de forma
+    EXACTA con programación dinámica sobre los offsets discretos del ciclo:
+    O(n × ciclo²) por corredor.
+
+    Para la red completa alterna filas y columnas (descenso por coordenadas):
+    al resolver una fila, los pares verticales con las columnas fijas entran
+    como costo unario, así que cada barrido nunca empeora la sincronización.
+    Al final pule verdes y offsets gen a gen con el fitness completo.
+    """
+
+    def __init__(self, num_intersections=6, cycle_time=Config.GA_CYCLE_TIME):
+        self.num_intersections = num_intersections
+        self.cycle_time = cycle_time
+        self.max_sweeps = Config.CORRIDOR_MAX_SWEEPS
+
+        # Reutiliza los pares y términos del fitness del AG
+        self.ga = GeneticAlgorithm(num_intersections)
+        self.rows = self._build_chains(self.ga.h_pairs)
+        self.cols = self._build_chains(self.ga.v_pairs)
+
+        # Costo de cada par según la diferencia de offsets (tabla ciclo × ciclo)
+        self.h_cost = self._pair_cost_table(self.ga._h_pair_term)
+        self.v_cost = self._pair_cost_table(self.ga._v_pair_term)
+
+        self.sweeps = []
+        self.history = []
+        self.avg_history = []
+        self.min_history = []
+
+    def _build_chains(self, pairs):
+        """Convierte pares (i, j) adyacentes en cadenas [i, j, k, ...]"""
+        successor = {i: j for i, j in pairs}
+        has_predecessor = {j for _, j in pairs}
+        chains = []
+        for node in range(self.num_intersections):
+            if node in has_predecessor:
+                continue
+            chain = [node]
+            while chain[-1] in successor:
+                chain.append(successor[chain[-1]])
+            chains.append(chain)
+        return chains
+
+    def _pair_cost_table(self, pair_term):
+        c = self.cycle_time
+        return [[pair_term(self.ga._circular_diff(a, b)) for b in range(c)]
+                for a in range(c)]
+
+    def solve_chain(self, chain, pair_cost, unary=None):
+        """
+        Offsets óptimos para una cadena de intersecciones.
+        `unary[k][o]` es el costo extra de poner offset o en chain[k].
+        Retorna (costo, offsets)
+        """
+        c = self.cycle_time
+        offsets = range(c)
+        cost = list(unary[0]) if unary else [0] * c
+        back = []
+
+        for k in range(1, len(chain)):
+            new_cost = []
+            choice = []
+            for o in offsets:
+                best_prev = min(offsets, key=lambda p: cost[p] + pair_cost[p][o])
+                value = cost[best_prev] + pair_cost[best_prev][o]
+                if unary:
+                    value += unary[k][o]
+                new_cost.append(value)
+                choice.append(best_prev)
+            cost = new_cost
+            back.append(choice)
+
+        # Reconstrucción hacia atrás
+        last = min(offsets, key=lambda o: cost[o])
+        result = [last]
+        for choice in reversed(back):
+            result.append(choice[result[-1]])
+        result.reverse()
+        return cost[last], result
+
+    def _unary_costs(self, chain, offsets, cross_pairs, cross_cost):
+        """Costo de los pares del otro sentido con los vecinos fijos"""
+        c = self.cycle_time
+        unary = []
+        for node in chain:
+            row = [0] * c
+            for i, j in cross_pairs:
+                if i == node:
+                    fixed = offsets[j]
+                    for o in range(c):
+                        row[o] += cross_cost[o][fixed]
+                elif j == node:
+                    fixed = offsets[i]
+                    for o in range(c):
+                        row[o] += cross_cost[fixed][o]
+            unary.append(row)
+        return unary
+
+    def _pairs_cost(self, offsets):
+        total = 0
+        for i, j in self.ga.h_pairs:
+            total += self.h_cost[offsets[i]][offsets[j]]
+        for i, j in self.ga.v_pairs:
+            total += self.v_cost[offsets[i]][offsets[j]]
+        return total
+
+    def optimize_offsets(self, initial_offsets=None):
+        """Descenso por coordenadas alternando filas y columnas"""
+        if initial_offsets is None:
+            offsets = [random.randint(0, self.cycle_time - 1)
+                       for _ in range(self.num_intersections)]
+        else:
+            offsets = [int(o) % self.cycle_time for o in initial_offsets]
+
+        best_cost = self._pairs_cost(offsets)
+        self.sweeps = [offsets[:]]
+
+        for _ in range(self.max_sweeps):
+            for chains, cost_table, cross_pairs, cross_cost in (
+                    (self.rows, self.h_cost, self.ga.v_pairs, self.v_cost),
+                    (self.cols, self.v_cost, self.ga.h_pairs, self.h_cost)):
+                for chain in chains:
+                    unary = self._unary_costs(chain, offsets, cross_pairs, cross_cost)
+                    _, chain_offsets = self.solve_chain(chain, cost_table, unary)
+                    for node, o in zip(chain, chain_offsets):
+                        offsets[node] = o
+
+            cost = self._pairs_cost(offsets)
+            self.sweeps.append(offsets[:])
+            if cost >= best_cost:
+                break
+            best_cost = cost
+
+        return offsets
+
+    def _polish(self, individual, traffic_data):
+        """Mejora local gen a gen sobre el fitness completo (sin ruido)"""
+        ga = self.ga
+        terms = ga._compute_terms(individual, traffic_data)
+        score = ga._score_terms(terms)
+        improved = True
+        while improved:
+            improved = False
+            for i in range(self.num_intersections):
+                for field, values in ((0, range(Config.GA_MIN_GREEN_TIME, Config.GA_MAX_GREEN_TIME + 1)),
+                                      (1, range(self.cycle_time))):
+                    for value in values:
+                        if value == individual[i][field]:
+                            continue
+                        candidate = [g[:] for g in individual]
+                        candidate[i][field] = value
+                        cand_terms = ga._delta_terms(terms, individual, candidate, {i})
+                        cand_score = ga._score_terms(cand_terms)
+                        if cand_score < score:
+                            individual, terms, score = candidate, cand_terms, cand_score
+                            improved = True
+        return individual, score
+
+    def optimize(self, traffic_data, green_times=None, initial_offsets=None):
+        """
+        Plan completo [green_time, offset] por intersección con el mismo
+        formato de resultado que GeneticAlgorithm.optimize
+        """
+        start = time.perf_counter()
+        offsets = self.optimize_offsets(initial_offsets)
+
+        if green_times is None:
+            green_times = [random.randint(Config.GA_MIN_GREEN_TIME, Config.GA_MAX_GREEN_TIME)
+                           for _ in range(self.num_intersections)]
+        individual = [[int(g), o] for g, o in zip(green_times, offsets)]
+
+        # Historial: fitness completo tras cada barrido y tras el pulido
+        self.history = []
+        for sweep_offsets in self.sweeps:
+            plan = [[int(g), o] for g, o in zip(green_times, sweep_offsets)]
+            self.history.append(round(self.ga._score_terms(
+                self.ga._compute_terms(plan, traffic_data)), 2))
+
+        individual, best_fitness = self._polish(individual, traffic_data)
+        best_fitness = round(best_fitness, 2)
+        self.history.append(best_fitness)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        log.info("🛣️ Corredores optimizados en %.1f ms → Fitness: %.2f", elapsed, best_fitness)
+
+        self.avg_history = self.history[:]
+        self.min_history = self.history[:]
+        return {
+            'best_solution': individual,
+            'best_fitness': best_fitness,
+            'history': self.history,
+            'avg_history': self.avg_history,
+            'min_history': self.min_history
+        }
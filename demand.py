@@ -0,0 +1,182 @@
+# demand.py - DEMANDA POR FRANJAS HORARIAS CON LLEGADAS PRE-MUESTREADAS
+"""
+Perfil de demanda: franjas [inicio, fin) con tasas origen→destino en
+vehículos por segundo. Origen y destino son índices de Config.LANES.
+
+    profile = DemandProfile.daily(base_rate=0.25, slice_seconds=600)
+    schedule = profile.sample(seed=7)      # todas las llegadas de una vez
+    simulation = TrafficSimulation(demand=schedule)
+
+`sample` genera el calendario completo en bloque con numpy (Poisson por
+franja y par OD, tiempos uniformes dentro de la franja) y lo ordena; la
+simulación lo consume con un cursor, sin sortear nada en cada tick. Misma
+semilla → mismas llegadas.
+
+Archivo JSON (ver DemandProfile.load):
+
+    {"slices": [{"start": 0, "end": 600, "rates": {"0": 0.03, "4:4": 0.05}}]}
+
+Una clave "o" equivale a "o:o" (el vehículo sigue por su carril).
+"""
+import bisect
+import json
+from config import Config
+
+
+class TimeSlice:
+    __slots__ = ("start", "end", "rates")
+
+    def __init__(self, start, end, rates):
+        if end <= start:
+            raise ValueError(f"Franja vacía: [{start}, {end})")
+        self.start = start
+        self.end = end
+        self.rates = dict(rates)  # (origen, destino) → vehículos/s
+
+    @property
+    def total_rate(self):
+        return sum(self.rates.values())
+
+
+class DemandProfile:
+    def __init__(self, slices):
+        self.slices = sorted(slices, key=lambda s: s.start)
+        for a, b in zip(self.slices, self.slices[1:]):
+            if b.start < a.end:
+                raise ValueError(f"Franjas superpuestas: [{a.start}, {a.end}) y [{b.start}, {b.end})")
+        self._starts = [s.start for s in self.slices]
+
+    @property
+    def duration(self):
+        return self.slices[-1].end if self.slices else 0.0
+
+    def slice_at(self, t):
+        """Franja vigente en el instante `t` (None fuera del perfil)"""
+        k = bisect.bisect_right(self._starts, t) - 1
+        if k >= 0 and t < self.slices[k].end:
+            return self.slices[k]
+        return None
+
+    def rate_at(self, t):
+        current = self.slice_at(t)
+        return current.total_rate if current else 0.0
+
+    # ==================== CONSTRUCCIÓN ====================
+
+    @staticmethod
+    def uniform_rates(total_rate, lanes=None):
+        """Reparte `total_rate` por igual entre los carriles (cada uno sigue derecho)"""
+        lanes = range(len(Config.LANES)) if lanes is None else lanes
+        lanes = list(lanes)
+        return {(lane, lane): total_rate / len(lanes) for lane in lanes}
+
+    @classmethod
+    def constant(cls, total_rate, duration):
+        return cls([TimeSlice(0.0, duration, cls.uniform_rates(total_rate))])
+
+    @classmethod
+    def daily(cls, base_rate=Config.DEMAND_BASE_RATE, slice_seconds=Config.DEMAND_SLICE_SECONDS,
+              shape=Config.DEMAND_HOURLY_SHAPE):
+        """
+        Un día en franjas de `slice_seconds` simulados (una por hora): la
+        tasa de cada franja es `base_rate` × el factor horario de `shape`,
+        con puntas en la mañana y la tarde
+        """
+        return cls([TimeSlice(h * slice_seconds, (h + 1) * slice_seconds,
+                              cls.uniform_rates(base_rate * factor))
+                    for h, factor in enumerate(shape)])
+
+    @classmethod
+    def from_dict(cls, data):
+        slices = []
+        for item in data["slices"]:
+            rates = {}
+            for key, rate in item["rates"].items():
+                origin, _, destination = str(key).partition(":")
+                rates[(int(origin), int(destination or origin))] = float(rate)
+            slices.append(TimeSlice(float(item["start"]), float(item["end"]), rates))
+        return cls(slices)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def window(self, start, end):
+        """Perfil entre `start` y `end`, desplazado para empezar en 0"""
+        slices = []
+        for current in self.slices:
+            a, b = max(current.start, start), min(current.end, end)
+            if a < b:
+                slices.append(TimeSlice(a - start, b - start, current.rates))
+        return DemandProfile(slices)
+
+    def to_dict(self):
+        return {"slices": [{"start": s.start, "end": s.end,
+                            "rates": {f"{o}:{d}": r for (o, d), r in s.rates.items()}}
+                           for s in self.slices]}
+
+    # ==================== MUESTREO ====================
+
+    def sample(self, seed=None):
+        """Calendario completo de llegadas (vectorizado)"""
+        import numpy as np  # Solo quien pre-muestrea demanda paga la importación
+
+        rng = np.random.default_rng(seed)
+        times, origins, destinations = [], [], []
+        for current in self.slices:
+            pairs = [pair for pair, rate in current.rates.items() if rate > 0]
+            if not pairs:
+                continue
+            rates = np.array([current.rates[pair] for pair in pairs])
+            # Proceso de Poisson: cantidad ~ Poisson(λ·T), tiempos uniformes en la franja
+            counts = rng.poisson(rates * (current.end - current.start))
+            n = int(counts.sum())
+            if n == 0:
+                continue
+            times.append(rng.uniform(current.start, current.end, n))
+            pair_idx = np.repeat(np.arange(len(pairs)), counts)
+            od = np.array(pairs)[pair_idx]
+            origins.append(od[:, 0])
+            destinations.append(od[:, 1])
+
+        if not times:
+            return ArrivalSchedule([], [], [])
+        times = np.concatenate(times)
+        order = np.argsort(times, kind="stable")
+        return ArrivalSchedule(times[order].tolist(), np.concatenate(origins)[order].tolist(),
+                               np.concatenate(destinations)[order].tolist())
+
+
+class ArrivalSchedule:
+    """
+    Llegadas ordenadas por tiempo (listas paralelas) y un cursor. `due`
+    avanza el cursor hasta `now` con una búsqueda binaria: el costo por
+    tick no depende del largo del calendario.
+    """
+
+    def __init__(self, times, origins, destinations):
+        self.times = times
+        self.origins = origins
+        self.destinations = destinations
+        self.cursor = 0
+
+    def __len__(self):
+        return len(self.times)
+
+    def due(self, now):
+        """Pares (origen, destino) que llegan hasta `now` inclusive"""
+        start = self.cursor
+        if start >= len(self.times) or self.times[start] > now:
+            return ()
+        end = bisect.bisect_right(self.times, now, start)
+        self.cursor = end
+        return zip(self.origins[start:end], self.destinations[start:end])
+
+    def rewind(self):
+        """Vuelve al inicio (la simulación reinició su reloj)"""
+        self.cursor = 0
+
+    @property
+    def remaining(self):
+        return len(self.times) - self.cursor
@@ -0,0 +1,274 @@
+# experiments.py - BARRIDOS DE PARÁMETROS SIN INTERFAZ
+"""
+Ejecuta la grilla completa de un barrido (simulación + optimización) en un
+pool de procesos y escribe cada resultado apenas termina.
+
+    python experiments.py barrido.json --out resultados.jsonl --workers 8
+
+Ejemplo de barrido.json (cada lista es un eje de la grilla):
+
+    {
+        "vehicles": [20, 40, 60],
+        "spawn_rate": [0.3, 0.5],
+        "population": [60, 120],
+        "mutation": [0.1, 0.22],
+        "crossover": [0.82],
+        "generations": [80],
+        "seed": [0, 1, 2]
+    }
+
+Si el archivo de resultados ya existe, los trabajos que figuran en él se
+saltan: un barrido interrumpido se reanuda con el mismo comando.
+"""
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from config import Config
+
+# Eje del barrido → valor por defecto si el spec no lo incluye
+SWEEP_DEFAULTS = {
+    "vehicles": 30,
+    "spawn_rate": 0.5,
+    "population": Config.GA_POPULATION_SIZE,
+    "mutation": Config.GA_MUTATION_RATE,
+    "crossover": Config.GA_CROSSOVER_RATE,
+    "generations": Config.GA_GENERATIONS,
+    "seed": 0,
+}
+RESULT_FIELDS = ["job_id"] + list(SWEEP_DEFAULTS) + [
+    "best_fitness", "baseline_wait", "optimized_wait", "improvement",
+    "optimize_seconds", "total_seconds", "error"]
+
+
+def expand_sweep(spec):
+    """Producto cartesiano de los ejes del spec; cada trabajo es un dict"""
+    unknown = set(spec) - set(SWEEP_DEFAULTS) - {"warmup", "evaluation"}
+    if unknown:
+        raise ValueError(f"Ejes desconocidos en el barrido: {', '.join(sorted(unknown))}")
+
+    axes = {}
+    for name, default in SWEEP_DEFAULTS.items():
+        values = spec.get(name, default)
+        axes[name] = values if isinstance(values, list) else [values]
+
+    warmup = spec.get("warmup", Config.EXPERIMENT_WARMUP)
+    evaluation = spec.get("evaluation", Config.EXPERIMENT_EVALUATION)
+    jobs = []
+    for combo in itertools.product(*axes.values()):
+        params = dict(zip(axes, combo))
+        params["warmup"] = warmup
+        params["evaluation"] = evaluation
+        params["job_id"] = job_id(params)
+        jobs.append(params)
+    return jobs
+
+
+def job_id(params):
+    """Identificador estable de un trabajo: mismo barrido → mismos ids"""
+    key = json.dumps({k: params[k] for k in sorted(params) if k != "job_id"}, sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def _average_wait(simulation):
+    total_wait = simulation.total_wait_completed + sum(v.wait_time for v in simulation.vehicles)
+    return total_wait / max(simulation.total_spawned, 1)
+
+
+def _simulate(params, plan=None):
+    """
+    Simulación reproducible del trabajo: misma semilla → misma demanda.
+    Retorna (simulación tras el calentamiento, espera media en la evaluación).
+    """
+    from traffic_simulation import TrafficSimulation
+
+    dt = Config.SIM_TIMESTEP
+    simulation = TrafficSimulation(total_vehicles=params["vehicles"],
+                                   rng=random.Random(params["seed"]), snapshots=False)
+    simulation.spawn_rate_infinite = params["spawn_rate"]
+    simulation.start()
+    for _ in range(int(params["warmup"] / dt)):
+        simulation.update(dt)
+    warm = simulation.snapshot
+
+    # Ambas mediciones arrancan igual: apply_optimization vacía la red y el
+    # generador queda en el mismo estado, así que la demanda es idéntica
+    if plan is None:
+        plan = [[light.green_time, light.offset] for light in simulation.traffic_lights]
+    simulation.apply_optimization(plan)
+    for _ in range(int(params["evaluation"] / dt)):
+        simulation.update(dt)
+    return warm, _average_wait(simulation)
+
+
+def run_job(params):
+    """Un punto de la grilla: calentar, optimizar con el AG y medir el plan"""
+    from genetic_algorithm import GeneticAlgorithm
+
+    start = time.perf_counter()
+    row = {name: params[name] for name in RESULT_FIELDS if name in params}
+    try:
+        # Tráfico observado tras el calentamiento y espera sin optimizar
+        warm, baseline_wait = _simulate(params)
+
+        random.seed(params["seed"])  # El AG usa el generador global
+        ga = GeneticAlgorithm(num_intersections=len(Config.INTERSECTIONS))
+        ga.population_size = params["population"]
+        ga.mutation_rate = params["mutation"]
+        ga.crossover_rate = params["crossover"]
+        ga.generations = params["generations"]
+        optimize_start = time.perf_counter()
+        result = ga.optimize(warm.traffic_data())
+        optimize_seconds = time.perf_counter() - optimize_start
+
+        # Misma demanda con el plan optimizado
+        _, optimized_wait = _simulate(params, result["best_solution"])
+
+        row.update(
+            best_fitness=result["best_fitness"],
+            baseline_wait=round(baseline_wait, 4),
+            optimized_wait=round(optimized_wait, 4),
+            improvement=round((baseline_wait - optimized_wait) / baseline_wait, 4)
+            if baseline_wait > 0 else None,
+            optimize_seconds=round(optimize_seconds, 3),
+            error=None,
+        )
+    except Exception as exc:
+        row["error"] = f"{type(exc).__name__}: {exc}"
+    row["total_seconds"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+# ==================== ARCHIVO DE RESULTADOS ====================
+
+class ResultsFile:
+    """
+    Resultados en JSONL (un objeto por línea) o CSV (columnar), según la
+    extensión. Cada fila se escribe y se vacía a disco apenas llega.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.columnar = path.endswith(".csv")
+        self._file = None
+        self._writer = None
+
+    @staticmethod
+    def _is_done(row):
+        """Fila completa y sin error: los campos numéricos obligatorios se pueden leer"""
+        if not row.get("job_id") or row.get("error"):
+            return False
+        try:
+            float(row["best_fitness"])
+            float(row["total_seconds"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return True
+
+    def completed_ids(self):
+        """Trabajos ya terminados sin error (para reanudar)"""
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path, newline="") as f:
+            text = f.read()
+        # Lo que sigue al último salto de línea es una fila cortada: se rehace el trabajo
+        lines = text[:text.rfind("\n") + 1].splitlines(keepends=True)
+        if self.columnar:
+            rows = list(csv.DictReader(lines))
+        else:
+            rows = []
+            for line in lines:
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass
+        return {row["job_id"] for row in rows if self._is_done(row)}
+
+    def _trim_partial_line(self):
+        """Recorta el archivo hasta su último salto de línea (fila cortada por una interrupción)"""
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def append(self, row):
+        if self._file is None:
+            if os.path.exists(self.path):
+                self._trim_partial_line()
+            new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._file = open(self.path, "a", newline="")
+            if self.columnar:
+                self._writer = csv.DictWriter(self._file, fieldnames=RESULT_FIELDS)
+                if new:
+                    self._writer.writeheader()
+        if self.columnar:
+            self._writer.writerow({k: ("" if row.get(k) is None else row.get(k))
+                                   for k in RESULT_FIELDS})
+        else:
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def run_sweep(jobs, results, workers=None):
+    """Ejecuta los trabajos pendientes en un pool y va guardando resultados"""
+    done = results.completed_ids()
+    pending = [job for job in jobs if job["job_id"] not in done]
+    print(f"🧪 {len(jobs)} trabajos en la grilla, {len(jobs) - len(pending)} ya hechos, "
+          f"{len(pending)} pendientes")
+    if not pending:
+        return
+
+    start = time.perf_counter()
+    failures = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_job, job) for job in pending]
+            for k, future in enumerate(as_completed(futures), 1):
+                row = future.result()
+                results.append(row)
+                failures += bool(row.get("error"))
+                status = (f"❌ {row['error']}" if row.get("error") else
+                          f"espera {row['baseline_wait']:.2f}→{row['optimized_wait']:.2f}")
+                print(f"   [{k}/{len(pending)}] {row['job_id']} {status} "
+                      f"({row['total_seconds']:.1f}s)")
+    finally:
+        results.close()
+    print(f"✅ Barrido terminado en {time.perf_counter() - start:.1f}s"
+          + (f" ({failures} con error; se reintentan al reanudar)" if failures else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Barrido de parámetros sin interfaz",
+                                     epilog="Ver el docstring de experiments.py para el formato")
+    parser.add_argument("spec", help="Archivo JSON con los ejes del barrido")
+    parser.add_argument("--out", default="resultados.jsonl",
+                        help="Resultados (.jsonl o .csv); si existe, se reanuda")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Procesos en paralelo (por defecto, todos los núcleos)")
+    parser.add_argument("--dry-run", action="store_true", help="Solo lista los trabajos")
+    args = parser.parse_args()
+
+    with open(args.spec) as f:
+        jobs = expand_sweep(json.load(f))
+
+    if args.dry_run:
+        for job in jobs:
+            print(json.dumps(job))
+        return
+
+    run_sweep(jobs, ResultsFile(args.out), workers=args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,63 @@
 # genetic_algorithm.py - VERSIÓN CORREGIDA DEFINITIVA
+import logging
+import os
 import random
-import matplotlib
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
+import time
 from config import Config
+from profiling import PROFILER
+
+log = logging.getLogger(__name__)
+
+
+class FitnessTerms:
+    """Contribuciones cacheadas del fitness de un individuo (inmutable una vez creada)"""
+    __slots__ = ("traffic", "green", "h", "v", "green_total", "pair_total",
+                 "green_sum", "green_sq_sum", "green_counts", "offset_counts")
+
+    def __init__(self):
+        self.traffic = 0.0
+        self.green = []          # Término por intersección (tiempo de verde)
+        self.h = []              # Término por par horizontal
+        self.v = []              # Término por par vertical
+        self.green_total = 0
+        self.pair_total = 0
+        self.green_sum = 0       # Para la varianza incremental
+        self.green_sq_sum = 0
+        self.green_counts = {}   # Para el rango de verdes
+        self.offset_counts = {}  # Para los offsets únicos
+
+    def copy(self):
+        terms = FitnessTerms()
+        terms.traffic = self.traffic
+        terms.green = self.green[:]
+        terms.h = self.h[:]
+        terms.v = self.v[:]
+        terms.green_total = self.green_total
+        terms.pair_total = self.pair_total
+        terms.green_sum = self.green_sum
+        terms.green_sq_sum = self.green_sq_sum
+        terms.green_counts = dict(self.green_counts)
+        terms.offset_counts = dict(self.offset_counts)
+        return terms
+
+
+def _counter_remove(counts, key):
+    """Decrementa un contador y elimina la clave si llega a cero"""
+    if counts[key] == 1:
+        del counts[key]
+    else:
+        counts[key] -= 1
+
 
 class GeneticAlgorithm:
-    def __init__(self, num_intersections=6):
+    # Pares de intersecciones adyacentes (calles Este-Oeste y Norte-Sur)
+    H_PAIRS = [(0, 1), (1, 2), (3, 4), (4, 5)]
+    V_PAIRS = [(0, 3), (1, 4), (2, 5)]
+
+    def __init__(self, num_intersections=6, rng=None):
         self.num_intersections = num_intersections
+        # Generador de números aleatorios (por defecto el global del módulo random)
+        self.rng = rng if rng is not None else random
         self.population_size = Config.GA_POPULATION_SIZE
         self.generations = Config.GA_GENERATIONS
         self.mutation_rate = Config.GA_MUTATION_RATE
@@ -16,236 +66,492 @@ class GeneticAlgorithm:
         self.avg_history = []
         self.min_history = []
 
+        # Evaluador externo opcional (optimizers.evaluation.BatchEvaluator).
+        # Si es None se usa el fitness interno con evaluación incremental.
+        self.evaluator = None
+        
+        # Segundos máximos por optimize (None = todas las generaciones)
+        self.time_budget = None
+        # Fitness objetivo: al alcanzarlo termina antes (None = sin objetivo)
+        self.target_fitness = None
+
+        # Pares válidos para esta red y qué pares toca cada gen
+        self.h_pairs = [(i, j) for i, j in self.H_PAIRS
+                        if i < num_intersections and j < num_intersections]
+        self.v_pairs = [(i, j) for i, j in self.V_PAIRS
+                        if i < num_intersections and j < num_intersections]
+        self._h_pairs_of = [[] for _ in range(num_intersections)]
+        self._v_pairs_of = [[] for _ in range(num_intersections)]
+        for p, (i, j) in enumerate(self.h_pairs):
+            self._h_pairs_of[i].append(p)
+            self._h_pairs_of[j].append(p)
+        for p, (i, j) in enumerate(self.v_pairs):
+            self._v_pairs_of[i].append(p)
+            self._v_pairs_of[j].append(p)
+
     def _create_individual(self):
         """Crea un individuo: [green_time, offset]"""
-        return [[random.randint(25, 50), random.randint(0, 59)] 
+        return [[self.rng.randint(25, 50), self.rng.randint(0, 59)] 
                 for _ in range(self.num_intersections)]
 
-    def _fitness(self, individual, traffic_data):
-        """
-        FUNCIÓN DE FITNESS ROBUSTA
-        Retorna un valor donde MENOR es MEJOR
-        """
+    # ==================== TÉRMINOS DEL FITNESS ====================
+    # El fitness se descompone en términos que dependen de pocos genes.
+    # Cada individuo guarda sus contribuciones (FitnessTerms) y un hijo que
+    # difiere de su padre en k genes se re-evalúa actualizando solo esos términos.
+
+    @staticmethod
+    def _circular_diff(offset_i, offset_j):
+        """Diferencia circular entre dos offsets (ciclo de 60 s)"""
+        diff = abs(offset_j - offset_i)
+        if diff > 30:
+            diff = 60 - diff
+        return diff
+
+    @staticmethod
+    def _traffic_term(traffic_data, num_intersections):
+        """Base + penalización de colas - bonificación por flujo"""
         score = 100.0  # Base inicial
-        
-        # ============ 1. PENALIZAR COLAS ============
         total_queue_penalty = 0
-        for i in range(self.num_intersections):
+        for i in range(num_intersections):
             queue = traffic_data.get(f"queue_{i}", 2)
             flow = max(traffic_data.get(f"flow_{i}", 3), 1)
-            
+
             # Penalización cuadrática por colas
             total_queue_penalty += (queue ** 2) * 20
-            
+
             # Bonificación por flujo
             score -= flow * 5
-        
-        score += total_queue_penalty
-        
-        # ============ 2. EVALUAR TIEMPOS DE VERDE ============
-        green_times = [ind[0] for ind in individual]
-        
-        for green in green_times:
-            # Penalizar tiempos muy cortos o muy largos
-            if green < 28:
-                score += (28 - green) ** 2 * 3
-            elif green > 47:
-                score += (green - 47) ** 2 * 3
-            else:
-                # Bonificación por estar en rango óptimo (28-47)
-                score -= 15
-        
-        # Penalizar si hay poca variación (todos iguales)
-        green_range = max(green_times) - min(green_times)
+
+        return score + total_queue_penalty
+
+    @staticmethod
+    def _green_term(green):
+        """Penaliza tiempos de verde muy cortos o muy largos"""
+        if green < 28:
+            return (28 - green) ** 2 * 3
+        if green > 47:
+            return (green - 47) ** 2 * 3
+        # Bonificación por estar en rango óptimo (28-47)
+        return -15
+
+    @staticmethod
+    def _green_range_term(green_range):
+        """Penaliza si hay poca variación (todos iguales)"""
         if green_range < 5:
-            score += 150  # Muy malo
-        elif green_range < 10:
-            score += 80
-        elif green_range > 20:
-            score -= 50  # Buena diversidad
-        
-        # ============ 3. SINCRONIZACIÓN HORIZONTAL (OLA VERDE) ============
-        # Pares horizontales (calles Este-Oeste)
-        h_pairs = [(0,1), (1,2), (3,4), (4,5)]
-        
-        for i, j in h_pairs:
-            offset_i = individual[i][1]
-            offset_j = individual[j][1]
-            
-            # Calcular diferencia circular
-            diff = abs(offset_j - offset_i)
-            if diff > 30:
-                diff = 60 - diff
-            
-            # Ideal: 12-18 segundos (tiempo de viaje entre intersecciones)
-            if 12 <= diff <= 18:
-                score -= 100  # EXCELENTE sincronización
-            elif 8 <= diff <= 22:
-                score -= 50   # Buena sincronización
-            elif diff < 5 or diff > 35:
-                score += 80   # Mala sincronización
-            else:
-                score += 30   # Regular
-        
-        # ============ 4. SINCRONIZACIÓN VERTICAL ============
-        v_pairs = [(0,3), (1,4), (2,5)]
-        
-        for i, j in v_pairs:
-            offset_i = individual[i][1]
-            offset_j = individual[j][1]
-            
-            diff = abs(offset_j - offset_i)
-            if diff > 30:
-                diff = 60 - diff
-            
-            # Ideal: 20-30 segundos
-            if 20 <= diff <= 30:
-                score -= 80
-            elif 15 <= diff <= 35:
-                score -= 40
-            elif diff < 8 or diff > 45:
-                score += 70
-            else:
-                score += 25
-        
-        # ============ 5. DIVERSIDAD EN OFFSETS ============
-        offsets = [ind[1] for ind in individual]
-        unique_offsets = len(set(offsets))
-        
+            return 150  # Muy malo
+        if green_range < 10:
+            return 80
+        if green_range > 20:
+            return -50  # Buena diversidad
+        return 0
+
+    @staticmethod
+    def _h_pair_term(diff):
+        """Ola verde horizontal - ideal: 12-18 s (tiempo de viaje)"""
+        if 12 <= diff <= 18:
+            return -100  # EXCELENTE sincronización
+        if 8 <= diff <= 22:
+            return -50   # Buena sincronización
+        if diff < 5 or diff > 35:
+            return 80    # Mala sincronización
+        return 30        # Regular
+
+    @staticmethod
+    def _v_pair_term(diff):
+        """Ola verde vertical - ideal: 20-30 s"""
+        if 20 <= diff <= 30:
+            return -80
+        if 15 <= diff <= 35:
+            return -40
+        if diff < 8 or diff > 45:
+            return 70
+        return 25
+
+    @staticmethod
+    def _unique_offsets_term(unique_offsets):
+        """Diversidad en offsets"""
         if unique_offsets <= 3:
-            score += 200  # Muy mala diversidad
-        elif unique_offsets == 4:
-            score += 100
-        elif unique_offsets >= 5:
-            score -= 80  # Buena diversidad
-        
-        # ============ 6. BALANCEO ENTRE INTERSECCIONES ============
-        # Penalizar si hay mucha diferencia entre tiempos de verde
-        avg_green = sum(green_times) / len(green_times)
-        variance = sum((g - avg_green)**2 for g in green_times) / len(green_times)
-        
+            return 200  # Muy mala diversidad
+        if unique_offsets == 4:
+            return 100
+        return -80      # Buena diversidad
+
+    @staticmethod
+    def _variance_term(variance):
+        """Balanceo entre intersecciones"""
         if variance > 80:
-            score += variance * 2  # Alta varianza = malo
-        elif variance < 20:
-            score += 100  # Muy poca varianza = todos iguales = malo
-        
-        # ============ 7. RUIDO PARA EVITAR CONVERGENCIA ============
-        # Agregar pequeño ruido aleatorio para mantener exploración
-        noise = random.uniform(-8, 8)
-        score += noise
-        
-        # ============ 8. RETORNO FINAL ============
-        # NO usar max() con límite mínimo - dejar que sea negativo si es muy bueno
-        return round(score, 2)
-
-    def optimize(self, traffic_data, callback=None):
-        """Ejecuta el algoritmo genético"""
-        print("\n" + "="*70)
-        print("🧬 INICIANDO OPTIMIZACIÓN")
-        print(f"📊 Población: {self.population_size} | Generaciones: {self.generations}")
-        print("="*70 + "\n")
+            return variance * 2  # Alta varianza = malo
+        if variance < 20:
+            return 100  # Muy poca varianza = todos iguales = malo
+        return 0
+
+    def _compute_terms(self, individual, traffic_data):
+        """Evaluación completa: calcula todas las contribuciones O(red)"""
+        terms = self._gene_terms(individual)
+        terms.traffic = self._traffic_term(traffic_data, self.num_intersections)
+        return terms
+
+    def _gene_terms(self, individual):
+        """Contribuciones que dependen de los genes (todo salvo el tráfico)"""
+        terms = FitnessTerms()
+        terms.green = [self._green_term(ind[0]) for ind in individual]
+        terms.h = [self._h_pair_term(self._circular_diff(individual[i][1], individual[j][1]))
+                   for i, j in self.h_pairs]
+        terms.v = [self._v_pair_term(self._circular_diff(individual[i][1], individual[j][1]))
+                   for i, j in self.v_pairs]
+        terms.green_total = sum(terms.green)
+        terms.pair_total = sum(terms.h) + sum(terms.v)
+
+        # Agregados mantenidos de forma incremental
+        for green, offset in individual:
+            terms.green_sum += green
+            terms.green_sq_sum += green * green
+            terms.green_counts[green] = terms.green_counts.get(green, 0) + 1
+            terms.offset_counts[offset] = terms.offset_counts.get(offset, 0) + 1
+        return terms
+
+    def _delta_terms(self, parent_terms, parent, child, changed):
+        """
+        Evaluación incremental: parte de los términos del padre y actualiza
+        solo los que dependen de los genes en `changed`. O(genes cambiados)
+        """
+        if len(changed) * 2 > self.num_intersections:
+            # Demasiados cambios: sale más barato recalcular todo
+            terms = self._gene_terms(child)
+            terms.traffic = parent_terms.traffic
+            return terms
+
+        terms = parent_terms.copy()
+        touched_h = set()
+        touched_v = set()
+
+        for i in changed:
+            old_green, old_offset = parent[i]
+            new_green, new_offset = child[i]
+
+            if new_green != old_green:
+                new_term = self._green_term(new_green)
+                terms.green_total += new_term - terms.green[i]
+                terms.green[i] = new_term
+                terms.green_sum += new_green - old_green
+                terms.green_sq_sum += new_green * new_green - old_green * old_green
+                _counter_remove(terms.green_counts, old_green)
+                terms.green_counts[new_green] = terms.green_counts.get(new_green, 0) + 1
+
+            if new_offset != old_offset:
+                _counter_remove(terms.offset_counts, old_offset)
+                terms.offset_counts[new_offset] = terms.offset_counts.get(new_offset, 0) + 1
+                touched_h.update(self._h_pairs_of[i])
+                touched_v.update(self._v_pairs_of[i])
+
+        for p in touched_h:
+            i, j = self.h_pairs[p]
+            new_term = self._h_pair_term(self._circular_diff(child[i][1], child[j][1]))
+            terms.pair_total += new_term - terms.h[p]
+            terms.h[p] = new_term
+
+        for p in touched_v:
+            i, j = self.v_pairs[p]
+            new_term = self._v_pair_term(self._circular_diff(child[i][1], child[j][1]))
+            terms.pair_total += new_term - terms.v[p]
+            terms.v[p] = new_term
+
+        return terms
+
+    def _score_terms(self, terms):
+        """Combina las contribuciones cacheadas en el fitness determinista"""
+        n = self.num_intersections
+        score = terms.traffic + terms.green_total + terms.pair_total
+
+        green_range = max(terms.green_counts) - min(terms.green_counts)
+        score += self._green_range_term(green_range)
+
+        score += self._unique_offsets_term(len(terms.offset_counts))
+
+        # Varianza a partir de la suma y la suma de cuadrados (enteros exactos)
+        variance = (n * terms.green_sq_sum - terms.green_sum ** 2) / (n * n)
+        score += self._variance_term(variance)
+        return score
+
+    def _score_with_noise(self, terms):
+        """
+        RUIDO PARA EVITAR CONVERGENCIA
+        Agregar pequeño ruido aleatorio para mantener exploración.
+        NO usar max() con límite mínimo - dejar que sea negativo si es muy bueno
+        """
+        noise = self.rng.uniform(-8, 8)
+        return round(self._score_terms(terms) + noise, 2)
+
+    def _fitness(self, individual, traffic_data):
+        """
+        FUNCIÓN DE FITNESS ROBUSTA
+        Retorna un valor donde MENOR es MEJOR
+        """
+        return self._score_with_noise(self._compute_terms(individual, traffic_data))
+
+    def optimize(self, traffic_data, callback=None, seed_individuals=None,
+                 checkpoint_dir=None, checkpoint_every=Config.GA_CHECKPOINT_EVERY):
+        """
+        Ejecuta el algoritmo genético.
+        `seed_individuals`: planes conocidos (p. ej. de CorridorOptimizer)
+        que entran en la población inicial.
+        `checkpoint_dir`: si se indica, guarda el estado cada
+        `checkpoint_every` generaciones y al terminar (ver resume)
+        """
+        log.info("🧬 INICIANDO OPTIMIZACIÓN | Población: %d | Generaciones: %d",
+                 self.population_size, self.generations)
         
         self.history = []
         self.avg_history = []
         self.min_history = []
         
         # Población inicial ULTRA DIVERSA
-        population = []
-        for _ in range(self.population_size):
+        population = [[list(g) for g in seed]
+                      for seed in (seed_individuals or [])][:self.population_size]
+        while len(population) < self.population_size:
             population.append(self._create_individual())
         
-        best_individual = None
-        best_fitness = float('inf')
-        no_improvement_count = 0
-        
-        for gen in range(self.generations):
-            # Calcular fitness
-            fitnesses = [self._fitness(ind, traffic_data) for ind in population]
+        # Términos cacheados de cada individuo (evaluación completa solo al inicio);
+        # con un evaluador externo no se usan
+        population_terms = (None if self.evaluator is not None else
+                            [self._compute_terms(ind, traffic_data) for ind in population])
+        
+        state = {
+            'generation': 0,
+            'population': population,
+            'population_terms': population_terms,
+            'fitnesses': [],
+            'best_individual': None,
+            'best_fitness': float('inf'),
+            'no_improvement_count': 0,
+        }
+        return self._evolve(traffic_data, state, callback, checkpoint_dir, checkpoint_every)
+
+    @classmethod
+    def resume(cls, checkpoint, callback=None, extra_generations=0,
+               checkpoint_every=Config.GA_CHECKPOINT_EVERY):
+        """
+        Continúa una optimización desde un checkpoint (archivo o directorio;
+        en un directorio se usa el más reciente). `extra_generations` amplía
+        el número de generaciones planificado originalmente
+        """
+        from checkpoint import latest_checkpoint, load_checkpoint
+
+        checkpoint_dir = checkpoint
+        if os.path.isdir(checkpoint):
+            checkpoint = latest_checkpoint(checkpoint)
+            if checkpoint is None:
+                raise FileNotFoundError(f"No hay checkpoints en {checkpoint_dir}")
+        else:
+            checkpoint_dir = os.path.dirname(checkpoint)
+
+        saved = load_checkpoint(checkpoint)
+        ga = cls(saved['num_intersections'])
+        ga.population_size = saved['population_size']
+        ga.generations = saved['generations'] + extra_generations
+        ga.mutation_rate = saved['mutation_rate']
+        ga.crossover_rate = saved['crossover_rate']
+        ga.history = saved['history']
+        ga.avg_history = saved['avg_history']
+        ga.min_history = saved['min_history']
+        ga.rng.setstate(saved['random_state'])
+
+        log.info("♻️ Reanudando desde %s (generación %d/%d)",
+                 checkpoint, saved['state']['generation'], ga.generations)
+        return ga._evolve(saved['traffic_data'], saved['state'], callback,
+                          checkpoint_dir, checkpoint_every)
+
+    def _checkpoint_state(self, traffic_data, state):
+        """Estado completo para reanudar; las listas del historial se copian"""
+        return {
+            'num_intersections': self.num_intersections,
+            'population_size': self.population_size,
+            'generations': self.generations,
+            'mutation_rate': self.mutation_rate,
+            'crossover_rate': self.crossover_rate,
+            'history': self.history[:],
+            'avg_history': self.avg_history[:],
+            'min_history': self.min_history[:],
+            'random_state': self.rng.getstate(),
+            'traffic_data': traffic_data,
+            'state': dict(state),
+        }
+
+    def _evolve(self, traffic_data, state, callback, checkpoint_dir, checkpoint_every):
+        """Bucle generacional a partir de `state` (nuevo o reanudado)"""
+        population = state['population']
+        population_terms = state['population_terms']
+        track_terms = self.evaluator is None  # Evaluación incremental propia
+        if track_terms and population_terms is None:
+            # Checkpoint de una corrida con evaluador externo
+            population_terms = [self._compute_terms(ind, traffic_data) for ind in population]
+        best_individual = state['best_individual']
+        best_fitness = state['best_fitness']
+        no_improvement_count = state['no_improvement_count']
+        
+        writer = None
+        if checkpoint_dir:
+            # Diferido: gzip/pickle/tempfile solo si de verdad hay checkpoints
+            from checkpoint import CheckpointWriter
+            writer = CheckpointWriter(checkpoint_dir, keep=Config.GA_CHECKPOINT_KEEP)
+        deadline = time.perf_counter() + self.time_budget if self.time_budget else None
+        
+        try:
+            for gen in range(state['generation'], self.generations):
+                laps = PROFILER.laps("ga.generation")  # None si el perfilado está apagado
+            
+                # Calcular fitness a partir de los términos cacheados
+                if self.evaluator is not None:
+                    fitnesses = self.evaluator.evaluate(population)
+                else:
+                    fitnesses = [self._score_with_noise(terms) for terms in population_terms]
+                if laps:
+                    laps.lap("fitness")
             
-            # Estadísticas
-            current_best = min(fitnesses)
-            current_avg = sum(fitnesses) / len(fitnesses)
-            current_worst = max(fitnesses)
+                # Estadísticas
+                current_best = min(fitnesses)
+                current_avg = sum(fitnesses) / len(fitnesses)
+                current_worst = max(fitnesses)
             
-            # Actualizar mejor
-            if current_best < best_fitness:
-                improvement = best_fitness - current_best
-                best_fitness = current_best
-                best_idx = fitnesses.index(current_best)
-                best_individual = [g[:] for g in population[best_idx]]
-                no_improvement_count = 0
+                # Actualizar mejor
+                if current_best < best_fitness:
+                    improvement = best_fitness - current_best
+                    best_fitness = current_best
+                    best_idx = fitnesses.index(current_best)
+                    best_individual = [g[:] for g in population[best_idx]]
+                    no_improvement_count = 0
                 
-                if gen % 5 == 0 or gen == 0:
-                    print(f"✨ Gen {gen+1}: Nuevo MEJOR → {best_fitness:.2f} (↓{improvement:.2f})")
-            else:
-                no_improvement_count += 1
+                    if gen % 5 == 0 or gen == 0:
+                        log.debug("✨ Gen %d: Nuevo MEJOR → %.2f (↓%.2f)", gen + 1, best_fitness, improvement)
+                else:
+                    no_improvement_count += 1
+            
+                # Mostrar progreso
+                if gen % 15 == 0:
+                    log.info("📈 Gen %3d | Mejor: %7.2f | Prom: %7.2f | Peor: %7.2f",
+                             gen + 1, current_best, current_avg, current_worst)
             
-            # Mostrar progreso
-            if gen % 15 == 0:
-                print(f"📈 Gen {gen+1:3d} | Mejor: {current_best:7.2f} | "
-                      f"Prom: {current_avg:7.2f} | Peor: {current_worst:7.2f}")
+                # Guardar historial
+                self.history.append(current_best)
+                self.avg_history.append(current_avg)
+                self.min_history.append(current_worst)
             
-            # Guardar historial
-            self.history.append(current_best)
-            self.avg_history.append(current_avg)
-            self.min_history.append(current_worst)
+                if laps:
+                    laps.lap("statistics")
             
-            # Callback
-            if callback:
-                callback(gen, self.generations, best_fitness)
+                # Callback
+                if callback:
+                    callback(gen, self.generations, best_fitness)
+                if laps:
+                    laps.lap("callback")
             
-            # ============ SELECCIÓN POR TORNEO ============
-            tournament_size = 5
-            parents = []
+                # ============ SELECCIÓN POR TORNEO ============
+                tournament_size = 5
+                parents = []
             
-            for _ in range(self.population_size):
-                # Seleccionar candidatos al azar
-                candidates = random.sample(list(zip(population, fitnesses)), tournament_size)
-                # El mejor (menor fitness) gana
-                winner = min(candidates, key=lambda x: x[1])[0]
-                parents.append(winner)
+                for _ in range(self.population_size):
+                    # Seleccionar candidatos al azar
+                    candidates = self.rng.sample(range(len(population)), tournament_size)
+                    # El mejor (menor fitness) gana
+                    winner = min(candidates, key=lambda idx: fitnesses[idx])
+                    parents.append(winner)
+                if laps:
+                    laps.lap("selection")
             
-            # ============ NUEVA GENERACIÓN ============
-            new_population = []
+                # ============ NUEVA GENERACIÓN ============
+                new_population = []
+                new_terms = []
             
-            # Elitismo: mantener los 8 mejores
-            sorted_pop = sorted(zip(population, fitnesses), key=lambda x: x[1])
-            for i in range(8):
-                new_population.append([g[:] for g in sorted_pop[i][0]])
+                # Elitismo: mantener los 8 mejores (sus términos no cambian)
+                sorted_idx = sorted(range(len(population)), key=lambda idx: fitnesses[idx])
+                for idx in sorted_idx[:8]:
+                    new_population.append([g[:] for g in population[idx]])
+                    if track_terms:
+                        new_terms.append(population_terms[idx])
             
-            # Generar resto
-            while len(new_population) < self.population_size:
-                p1 = random.choice(parents)
-                p2 = random.choice(parents)
+                # Generar resto
+                incremental = 0.0  # Tiempo de la re-evaluación incremental (perfilado)
+                while len(new_population) < self.population_size:
+                    p1 = self.rng.choice(parents)
+                    p2 = self.rng.choice(parents)
                 
-                # Cruce de dos puntos
-                if random.random() < self.crossover_rate:
-                    p1 = random.randint(1, self.num_intersections - 2)
-                    p2 = random.randint(p1 + 1, self.num_intersections - 1)
+                    # Cruce de dos puntos
+                    if self.rng.random() < self.crossover_rate:
+                        p1 = self.rng.randint(1, self.num_intersections - 2)
+                        p2 = self.rng.randint(p1 + 1, self.num_intersections - 1)
                     
-                    child = (parents[0][:p1] + 
-                            parents[1][p1:p2] + 
-                            parents[0][p2:])
-                else:
-                    child = [g[:] for g in p1]
+                        base, donor = parents[0], parents[1]
+                        child = ([g[:] for g in population[base][:p1]] +
+                                 [g[:] for g in population[donor][p1:p2]] +
+                                 [g[:] for g in population[base][p2:]])
+                        changed = set(range(p1, p2))
+                    else:
+                        base = p1
+                        child = [g[:] for g in population[base]]
+                        changed = set()
                 
-                # Mutación adaptativa
-                base_mut_rate = self.mutation_rate
-                if no_improvement_count > 15:
-                    base_mut_rate *= 2.5  # Aumentar mutación si hay estancamiento
+                    # Mutación adaptativa
+                    base_mut_rate = self.mutation_rate
+                    if no_improvement_count > 15:
+                        base_mut_rate *= 2.5  # Aumentar mutación si hay estancamiento
                 
-                for i in range(self.num_intersections):
-                    if random.random() < base_mut_rate:
-                        # Mutación en tiempo verde
-                        if random.random() < 0.5:
-                            child[i][0] = random.randint(25, 50)
-                        # Mutación en offset
-                        else:
-                            child[i][1] = random.randint(0, 59)
+                    for i in range(self.num_intersections):
+                        if self.rng.random() < base_mut_rate:
+                            # Mutación en tiempo verde
+                            if self.rng.random() < 0.5:
+                                child[i][0] = self.rng.randint(25, 50)
+                            # Mutación en offset
+                            else:
+                                child[i][1] = self.rng.randint(0, 59)
+                            changed.add(i)
                 
-                new_population.append(child)
+                    # Re-evaluación incremental respecto al padre base
+                    new_population.append(child)
+                    if not track_terms:
+                        continue
+                    if laps:
+                        t = time.perf_counter()
+                    new_terms.append(self._delta_terms(population_terms[base],
+                                                       population[base], child, changed))
+                    if laps:
+                        incremental += time.perf_counter() - t
+            
+                population = new_population[:self.population_size]
+                population_terms = new_terms[:self.population_size] if track_terms else None
+                if laps:
+                    laps.add("incremental_fitness", incremental)
+                    laps.lap("crossover_mutation", exclude=incremental)
             
-            population = new_population[:self.population_size]
+                # ============ CHECKPOINT ============
+                # Las listas de la población no se modifican después de crearse,
+                # así que el hilo escritor puede serializarlas sin copiarlas
+                state = {
+                    'generation': gen + 1,
+                    'population': population,
+                    'population_terms': population_terms,
+                    'fitnesses': fitnesses,
+                    'best_individual': best_individual,
+                    'best_fitness': best_fitness,
+                    'no_improvement_count': no_improvement_count,
+                }
+                out_of_time = deadline is not None and time.perf_counter() >= deadline
+                reached = self.target_fitness is not None and best_fitness <= self.target_fitness
+                if writer and ((gen + 1) % checkpoint_every == 0 or gen + 1 == self.generations
+                               or out_of_time or reached):
+                    writer.submit(gen + 1, self._checkpoint_state(traffic_data, state))
+                if laps:
+                    laps.lap("checkpoint")
+                    laps.finish()
+                if out_of_time:
+                    log.info("⏱️ Presupuesto de %.1fs agotado en la generación %d", self.time_budget, gen + 1)
+                    break
+                if reached:
+                    log.info("🎯 Objetivo %.2f alcanzado en la generación %d", self.target_fitness, gen + 1)
+                    break
+        finally:
+            # También ante una excepción: los checkpoints en cola llegan a disco
+            if writer:
+                writer.close()
         
         # Resultados
         if len(self.history) > 1 and self.history[0] != 0:
@@ -253,12 +559,8 @@ class GeneticAlgorithm:
         else:
             improvement = 0
         
-        print("\n" + "="*70)
-        print("✅ OPTIMIZACIÓN COMPLETADA")
-        print(f"🎯 Fitness Inicial: {self.history[0]:.2f}")
-        print(f"🎯 Fitness Final: {best_fitness:.2f}")
-        print(f"📈 MEJORA: {improvement:.1f}%")
-        print("="*70 + "\n")
+        log.info("✅ OPTIMIZACIÓN COMPLETADA | Fitness Inicial: %.2f | Final: %.2f | Mejora: %.1f%%",
+                 self.history[0], best_fitness, improvement)
         
         return {
             'best_solution': best_individual,
@@ -277,54 +579,6 @@ class GeneticAlgorithm:
         return generations, self.history, self.avg_history, self.min_history
 
     def show_graph(self):
-        """Muestra gráfico"""
-        if not self.history or len(self.history) < 2:
-            print("⚠️ Datos insuficientes")
-            return
-        
-        gens, best, avg, worst = self.get_history_data()
-        
-        plt.figure(figsize=(15, 9))
-        plt.style.use('dark_background')
-        ax = plt.gca()
-        ax.set_facecolor('#0f1620')
-        
-        # Graficar
-        plt.plot(gens, best, color='#00ff88', linewidth=4, 
-                marker='o', markersize=7, markevery=max(1, len(gens)//15),
-                label='Mejor Fitness', zorder=3)
-        
-        plt.plot(gens, avg, color='#ff9900', linewidth=2.5, 
-                linestyle='--', alpha=0.85, label='Fitness Promedio', zorder=2)
-        
-        plt.plot(gens, worst, color='#ff4444', linewidth=1.5,
-                linestyle=':', alpha=0.7, label='Peor Fitness', zorder=1)
-        
-        plt.fill_between(gens, best, worst, color='#2c3e50', alpha=0.2)
-        
-        plt.title("EVOLUCIÓN DEL FITNESS - ALGORITMO GENÉTICO", 
-                 fontsize=24, fontweight='bold', color='#00ff88', pad=20)
-        plt.xlabel("Generación", fontsize=18, color='white', labelpad=15)
-        plt.ylabel("Fitness (menor = mejor)", fontsize=18, color='white', labelpad=15)
-        plt.grid(True, alpha=0.25, color='#666', linestyle='--', linewidth=0.8)
-        plt.legend(fontsize=14, loc='upper right', framealpha=0.9)
-        
-        # Info
-        if len(best) > 1 and best[0] != 0:
-            mejora = ((best[0] - best[-1]) / abs(best[0])) * 100
-            
-            info_text = (f"Mejora: {mejora:.1f}%\n"
-                        f"Fitness Inicial: {best[0]:.2f}\n"
-                        f"Fitness Final: {best[-1]:.2f}\n"
-                        f"Generaciones: {len(gens)}")
-            
-            plt.text(0.02, 0.98, info_text,
-                    transform=ax.transAxes, fontsize=13, fontweight='bold',
-                    verticalalignment='top',
-                    bbox=dict(boxstyle='round,pad=0.8', facecolor='#1e2a38', 
-                            alpha=0.95, edgecolor='#00ff88', linewidth=3),
-                    color='white')
-        
-        plt.xlim(0, max(gens) + 2)
-        plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        """Muestra gráfico (matplotlib se importa recién aquí)"""
+        from gui.plots import plot_fitness_history
+        plot_fitness_history(self.history, self.avg_history, self.min_history)
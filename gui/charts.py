@@ -1,7 +1,102 @@
+import queue
 import tkinter as tk
-from tkinter import ttk
 from config import Config
 #charts.py
+
+
+def lttb(xs, ys, threshold):
+    """
+    Largest-Triangle-Three-Buckets: reduce la serie a `threshold` puntos
+    conservando su forma visual (picos y caídas). Retorna [(x, y), ...].
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(zip(xs, ys))
+
+    sampled = [(xs[0], ys[0])]
+    bucket = (n - 2) / (threshold - 2)
+    a = 0  # Índice del último punto elegido
+
+    for i in range(threshold - 2):
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+
+        # Promedio del siguiente bucket (el tercer vértice del triángulo)
+        next_end = min(int((i + 2) * bucket) + 1, n)
+        count = next_end - end
+        avg_x = sum(xs[end:next_end]) / count
+        avg_y = sum(ys[end:next_end]) / count
+
+        ax, ay = xs[a], ys[a]
+        best_area = -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                a = j
+        sampled.append((xs[a], ys[a]))
+
+    sampled.append((xs[-1], ys[-1]))
+    return sampled
+
+class LTTBStream:
+    """
+    LTTB incremental para series que solo crecen. Los buckets tienen un
+    tamaño fijo (potencia de 2): un bucket queda elegido para siempre en
+    cuanto el siguiente está completo, así que cada `points` solo procesa
+    los puntos nuevos y el bucket pendiente. Cuando los buckets superan
+    `threshold`, el tamaño se duplica y se recalcula todo (O(n) amortizado).
+    """
+
+    def __init__(self, threshold):
+        self.threshold = max(threshold, 3)
+        self.ys = []
+        self.size = 1
+        self.chosen = []  # Índice elegido por cada bucket cerrado
+
+    def append(self, y):
+        self.ys.append(y)
+
+    def _pick(self, a, start, end, cx, cy):
+        ys = self.ys
+        ay = ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((a - cx) * (ys[j] - ay) - (a - j) * (cy - ay))
+            if area > best_area:
+                best, best_area = j, area
+        return best
+
+    def points(self):
+        """[(índice, y), ...] con a lo sumo `threshold` puntos"""
+        ys, n = self.ys, len(self.ys)
+        if n < 3:
+            return list(enumerate(ys))
+        while (n - 1) // self.size > self.threshold - 2:
+            self.size *= 2
+            self.chosen = []
+
+        size = self.size
+        complete = (n - 1) // size  # Buckets llenos sobre los índices 1..n−1
+        while len(self.chosen) < complete - 1:
+            k = len(self.chosen)
+            a = self.chosen[-1] if self.chosen else 0
+            start = 1 + (k + 1) * size
+            cy = sum(ys[start:start + size]) / size
+            self.chosen.append(self._pick(a, 1 + k * size, start, start + (size - 1) / 2, cy))
+
+        points = [(0, ys[0])] + [(j, ys[j]) for j in self.chosen]
+        if complete:
+            # Bucket pendiente: su vecino aún no está completo, se compara con el último punto
+            a = self.chosen[-1] if self.chosen else 0
+            k = complete - 1
+            j = self._pick(a, 1 + k * size, 1 + complete * size, n - 1, ys[-1])
+            if j != n - 1:
+                points.append((j, ys[j]))
+        points.append((n - 1, ys[-1]))
+        return points
+
+
 class ChartWindow(tk.Toplevel):
     def __init__(self, parent, ga):
         super().__init__(parent)
@@ -119,47 +214,16 @@ class ChartWindow(tk.Toplevel):
             'min': "#ff4444"    # Rojo
         }
         
-        # Mejor fitness (línea principal)
-        points_best = []
-        for i, gen in enumerate(generations):
-            x = scale_x(gen)
-            y = scale_y(best[i])
-            points_best.append((x, y))
-        
-        # Dibujar línea suavizada para mejor fitness
-        for i in range(len(points_best) - 1):
-            x1, y1 = points_best[i]
-            x2, y2 = points_best[i + 1]
-            
-            # Línea principal
-            self.canvas.create_line(x1, y1, x2, y2, 
-                                fill=colors['best'], width=3, 
-                                smooth=True)
-            
-            # Efecto brillante
-            self.canvas.create_line(x1, y1, x2, y2, 
-                                fill="#ffffff", width=1, 
-                                smooth=True)
-        
-        # Fitness promedio
-        for i in range(len(generations) - 1):
-            x1 = scale_x(generations[i])
-            y1 = scale_y(avg[i])
-            x2 = scale_x(generations[i + 1])
-            y2 = scale_y(avg[i + 1])
-            self.canvas.create_line(x1, y1, x2, y2, 
-                                fill=colors['avg'], width=2, 
-                                dash=(4, 2))
-        
-        # Fitness mínimo
-        for i in range(len(generations) - 1):
-            x1 = scale_x(generations[i])
-            y1 = scale_y(min_fit[i])
-            x2 = scale_x(generations[i + 1])
-            y2 = scale_y(min_fit[i + 1])
-            self.canvas.create_line(x1, y1, x2, y2, 
-                                fill=colors['min'], width=1, 
-                                dash=(2, 2))
+        # Una sola polilínea por serie (submuestreada con LTTB)
+        styles = [
+            (best, dict(fill=colors['best'], width=3)),
+            (avg, dict(fill=colors['avg'], width=2, dash=(4, 2))),
+            (min_fit, dict(fill=colors['min'], width=1, dash=(2, 2))),
+        ]
+        for values, style in styles:
+            points = lttb(generations, values, Config.CHART_MAX_POINTS)
+            coords = [c for gen, fit in points for c in (scale_x(gen), scale_y(fit))]
+            self.canvas.create_line(*coords, **style)
         
         # Leyenda
         legend_x = padding + width - 180
@@ -232,4 +296,129 @@ class ChartWindow(tk.Toplevel):
                 font=("Arial", 12, "bold"),
                 fill=mejora_color,
                 anchor=tk.W
-            )
\ No newline at end of file
+            )
+
+class LiveFitnessChart(tk.Toplevel):
+    """
+    Gráfico que se actualiza mientras corre la optimización.
+    `push` puede llamarse desde el hilo del optimizador: solo encola.
+    El hilo de Tk vacía la cola a CHART_REFRESH_HZ y mueve una polilínea
+    por serie con `coords` (sin borrar ni recrear ítems). Las series largas
+    se submuestrean con LTTBStream a CHART_MAX_POINTS y el rango vertical
+    se lleva al agregar cada valor: redibujar no recorre la historia.
+    """
+    WIDTH, HEIGHT, PADDING = 850, 500, 70
+    SERIES = [("Mejor Fitness", "#00ff88", 3), ("Fitness Promedio", "#ff9900", 2),
+              ("Peor Fitness", "#ff4444", 1)]
+
+    def __init__(self, parent, history=None, on_close=None):
+        super().__init__(parent)
+        self.title("📈 Fitness en Vivo")
+        self.geometry("900x560")
+        self.configure(bg=Config.COLOR_BG)
+        self.on_close = on_close
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.canvas = tk.Canvas(self, width=self.WIDTH, height=self.HEIGHT, bg="#1a1a2e",
+                                highlightthickness=2, highlightbackground=Config.COLOR_PRIMARY)
+        self.canvas.pack(padx=20, pady=20)
+
+        self._queue = queue.SimpleQueue()
+        self._reset()
+        self._dirty = False
+        self._job = None
+        self._create_items()
+
+        if history:
+            for values in zip(*history):
+                self.push(*values)
+        self._poll()
+
+    def _create_items(self):
+        p, w, h = self.PADDING, self.WIDTH, self.HEIGHT
+        c = self.canvas
+        c.create_line(p, h - p, w - p, h - p, width=2, fill="white")
+        c.create_line(p, p, p, h - p, width=2, fill="white")
+        c.create_text(w / 2, 25, text="📈 EVOLUCIÓN DEL FITNESS (EN VIVO)",
+                      font=("Arial", 14, "bold"), fill=Config.COLOR_ACCENT)
+        c.create_text(w / 2, h - 20, text="Iteración", font=("Arial", 11, "bold"), fill="white")
+
+        self.lines = []
+        for i, (label, color, width) in enumerate(self.SERIES):
+            # Polilínea con dos puntos iniciales; luego solo se mueven sus coordenadas
+            self.lines.append(c.create_line(p, h - p, p, h - p, fill=color, width=width))
+            y = p + 15 + i * 22
+            c.create_line(w - p - 190, y, w - p - 160, y, fill=color, width=3)
+            c.create_text(w - p - 150, y, text=label, anchor=tk.W,
+                          font=("Arial", 10, "bold"), fill="white")
+
+        # Rótulos de los ejes: se reescriben, no se recrean
+        self.y_labels = [c.create_text(p - 8, 0, anchor=tk.E, font=("Arial", 9), fill="white")
+                         for _ in range(5)]
+        self.x_label = c.create_text(w - p, h - p + 15, font=("Arial", 9), fill="white")
+        self.status = c.create_text(p + 10, p - 15, anchor=tk.W, font=("Arial", 10, "bold"),
+                                    fill="#00ff88")
+
+    def _reset(self):
+        self.streams = [LTTBStream(Config.CHART_MAX_POINTS) for _ in self.SERIES]
+        self.series = [stream.ys for stream in self.streams]
+        self._low = float("inf")
+        self._high = float("-inf")
+
+    def push(self, best, avg, worst):
+        """Agrega una iteración (seguro desde cualquier hilo)"""
+        self._queue.put((best, avg, worst))
+
+    def clear(self):
+        """Reinicia las series (nueva optimización)"""
+        self._queue.put(None)
+
+    def _poll(self):
+        """Vacía la cola y redibuja como mucho CHART_REFRESH_HZ veces por segundo"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._reset()
+            else:
+                for stream, value in zip(self.streams, item):
+                    stream.append(value)
+                self._low = min(self._low, *item)
+                self._high = max(self._high, *item)
+            self._dirty = True
+
+        if self._dirty:
+            self._dirty = False
+            self._redraw()
+        self._job = self.after(int(1000 / Config.CHART_REFRESH_HZ), self._poll)
+
+    def _redraw(self):
+        n = len(self.series[0])
+        if n < 2:
+            return
+        p, w, h = self.PADDING, self.WIDTH, self.HEIGHT
+        low = self._low
+        span = (self._high - low) or 1.0
+        sx = (w - 2 * p) / (n - 1)
+        sy = (h - 2 * p) / span
+
+        for line, stream in zip(self.lines, self.streams):
+            coords = [c for x, y in stream.points() for c in (p + x * sx, h - p - (y - low) * sy)]
+            self.canvas.coords(line, *coords)
+
+        for i, item in enumerate(self.y_labels):
+            value = low + span * i / (len(self.y_labels) - 1)
+            self.canvas.coords(item, p - 8, h - p - (value - low) * sy)
+            self.canvas.itemconfig(item, text=f"{value:.1f}")
+        self.canvas.itemconfig(self.x_label, text=str(n))
+        self.canvas.itemconfig(self.status, text=f"Mejor: {self.series[0][-1]:.2f}")
+
+    def close(self):
+        if self._job is not None:
+            self.after_cancel(self._job)
+            self._job = None
+        if self.on_close:
+            self.on_close()
+        self.destroy()
@@ -2,6 +2,7 @@
 import tkinter as tk
 from tkinter import ttk
 from config import Config
+from optimizers.registry import OPTIMIZERS
 #control_panel.py
 class ControlPanel:
     def __init__(self, parent, main_window):
@@ -29,6 +30,40 @@ class ControlPanel:
         self.gen_scale.set(100)
         self.gen_scale.pack(fill=tk.X, padx=20, pady=5)
 
+        # Velocidad de simulación
+        tk.Label(self.frame, text="Velocidad (×):", fg=Config.COLOR_TEXT, bg=Config.COLOR_PANEL).pack(anchor="w", padx=20)
+        self.speed_scale = tk.Scale(self.frame, from_=0.25, to=Config.SIM_SPEED_MAX, resolution=0.25,
+                                    orient=tk.HORIZONTAL, bg=Config.COLOR_PANEL, fg="white",
+                                    highlightthickness=0, command=main_window.set_speed)
+        self.speed_scale.set(1.0)
+        self.speed_scale.pack(fill=tk.X, padx=20, pady=5)
+
+        # Optimizador
+        tk.Label(self.frame, text="Optimizador:", fg=Config.COLOR_TEXT, bg=Config.COLOR_PANEL).pack(anchor="w", padx=20)
+        self.optimizer_names = {cls.label: name for name, cls in OPTIMIZERS.items()}
+        self.optimizer_var = tk.StringVar(value=OPTIMIZERS["ga"].label)
+        ttk.Combobox(self.frame, textvariable=self.optimizer_var, values=list(self.optimizer_names),
+                     state="readonly").pack(fill=tk.X, padx=20, pady=5)
+
+        # Fitness por microsimulación (réplicas adaptativas) en vez del tráfico observado
+        self.sim_fitness_var = tk.BooleanVar(value=Config.OPTIMIZATION_FITNESS == "sim")
+        tk.Checkbutton(self.frame, text="Fitness por microsimulación", variable=self.sim_fitness_var,
+                       fg=Config.COLOR_TEXT, bg=Config.COLOR_PANEL, selectcolor=Config.COLOR_PANEL,
+                       activebackground=Config.COLOR_PANEL).pack(anchor="w", padx=20, pady=5)
+
+        # Modo de los semáforos
+        self.actuated_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.frame, text="Semáforos actuados (detectores)", variable=self.actuated_var,
+                       command=lambda: main_window.set_actuated(self.actuated_var.get()),
+                       fg=Config.COLOR_TEXT, bg=Config.COLOR_PANEL, selectcolor=Config.COLOR_PANEL,
+                       activebackground=Config.COLOR_PANEL).pack(anchor="w", padx=20, pady=5)
+
+        self.rolling_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.frame, text="Re-optimización continua", variable=self.rolling_var,
+                       command=lambda: main_window.set_rolling(self.rolling_var.get()),
+                       fg=Config.COLOR_TEXT, bg=Config.COLOR_PANEL, selectcolor=Config.COLOR_PANEL,
+                       activebackground=Config.COLOR_PANEL).pack(anchor="w", padx=20, pady=5)
+
         # Botones
         self.btn_start = tk.Button(self.frame, text="Iniciar Simulación", bg=Config.COLOR_SUCCESS, fg="white",
                                    font=("Arial", 12, "bold"), command=main_window.start_simulation, height=2)
@@ -52,6 +87,18 @@ class ControlPanel:
     def get_generations(self):
         return self.gen_scale.get()
 
+    def is_actuated(self):
+        return self.actuated_var.get()
+
+    def is_rolling(self):
+        return self.rolling_var.get()
+
+    def get_optimizer(self):
+        return self.optimizer_names[self.optimizer_var.get()]
+
+    def get_fitness(self):
+        return "sim" if self.sim_fitness_var.get() else "snapshot"
+
     def update_button_state(self, running):
         if running:
             self.btn_start.config(state=tk.DISABLED)
@@ -0,0 +1,94 @@
+# gui/frame_scheduler.py - SIMULACIÓN A PASO FIJO, DIBUJO DESACOPLADO
+import time
+from config import Config
+
+
+class FrameScheduler:
+    """
+    Bucle de animación con acumulador de paso fijo.
+
+    - La simulación avanza en pasos de `sim_dt` según el tiempo real
+      transcurrido × `speed`, así un fotograma lento no frena el tiempo
+      simulado y 10× solo significa más pasos por fotograma.
+    - El siguiente fotograma se programa descontando lo que tardó el actual.
+    - Si el trabajo de un fotograma excede su presupuesto, se salta el
+      dibujo (como mucho RENDER_MAX_SKIPPED seguidos).
+    """
+
+    def __init__(self, root, step_fn, render_fn, is_running,
+                 sim_dt=Config.SIM_TIMESTEP, fps=Config.FPS):
+        self.root = root
+        self.step_fn = step_fn        # step_fn(dt): avanza la simulación un paso
+        self.render_fn = render_fn    # render_fn(): dibuja; retorna ítems actualizados
+        self.is_running = is_running  # is_running(): False detiene el bucle
+        self.sim_dt = sim_dt
+        self.frame_interval = 1.0 / fps
+        self.speed = 1.0
+
+        self._job = None
+        self._last = None
+        self._accumulator = 0.0
+        self._skipped = 0
+
+        # Instrumentación (milisegundos / fotogramas por segundo)
+        self.stats = {"sim_ms": 0.0, "render_ms": 0.0, "fps": 0.0,
+                      "steps": 0, "items": 0, "skipped": 0}
+
+    def set_speed(self, speed):
+        self.speed = max(0.0, min(Config.SIM_SPEED_MAX, float(speed)))
+
+    def start(self):
+        if self._job is None:
+            self._last = time.perf_counter()
+            self._accumulator = 0.0
+            self._job = self.root.after(0, self._tick)
+
+    def stop(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def _tick(self):
+        self._job = None
+        if not self.is_running():
+            return
+
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+
+        # ============ SIMULACIÓN (paso fijo) ============
+        self._accumulator += elapsed * self.speed
+        steps = 0
+        while self._accumulator >= self.sim_dt and steps < Config.SIM_MAX_STEPS_PER_FRAME:
+            self.step_fn(self.sim_dt)
+            self._accumulator -= self.sim_dt
+            steps += 1
+        if steps == Config.SIM_MAX_STEPS_PER_FRAME:
+            # No se alcanza: descartar el atraso en vez de acumularlo sin fin
+            self._accumulator = 0.0
+        sim_end = time.perf_counter()
+
+        # ============ DIBUJO (se salta con carga) ============
+        overloaded = (sim_end - now) > self.frame_interval
+        if overloaded and self._skipped < Config.RENDER_MAX_SKIPPED:
+            self._skipped += 1
+            self.stats["skipped"] += 1
+            render_ms = 0.0
+        else:
+            self._skipped = 0
+            self.stats["items"] = self.render_fn() or 0
+            render_ms = (time.perf_counter() - sim_end) * 1000
+
+        # ============ ESTADÍSTICAS ============
+        stats = self.stats
+        stats["sim_ms"] = (sim_end - now) * 1000
+        stats["render_ms"] = render_ms
+        stats["steps"] = steps
+        if elapsed > 0:
+            stats["fps"] = 0.9 * stats["fps"] + 0.1 / elapsed if stats["fps"] else 1 / elapsed
+
+        # Próximo fotograma: descontar lo que ya tardó este
+        work = time.perf_counter() - now
+        delay = max(1, int((self.frame_interval - work) * 1000))
+        self._job = self.root.after(delay, self._tick)
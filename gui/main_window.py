@@ -1,14 +1,21 @@
 # gui/main_window.py - VERSIÓN CORREGIDA
 import tkinter as tk
-from tkinter import ttk, messagebox
-import threading
+from tkinter import ttk, messagebox, filedialog
+import logging
+import time
 from gui.control_panel import ControlPanel
 from gui.traffic_canvas import TrafficCanvas
 from gui.statistics_panel import StatisticsPanel
+from gui.frame_scheduler import FrameScheduler
+from gui.charts import LiveFitnessChart
 from traffic_simulation import TrafficSimulation
-from genetic_algorithm import GeneticAlgorithm
+from optimizers.background import BackgroundOptimization
+from optimizers.rolling import RollingHorizon
+from profiling import PROFILER
 from config import Config
 
+log = logging.getLogger(__name__)
+
 class MainWindow:
     def __init__(self, root):
         self.root = root
@@ -19,6 +26,26 @@ class MainWindow:
         self.simulation = None
         self.ga = None
         self.optimization_history = []
+        self.show_performance = tk.BooleanVar(value=False)
+        self.profiling = tk.BooleanVar(value=PROFILER.enabled)
+        self.exporting_metrics = tk.BooleanVar(value=False)
+        self.metrics = None
+        self.live_chart = None
+        self.optimization = None
+        self.rolling = None
+        self._rolling_poll = None
+        self.plan_cache = None        # PlanCache, se carga al primer uso
+        self.timetable = None         # PlanTimetable cargado (plan_scheduler.py)
+        self._optimization_data = None
+        self._optimization_cached = False  # ¿Guardar el resultado en el caché de planes?
+        self._overlay_updated = 0.0
+
+        self.frame_scheduler = FrameScheduler(
+            self.root,
+            step_fn=lambda dt: self.simulation.update(dt),
+            render_fn=self._render_frame,
+            is_running=lambda: bool(self.simulation and self.simulation.is_running)
+        )
 
         self._create_layout()
         self._create_menu()
@@ -66,16 +93,36 @@ class MainWindow:
         self.progress_bar = ttk.Progressbar(self.root, mode='determinate', length=600)
         self.progress_label = tk.Label(self.root, text="", fg="#00ff00", bg=Config.COLOR_BG, 
                                        font=("Arial", 11, "bold"))
+        self.optimization_buttons = tk.Frame(self.root, bg=Config.COLOR_BG)
+        self.btn_pause = tk.Button(self.optimization_buttons, text="⏸️ Pausar", width=12,
+                                   command=self.toggle_pause_optimization)
+        self.btn_pause.pack(side=tk.LEFT, padx=5)
+        tk.Button(self.optimization_buttons, text="✖️ Cancelar", width=12,
+                  command=self.cancel_optimization).pack(side=tk.LEFT, padx=5)
 
     def _create_menu(self):
         menubar = tk.Menu(self.root)
         
         filemenu = tk.Menu(menubar, tearoff=0)
         filemenu.add_command(label="📊 Ver Gráfico de Fitness", command=self.show_fitness_graph)
+        filemenu.add_command(label="📈 Gráfico en Vivo", command=self.show_live_chart)
+        filemenu.add_separator()
+        filemenu.add_command(label="🗓️ Cargar horario", command=self.load_timetable)
         filemenu.add_separator()
         filemenu.add_command(label="❌ Salir", command=self.root.quit)
         
         menubar.add_cascade(label="Archivo", menu=filemenu)
+        
+        viewmenu = tk.Menu(menubar, tearoff=0)
+        viewmenu.add_checkbutton(label="⏱️ Mostrar rendimiento", variable=self.show_performance,
+                                 command=self._toggle_performance_overlay)
+        viewmenu.add_separator()
+        viewmenu.add_checkbutton(label="🔬 Perfilado", variable=self.profiling,
+                                 command=self._toggle_profiling)
+        viewmenu.add_command(label="💾 Exportar perfil", command=self.export_profile)
+        viewmenu.add_checkbutton(label="📡 Exportar métricas", variable=self.exporting_metrics,
+                                 command=self._toggle_metrics)
+        menubar.add_cascade(label="Ver", menu=viewmenu)
         self.root.config(menu=menubar)
 
     def show_fitness_graph(self):
@@ -92,6 +139,19 @@ class MainWindow:
                 "3. Esperar a que termine la optimización"
             )
 
+    def show_live_chart(self):
+        """Gráfico que sigue a la optimización en curso (o la última)"""
+        if self.live_chart is not None:
+            self.live_chart.lift()
+            return
+        history = None
+        if self.ga and getattr(self.ga, 'history', None):
+            history = (self.ga.history[:], self.ga.avg_history[:], self.ga.min_history[:])
+        self.live_chart = LiveFitnessChart(self.root, history=history, on_close=self._live_chart_closed)
+
+    def _live_chart_closed(self):
+        self.live_chart = None
+
     def start_simulation(self):
         """Inicia la simulación con semáforos DESORGANIZADOS"""
         if self.simulation and self.simulation.is_running:
@@ -99,7 +159,15 @@ class MainWindow:
         
         vehicles = self.control_panel.get_vehicle_count()
         self.simulation = TrafficSimulation(total_vehicles=vehicles)
+        if self.metrics:
+            self.metrics.attach(self.simulation)
         self.simulation.start()
+        if self.timetable is not None:
+            self.simulation.set_timetable(self.timetable)
+        if self.control_panel.is_actuated():
+            self.simulation.set_actuated(True)
+        if self.control_panel.is_rolling():
+            self.set_rolling(True)
         self.control_panel.update_button_state(running=True)
         self.stats_panel.update_optimized(False)
         
@@ -114,13 +182,47 @@ class MainWindow:
 
     def stop_simulation(self):
         """Detiene la simulación"""
+        self.set_rolling(False)
         if self.simulation:
             self.simulation.stop()
+            self.frame_scheduler.stop()
             self.control_panel.update_button_state(running=False)
 
+    def set_speed(self, value):
+        """Multiplicador de velocidad de la simulación (slider)"""
+        self.frame_scheduler.set_speed(value)
+
+    def set_actuated(self, actuated):
+        """Plan fijo del AG o control actuado sobre ese plan (checkbox)"""
+        if self.simulation:
+            self.simulation.set_actuated(actuated)
+
+    def set_rolling(self, enabled):
+        """Re-optimización periódica en segundo plano, aplicada sin reinicio"""
+        if self.rolling:
+            self.rolling.stop()
+            self.rolling = None
+            self.root.after_cancel(self._rolling_poll)
+        if enabled and self.simulation and self.simulation.is_running:
+            fitness = self.control_panel.get_fitness()
+            self.rolling = RollingHorizon(self.simulation, self.control_panel.get_optimizer(),
+                                          on_applied=lambda result: self.stats_panel.update_optimized(True),
+                                          cache=self._get_plan_cache() if fitness == "snapshot" else None,
+                                          fitness=fitness)
+            self._poll_rolling()
+
+    def _poll_rolling(self):
+        self.rolling.poll()
+        self._rolling_poll = self.root.after(Config.OPTIMIZATION_POLL_MS, self._poll_rolling)
+
+    def _toggle_performance_overlay(self):
+        if not self.show_performance.get():
+            self.traffic_canvas.hide_overlay()
+
     def reset_simulation(self):
         """Reinicia completamente la simulación"""
         self.stop_simulation()
+        self.cancel_optimization()  # Su plan sería para semáforos que ya no existen
         
         if self.simulation:
             self.simulation.reset()
@@ -132,9 +234,85 @@ class MainWindow:
         
         messagebox.showinfo("Reinicio Completo", "🔄 Sistema reiniciado completamente")
 
+    def _toggle_profiling(self):
+        if self.profiling.get():
+            PROFILER.enable()
+        else:
+            PROFILER.disable()
+
+    def load_timetable(self):
+        """Carga un horario de planes por período (plan_scheduler.py) y lo sigue"""
+        from plan_scheduler import PlanTimetable
+
+        path = filedialog.askopenfilename(initialfile="horario.json",
+                                          filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            timetable = PlanTimetable.load(path)
+        except (OSError, ValueError, KeyError) as exc:
+            messagebox.showerror("Horario", f"❌ No se pudo cargar el horario:\n{exc}")
+            return
+        self.timetable = timetable
+        if self.simulation:
+            self.simulation.set_timetable(timetable)
+            self.stats_panel.update_optimized(True)
+        log.info("🗓️ Horario de %d planes cargado desde %s", len(timetable), path)
+        messagebox.showinfo(
+            "Horario",
+            f"🗓️ {len(timetable)} planes de {timetable.period_seconds:.0f}s simulados\n\n"
+            "El plan cambia en cada límite de período sin reiniciar"
+        )
+
+    def export_profile(self):
+        """Guarda el perfil en JSON y, al lado, las pilas para un flame graph"""
+        if not PROFILER.phases:
+            messagebox.showinfo("Perfil", "⚠️ No hay mediciones.\n\nActiva 'Ver > Perfilado' primero.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".json", initialfile="perfil.json",
+                                            filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        PROFILER.export_json(path)
+        folded = path.rsplit(".", 1)[0] + ".folded"
+        PROFILER.export_folded(folded)
+        log.info("💾 Perfil exportado en %s y %s", path, folded)
+        messagebox.showinfo("Perfil", f"💾 Perfil guardado:\n{path}\n{folded}")
+
+    def _toggle_metrics(self):
+        """Muestrea KPIs a un archivo y los publica en /metrics mientras esté activo"""
+        from metrics import MetricsExporter
+        
+        if not self.exporting_metrics.get():
+            if self.metrics:
+                self.metrics.close()
+                if self.simulation:
+                    self.simulation.metrics = None
+                self.metrics = None
+            return
+        
+        path = filedialog.asksaveasfilename(defaultextension=".jsonl", initialfile="kpis.jsonl",
+                                            filetypes=[("JSON Lines", "*.jsonl"), ("CSV", "*.csv")])
+        if not path:
+            self.exporting_metrics.set(False)
+            return
+        try:
+            self.metrics = MetricsExporter(path=path, port=Config.METRICS_PORT)
+        except OSError as exc:  # Puerto ocupado: solo archivo
+            log.warning("⚠️ Sin endpoint /metrics: %s", exc)
+            self.metrics = MetricsExporter(path=path)
+        if self.simulation:
+            self.metrics.attach(self.simulation)
+
+    def _get_plan_cache(self):
+        if self.plan_cache is None:
+            from plan_cache import PlanCache
+            self.plan_cache = PlanCache()
+        return self.plan_cache
+
     def optimize_traffic(self):
-        """Optimiza el tráfico con el Algoritmo Genético"""
-        print("🔧 DEBUG: Botón Optimizar presionado")
+        """Optimiza el tráfico con el optimizador elegido (AG por defecto)"""
+        log.debug("🔧 Botón Optimizar presionado")
         if not self.simulation or not self.simulation.is_running:
             messagebox.showwarning(
                 "Advertencia", 
@@ -144,51 +322,125 @@ class MainWindow:
             return
 
         generations = self.control_panel.get_generations()
+        optimizer_name = self.control_panel.get_optimizer()
+        fitness = self.control_panel.get_fitness()
+        
+        # Datos REALES del tráfico actual, leídos aquí en el hilo de Tk
+        traffic_data = self.simulation.get_real_traffic_data()
+        
+        # ¿Ya se resolvió un estado de tráfico equivalente? (el caché guarda
+        # fitness sobre el tráfico observado: no aplica al fitness por simulación)
+        cache = self._get_plan_cache() if fitness == "snapshot" else None
+        hit = cache.lookup(traffic_data) if cache is not None else None
+        if hit is not None:
+            self.simulation.apply_optimization(hit['plan'])
+            self.timetable = None  # Un plan puesto a mano reemplaza al horario
+            self.stats_panel.update_optimized(True)
+            messagebox.showinfo(
+                "⚡ Plan recuperado",
+                f"Estado de tráfico ya optimizado antes (distancia {hit['distance']})\n\n"
+                f"Fitness guardado: {hit['fitness']:.2f}\n"
+                f"Reutilizado {hit['hits']} veces\n\n"
+                "🎯 Plan aplicado sin volver a optimizar"
+            )
+            return
+        seed_plans = cache.neighbours(traffic_data) if cache is not None else []
+        self._optimization_data = traffic_data
+        self._optimization_cached = cache is not None
         
         # Mostrar barra de progreso
         self.progress_bar.pack(pady=8)
         self.progress_label.pack(pady=2)
+        self.optimization_buttons.pack(pady=2)
         self.progress_bar['value'] = 0
         self.progress_bar['maximum'] = generations
         self.control_panel.btn_optimize.config(state=tk.DISABLED)
+        self.btn_pause.config(text="⏸️ Pausar")
         self.progress_label.config(text="🧬 Iniciando optimización...")
 
-        def progress_callback(gen, total, fitness):
-            """Actualiza la barra de progreso"""
-            self.progress_bar['value'] = gen + 1
-            self.progress_label.config(
-                text=f"🧬 Generación {gen+1}/{total} → Fitness: {fitness:.1f}"
-            )
-            self.root.update_idletasks()
+        if self.live_chart is not None:
+            self.live_chart.clear()
 
-        def run_optimization():
-            """Ejecuta el AG en un thread separado"""
-            # Obtener datos REALES del tráfico actual
-            traffic_data = self.simulation.get_real_traffic_data()
-            
-            # Crear y ejecutar el algoritmo genético
-            self.ga = GeneticAlgorithm(num_intersections=6)
-            self.ga.generations = generations
-            result = self.ga.optimize(traffic_data, callback=progress_callback)
-            
-            # Aplicar la solución (esto reinicia la simulación visualmente)
-            self.simulation.apply_optimization(result['best_solution'])
-            
-            # Actualizar UI en el thread principal
-            self.root.after(0, lambda: self._optimization_complete(result))
+        current_greens = None
+        if Config.GA_CORRIDOR_SEED:
+            # Semilla exacta de la ola verde (se calcula en el proceso hijo)
+            current_greens = [light.green_time for light in self.simulation.traffic_lights]
+
+        # Mismo presupuesto de evaluaciones que el AG
+        self.optimization = BackgroundOptimization(
+            optimizer_name, traffic_data,
+            max_evaluations=generations * Config.GA_POPULATION_SIZE,
+            current_greens=current_greens, num_intersections=6, seed_plans=seed_plans,
+            fitness=fitness)
+        self.ga = self.optimization
+        self.root.after(Config.OPTIMIZATION_POLL_MS, self._poll_optimization)
 
-        # Iniciar optimización en thread
-        threading.Thread(target=run_optimization, daemon=True).start()
+    def _poll_optimization(self):
+        """Atiende los mensajes del proceso optimizador (hilo de Tk)"""
+        job = self.optimization
+        if job is None:
+            return
+        for message in job.poll():
+            kind = message[0]
+            if kind == "progress":
+                gen, total, fitness, best, avg, worst = message[1:]
+                self.progress_bar['maximum'] = total
+                self.progress_bar['value'] = gen + 1
+                self.progress_label.config(
+                    text=f"🧬 Generación {gen+1}/{total} → Fitness: {fitness:.1f}"
+                )
+                if self.live_chart is not None:
+                    self.live_chart.push(best, avg, worst)
+            elif kind == "done":
+                self._finish_optimization()
+                result = message[1]
+                if result['best_solution'] and self._optimization_cached:
+                    self._get_plan_cache().store(self._optimization_data, result['best_solution'])
+                self._optimization_complete(result)
+                return
+            else:
+                self._finish_optimization()
+                if kind == "error":
+                    messagebox.showerror("Error en la optimización", f"❌ {message[1]}")
+                else:
+                    log.info("✖️ Optimización cancelada")
+                return
+        self.root.after(Config.OPTIMIZATION_POLL_MS, self._poll_optimization)
+
+    def _finish_optimization(self):
+        self.optimization = None
+        self.progress_bar.pack_forget()
+        self.progress_label.pack_forget()
+        self.optimization_buttons.pack_forget()
+        self.control_panel.btn_optimize.config(state=tk.NORMAL)
+
+    def toggle_pause_optimization(self):
+        job = self.optimization
+        if job is None:
+            return
+        if job.paused:
+            job.resume()
+            self.btn_pause.config(text="⏸️ Pausar")
+        else:
+            job.pause()
+            self.btn_pause.config(text="▶️ Reanudar")
+            self.progress_label.config(text="⏸️ Optimización en pausa")
+
+    def cancel_optimization(self):
+        if self.optimization is not None:
+            self.optimization.cancel()
+            self.progress_label.config(text="✖️ Cancelando...")
 
     # En main_window.py, reemplazar SOLO el método _optimization_complete:
 
     # En main_window.py, busca y reemplaza SOLO el método _optimization_complete:
 
     def _optimization_complete(self, result):
-        """Callback cuando termina la optimización"""
-        self.progress_bar.pack_forget()
-        self.progress_label.pack_forget()
-        self.control_panel.btn_optimize.config(state=tk.NORMAL)
+        """Aplica el plan y muestra el resumen (hilo de Tk)"""
+        # Aplicar la solución (esto reinicia la simulación visualmente)
+        if self.simulation:
+            self.simulation.apply_optimization(result['best_solution'])
+            self.timetable = None
         
         # Calcular mejora real
         if result['history'] and len(result['history']) > 1:
@@ -234,10 +486,29 @@ class MainWindow:
         self.root.after(500, lambda: None)  # Solo un pequeño delay
 
     def animate(self):
-        """Loop de animación principal"""
-        if self.simulation and self.simulation.is_running:
-            dt = Config.UPDATE_INTERVAL / 1000.0
-            self.simulation.update(dt)
-            self.traffic_canvas.draw(self.simulation)
-            self.stats_panel.update(self.simulation.get_statistics())
-            self.root.after(Config.UPDATE_INTERVAL, self.animate)
\ No newline at end of file
+        """Loop de animación principal (paso fijo, ver FrameScheduler)"""
+        self.frame_scheduler.start()
+
+    def _render_frame(self):
+        """Dibuja un fotograma; retorna las operaciones sobre el canvas"""
+        laps = PROFILER.laps("frame.render")
+        items = self.traffic_canvas.draw(self.simulation)
+        if laps:
+            laps.lap("scene")
+        self.stats_panel.update(self.simulation.snapshot.statistics())
+        if laps:
+            laps.lap("stats")
+            laps.finish()
+        
+        if self.show_performance.get():
+            now = time.perf_counter()
+            if now - self._overlay_updated >= Config.OVERLAY_REFRESH:
+                self._overlay_updated = now
+                st = self.frame_scheduler.stats
+                self.traffic_canvas.show_overlay(
+                    f"Sim: {st['sim_ms']:5.1f} ms ({st['steps']} pasos)\n"
+                    f"Dibujo: {st['render_ms']:5.1f} ms\n"
+                    f"FPS: {st['fps']:5.1f}  ×{self.frame_scheduler.speed:g}\n"
+                    f"Ítems: {items}  Saltados: {st['skipped']}"
+                )
+        return items
@@ -0,0 +1,62 @@
+# gui/plots.py - GRÁFICOS CON MATPLOTLIB (IMPORTACIÓN DIFERIDA)
+import logging
+
+log = logging.getLogger(__name__)
+
+
+def plot_fitness_history(best, avg, worst, title="EVOLUCIÓN DEL FITNESS - ALGORITMO GENÉTICO"):
+    """Muestra el gráfico de evolución de un historial de fitness"""
+    if not best or len(best) < 2:
+        log.warning("⚠️ Datos insuficientes")
+        return
+    
+    # Importación diferida: matplotlib + TkAgg solo cuando se pide un gráfico
+    import matplotlib
+    matplotlib.use('TkAgg')
+    import matplotlib.pyplot as plt
+    
+    gens = list(range(1, len(best) + 1))
+    
+    plt.figure(figsize=(15, 9))
+    plt.style.use('dark_background')
+    ax = plt.gca()
+    ax.set_facecolor('#0f1620')
+    
+    # Graficar
+    plt.plot(gens, best, color='#00ff88', linewidth=4, 
+            marker='o', markersize=7, markevery=max(1, len(gens)//15),
+            label='Mejor Fitness', zorder=3)
+    
+    plt.plot(gens, avg, color='#ff9900', linewidth=2.5, 
+            linestyle='--', alpha=0.85, label='Fitness Promedio', zorder=2)
+    
+    plt.plot(gens, worst, color='#ff4444', linewidth=1.5,
+            linestyle=':', alpha=0.7, label='Peor Fitness', zorder=1)
+    
+    plt.fill_between(gens, best, worst, color='#2c3e50', alpha=0.2)
+    
+    plt.title(title, fontsize=24, fontweight='bold', color='#00ff88', pad=20)
+    plt.xlabel("Generación", fontsize=18, color='white', labelpad=15)
+    plt.ylabel("Fitness (menor = mejor)", fontsize=18, color='white', labelpad=15)
+    plt.grid(True, alpha=0.25, color='#666', linestyle='--', linewidth=0.8)
+    plt.legend(fontsize=14, loc='upper right', framealpha=0.9)
+    
+    # Info
+    if len(best) > 1 and best[0] != 0:
+        mejora = ((best[0] - best[-1]) / abs(best[0])) * 100
+        
+        info_text = (f"Mejora: {mejora:.1f}%\n"
+                    f"Fitness Inicial: {best[0]:.2f}\n"
+                    f"Fitness Final: {best[-1]:.2f}\n"
+                    f"Generaciones: {len(gens)}")
+        
+        plt.text(0.02, 0.98, info_text,
+                transform=ax.transAxes, fontsize=13, fontweight='bold',
+                verticalalignment='top',
+                bbox=dict(boxstyle='round,pad=0.8', facecolor='#1e2a38', 
+                        alpha=0.95, edgecolor='#00ff88', linewidth=3),
+                color='white')
+    
+    plt.xlim(0, max(gens) + 2)
+    plt.tight_layout()
+    plt.show()
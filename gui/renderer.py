@@ -0,0 +1,399 @@
+# gui/renderer.py - RENDERIZADO RETENIDO (CREA UNA VEZ, MUEVE DESPUÉS)
+import math
+import tkinter as tk
+from config import Config
+from gui.viewport import Viewport
+from models.traffic_light import TrafficLight
+from models.vehicle import Vehicle
+
+
+class SceneRenderer:
+    """
+    Dibuja la simulación creando cada ítem del canvas una sola vez.
+    Los fotogramas siguientes solo mueven (coords) o recolorean (itemconfig)
+    lo que cambió; los ítems de vehículos que desaparecen se ocultan y se
+    reciclan para los vehículos nuevos.
+
+    Carreteras, marcas viales y etiquetas forman la capa estática (tag
+    "static"): se dibujan una vez y solo se reconstruyen si cambia la red
+    o el tamaño del canvas. Un pan/zoom solo escala y mueve los ítems ya
+    dibujados; las calles cubren la zona visible con un margen de una
+    pantalla, y se redibujan solo si la vista sale de esa zona.
+
+    Con pan/zoom solo se dibuja lo visible. Al alejarse cambia el nivel de
+    detalle: primero vehículos como puntos y después solo un mapa de calor
+    de densidad por tramo de calle.
+
+    Todo lo dinámico se lee de la última instantánea publicada por la
+    simulación (simulation.snapshot), nunca de los objetos vivos.
+    """
+    STATIC_TAG = "static"
+    LABEL_TAG = "labels"
+    LIGHT_TAG = "lights"
+    VEHICLE_TAG = "vehicles"
+    HEATMAP_TAG = "heatmap"
+
+    def __init__(self, canvas, viewport=None):
+        self.canvas = canvas
+        self.viewport = viewport or Viewport()
+        self.vehicle_items = {}    # vehicle.id → [corrida, carrocería, ventanas, x, y, color]
+        self.light_items = {}      # light.id → [ovales NS, ovales EO, color NS, color EO, visible]
+        self._free_vehicle_items = []
+        self._simulation = None
+        self._static_key = None    # (versión de la red, ancho, alto del canvas)
+        self._static_view = None   # (escala, desplazamiento x, y) aplicados a la capa estática
+        self._static_bounds = None # Rectángulo del mundo cubierto por las calles
+        self._view_version = None  # Vista con la que se colocaron luces y vehículos
+        self._lod = "full"
+        self._vehicles_dots = False  # Estilo actual de los ítems de vehículos
+        self._links = None         # Tramos del mapa de calor
+        self._link_items = []
+        self._link_colors = []
+        self.items_updated = 0     # Operaciones sobre el canvas en el último fotograma
+
+    def clear(self):
+        """Olvida todos los ítems (el canvas debe limpiarse aparte)"""
+        self.vehicle_items.clear()
+        self.light_items.clear()
+        self._free_vehicle_items.clear()
+        self._simulation = None
+        self._static_key = None
+        self._static_view = None
+        self._static_bounds = None
+        self._view_version = None
+        self._lod = "full"
+        self._vehicles_dots = False
+        self._links = None
+        self._link_items = []
+        self._link_colors = []
+
+    def resize(self, width, height):
+        """El canvas cambió de tamaño: la capa estática se reconstruirá"""
+        self.viewport.resize(width, height)
+
+    def render(self, simulation):
+        if simulation is not self._simulation:
+            self.canvas.delete("all")
+            self.clear()
+            self._simulation = simulation
+
+        self.items_updated = 0
+        snapshot = simulation.snapshot
+        view_changed = self.viewport.version != self._view_version
+        self._render_static(simulation)
+        self._render_lights(snapshot, view_changed)
+
+        lod = self.viewport.level_of_detail()
+        if lod != self._lod:
+            self.canvas.itemconfig(self.LABEL_TAG, state=tk.NORMAL if lod == "full" else tk.HIDDEN)
+            self.canvas.itemconfig(self.HEATMAP_TAG, state=tk.NORMAL if lod == "heatmap" else tk.HIDDEN)
+            self._lod = lod
+
+        if lod == "heatmap":
+            self._release_all_vehicles()
+            self._render_heatmap(snapshot, view_changed)
+        else:
+            self._render_vehicles(snapshot, view_changed, dots=lod == "dots")
+
+        self._view_version = self.viewport.version
+
+    # ==================== CAPA ESTÁTICA ====================
+
+    def _render_static(self, simulation):
+        vp = self.viewport
+        key = (simulation.network_version, vp.width, vp.height)
+        if key == self._static_key and self._covers(vp.visible_world()):
+            self._transform_static()
+            return
+
+        canvas = self.canvas
+        if self._static_key is None or key[0] != self._static_key[0]:
+            # Red nueva: semáforos y tramos también se recrean
+            canvas.delete(self.LIGHT_TAG)
+            canvas.delete(self.HEATMAP_TAG)
+            self.light_items.clear()
+            self._links = None
+            self._link_items = []
+            self._link_colors = []
+
+        # Se dibuja en coordenadas del mundo (lo visible más una pantalla de margen)
+        # y se lleva a la vista actual
+        canvas.delete(self.STATIC_TAG)
+        x1, y1, x2, y2 = vp.visible_world()
+        margin = max(x2 - x1, y2 - y1)
+        bounds = (min(0, x1 - margin), min(0, y1 - margin),
+                  max(Config.CANVAS_WIDTH, x2 + margin), max(Config.CANVAS_HEIGHT, y2 + margin))
+        simulation.draw_static(canvas, bounds[2], bounds[3], tags=(self.STATIC_TAG,),
+                               label_tags=(self.STATIC_TAG, self.LABEL_TAG),
+                               x0=bounds[0], y0=bounds[1])
+        self._static_view = (1.0, 0.0, 0.0)
+        self._static_bounds = bounds
+        self._transform_static()
+        if self._lod != "full":
+            canvas.itemconfig(self.LABEL_TAG, state=tk.HIDDEN)
+        canvas.tag_lower(self.STATIC_TAG)
+        self._static_key = key
+
+    def _covers(self, rect):
+        bx1, by1, bx2, by2 = self._static_bounds
+        x1, y1, x2, y2 = rect
+        return bx1 <= x1 and by1 <= y1 and x2 <= bx2 and y2 <= by2
+
+    def _transform_static(self):
+        """Lleva la capa estática de la vista con que se dibujó a la actual"""
+        vp = self.viewport
+        scale, offset_x, offset_y = self._static_view
+        if (scale, offset_x, offset_y) == (vp.scale, vp.offset_x, vp.offset_y):
+            return
+        # pantalla = mundo × escala + desplazamiento: escalar desde el origen y luego mover
+        factor = vp.scale / scale
+        if factor != 1.0:
+            self.canvas.scale(self.STATIC_TAG, 0, 0, factor, factor)
+        dx, dy = vp.offset_x - offset_x * factor, vp.offset_y - offset_y * factor
+        if dx or dy:
+            self.canvas.move(self.STATIC_TAG, dx, dy)
+        self._static_view = (vp.scale, vp.offset_x, vp.offset_y)
+
+    # ==================== SEMÁFOROS ====================
+
+    def _lamp_coords(self, x, y):
+        vp = self.viewport
+        sx, sy = vp.to_screen(x, y)
+        size = max(1.5, 14 * vp.scale)
+        return sx - size, sy - size, sx + size, sy + size
+
+    def _create_light(self, light_id, lx, ly):
+        canvas = self.canvas
+        ovals = {}
+        for name, (x, y) in TrafficLight.lamp_positions(lx, ly).items():
+            ovals[name] = canvas.create_oval(*self._lamp_coords(x, y),
+                                             fill=Config.LIGHT_OFF, outline="white", width=2,
+                                             tags=(self.LIGHT_TAG,))
+
+        entry = [(ovals["N"], ovals["S"]), (ovals["E"], ovals["O"]), None, None, True]
+        self.light_items[light_id] = entry
+        self._place_light(lx, ly, entry)
+        return entry
+
+    def _place_light(self, lx, ly, entry):
+        """Recoloca (o esconde si está fuera de la vista) tras un pan/zoom"""
+        x1, y1, x2, y2 = self.viewport.visible_world(margin=60)
+        visible = x1 <= lx <= x2 and y1 <= ly <= y2
+        state = tk.NORMAL if visible else tk.HIDDEN
+        positions = TrafficLight.lamp_positions(lx, ly)
+        for item, name in zip(entry[0] + entry[1], ("N", "S", "E", "O")):
+            if visible:
+                self.canvas.coords(item, *self._lamp_coords(*positions[name]))
+            if visible != entry[4]:
+                self.canvas.itemconfig(item, state=state)
+        entry[4] = visible
+        self.items_updated += 4
+
+    def _render_lights(self, snapshot, view_changed):
+        canvas = self.canvas
+        colors = TrafficLight.STATE_COLORS
+        created = False
+        for light_id, lx, ly, ns_state, ew_state in snapshot.lights:
+            entry = self.light_items.get(light_id)
+            if entry is None:
+                entry = self._create_light(light_id, lx, ly)
+                created = True
+            elif view_changed:
+                self._place_light(lx, ly, entry)
+            if not entry[4]:
+                continue
+
+            ns_color, ew_color = colors[ns_state], colors[ew_state]
+
+            if ns_color != entry[2]:
+                for item in entry[0]:
+                    canvas.itemconfig(item, fill=ns_color)
+                entry[2] = ns_color
+                self.items_updated += 2
+            if ew_color != entry[3]:
+                for item in entry[1]:
+                    canvas.itemconfig(item, fill=ew_color)
+                entry[3] = ew_color
+                self.items_updated += 2
+
+        if created:
+            # Los vehículos siempre por encima de los semáforos
+            canvas.tag_raise(self.VEHICLE_TAG)
+
+    # ==================== VEHÍCULOS ====================
+
+    def _acquire_vehicle_items(self):
+        """Reutiliza un par de rectángulos ocultos o crea uno nuevo"""
+        if self._free_vehicle_items:
+            body, windows = self._free_vehicle_items.pop()
+            self.canvas.itemconfig(body, state=tk.NORMAL)
+            self.canvas.itemconfig(windows, state=tk.NORMAL)
+            return body, windows
+        body = self.canvas.create_rectangle(0, 0, 0, 0, outline="white", width=2,
+                                            tags=(self.VEHICLE_TAG,))
+        windows = self.canvas.create_rectangle(0, 0, 0, 0, fill="#2c3e50",
+                                               tags=(self.VEHICLE_TAG,))
+        return body, windows
+
+    def _release_vehicle_items(self, entry):
+        _, body, windows = entry[:3]
+        self.canvas.itemconfig(body, state=tk.HIDDEN)
+        self.canvas.itemconfig(windows, state=tk.HIDDEN)
+        self._free_vehicle_items.append((body, windows))
+
+    def _release_all_vehicles(self):
+        for entry in self.vehicle_items.values():
+            self._release_vehicle_items(entry)
+            self.items_updated += 2
+        self.vehicle_items.clear()
+
+    def _style_vehicle(self, entry, dots):
+        """Punto sin contorno ni ventanas, o carro completo"""
+        if dots:
+            self.canvas.itemconfig(entry[1], outline="", width=0)
+            self.canvas.itemconfig(entry[2], state=tk.HIDDEN)
+        else:
+            self.canvas.itemconfig(entry[1], outline="white", width=2)
+            self.canvas.itemconfig(entry[2], state=tk.NORMAL)
+        self.items_updated += 2
+
+    def _render_vehicles(self, snapshot, view_changed, dots=False):
+        canvas = self.canvas
+        vp = self.viewport
+        x1, y1, x2, y2 = vp.visible_world(margin=20)
+        scale, ox, oy = vp.scale, vp.offset_x, vp.offset_y
+        restyle = dots != self._vehicles_dots
+        self._vehicles_dots = dots
+        run = snapshot.run
+        xs, ys = snapshot.xs, snapshot.ys
+        horizontal, waiting = snapshot.horizontal, snapshot.waiting
+        seen = set()
+
+        for k, vid in enumerate(snapshot.ids):
+            x, y = xs[k], ys[k]
+            # Culling: fuera de la vista no se dibuja
+            if not (x1 <= x <= x2 and y1 <= y <= y2):
+                continue
+            seen.add(vid)
+            entry = self.vehicle_items.get(vid)
+            if entry is not None and entry[0] != run:
+                # El id se reutilizó tras un reinicio: es otro vehículo
+                self._release_vehicle_items(entry)
+                entry = None
+            if entry is None:
+                body, windows = self._acquire_vehicle_items()
+                entry = [run, body, windows, None, None, None]
+                self.vehicle_items[vid] = entry
+                # Un ítem reciclado puede venir del otro nivel de detalle
+                self._style_vehicle(entry, dots)
+            elif view_changed:
+                if restyle:
+                    self._style_vehicle(entry, dots)
+                entry[3] = None
+
+            if x != entry[3] or y != entry[4]:
+                if dots:
+                    sx, sy = x * scale + ox, y * scale + oy
+                    canvas.coords(entry[1], sx - 1, sy - 1, sx + 1, sy + 1)
+                    self.items_updated += 1
+                else:
+                    body, windows = Vehicle.shape_at(x, y, horizontal[k])
+                    canvas.coords(entry[1], body[0] * scale + ox, body[1] * scale + oy,
+                                  body[2] * scale + ox, body[3] * scale + oy)
+                    canvas.coords(entry[2], windows[0] * scale + ox, windows[1] * scale + oy,
+                                  windows[2] * scale + ox, windows[3] * scale + oy)
+                    self.items_updated += 2
+                entry[3], entry[4] = x, y
+
+            color = Config.VEHICLE_COLOR_WAITING if waiting[k] else Config.VEHICLE_COLOR_MOVING
+            if color != entry[5]:
+                canvas.itemconfig(entry[1], fill=color)
+                entry[5] = color
+                self.items_updated += 1
+
+        # Vehículos que salieron (o quedaron fuera de la vista): ocultar y reciclar
+        if len(seen) != len(self.vehicle_items):
+            for vid in [vid for vid in self.vehicle_items if vid not in seen]:
+                self._release_vehicle_items(self.vehicle_items.pop(vid))
+                self.items_updated += 2
+
+    # ==================== MAPA DE CALOR ====================
+
+    def _build_links(self):
+        """
+        Tramos de calle entre intersecciones consecutivas, derivados de
+        Config.LANES. Cada calle horizontal se corta en las verticales y
+        viceversa.
+        """
+        road_ys = sorted({lane[1] for lane in Config.LANES if lane[4] == "horizontal"})
+        road_xs = sorted({lane[0] for lane in Config.LANES if lane[4] == "vertical"})
+        width, height = Config.CANVAS_WIDTH, Config.CANVAS_HEIGHT
+
+        links = []
+        for y in road_ys:
+            edges = [0] + road_xs + [width]
+            for a, b in zip(edges[:-1], edges[1:]):
+                links.append((a, y, b, y))
+        for x in road_xs:
+            edges = [0] + road_ys + [height]
+            for a, b in zip(edges[:-1], edges[1:]):
+                links.append((x, a, x, b))
+        return road_ys, road_xs, links
+
+    def _link_counts(self, snapshot):
+        """Vehículos por tramo con un conteo por bins vectorizado (numpy)"""
+        import numpy as np
+
+        road_ys, road_xs, links = self._links
+        if len(snapshot) == 0:
+            return np.zeros(len(links), dtype=np.int64)
+
+        # Sin copias: numpy lee directamente los arreglos de la instantánea
+        xs = np.frombuffer(snapshot.xs, dtype=np.float64)
+        ys = np.frombuffer(snapshot.ys, dtype=np.float64)
+        horizontal = np.frombuffer(snapshot.horizontal, dtype=np.int8).astype(bool)
+        ry = np.asarray(road_ys, dtype=float)
+        rx = np.asarray(road_xs, dtype=float)
+        h_segments = len(road_xs) + 1
+        v_segments = len(road_ys) + 1
+
+        # Horizontales: calle más cercana en y, tramo según x
+        road = np.abs(ys[:, None] - ry[None, :]).argmin(axis=1)
+        h_ids = road * h_segments + np.searchsorted(rx, xs)
+        # Verticales: calle más cercana en x, tramo según y
+        road = np.abs(xs[:, None] - rx[None, :]).argmin(axis=1)
+        v_ids = len(road_ys) * h_segments + road * v_segments + np.searchsorted(ry, ys)
+
+        ids = np.where(horizontal, h_ids, v_ids)
+        return np.bincount(ids, minlength=len(links))
+
+    def _render_heatmap(self, snapshot, view_changed):
+        canvas = self.canvas
+        vp = self.viewport
+        if self._links is None:
+            self._links = self._build_links()
+            self._link_colors = [None] * len(self._links[2])
+            self._link_items = [canvas.create_line(0, 0, 0, 0, width=6, capstyle=tk.ROUND,
+                                                   tags=(self.HEATMAP_TAG,))
+                                for _ in self._links[2]]
+            view_changed = True
+
+        links = self._links[2]
+        if view_changed:
+            for item, (ax, ay, bx, by) in zip(self._link_items, links):
+                canvas.coords(item, *vp.to_screen(ax, ay), *vp.to_screen(bx, by))
+                canvas.itemconfig(item, width=max(3, 70 * vp.scale))
+            canvas.tag_raise(self.HEATMAP_TAG)
+            self.items_updated += 2 * len(links)
+
+        colors = Config.HEATMAP_COLORS
+        counts = self._link_counts(snapshot)
+        for k, (ax, ay, bx, by) in enumerate(links):
+            length = max(abs(bx - ax) + abs(by - ay), 1)
+            density = counts[k] * 100 / length
+            level = min(len(colors) - 1,
+                        int(math.ceil(density / Config.HEATMAP_MAX_DENSITY * (len(colors) - 1))))
+            if colors[level] != self._link_colors[k]:
+                canvas.itemconfig(self._link_items[k], fill=colors[level])
+                self._link_colors[k] = colors[level]
+                self.items_updated += 1
@@ -1,15 +1,64 @@
 # gui/traffic_canvas.py
 import tkinter as tk
 from config import Config
+from gui.renderer import SceneRenderer
+from gui.viewport import Viewport
 
 class TrafficCanvas:
     def __init__(self, parent):
         self.canvas = tk.Canvas(parent, width=Config.CANVAS_WIDTH, height=Config.CANVAS_HEIGHT,
                                 bg=Config.CANVAS_BG, highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.viewport = Viewport()
+        self.renderer = SceneRenderer(self.canvas, self.viewport)
+        self._drag_start = None
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        # Zoom con la rueda (Windows/macOS y Linux) y pan arrastrando
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self._zoom(e, Config.VIEW_ZOOM_STEP))
+        self.canvas.bind("<Button-5>", lambda e: self._zoom(e, 1 / Config.VIEW_ZOOM_STEP))
+        self.canvas.bind("<ButtonPress-1>", self._on_drag_start)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<ButtonRelease-1>", lambda e: setattr(self, "_drag_start", None))
+        # Doble clic: volver a la vista completa
+        self.canvas.bind("<Double-Button-1>", lambda e: self.viewport.reset())
+
+    def _on_resize(self, event):
+        self.renderer.resize(event.width, event.height)
+
+    def _on_wheel(self, event):
+        self._zoom(event, Config.VIEW_ZOOM_STEP if event.delta > 0 else 1 / Config.VIEW_ZOOM_STEP)
+
+    def _zoom(self, event, factor):
+        self.viewport.zoom_at(factor, event.x, event.y)
+
+    def _on_drag_start(self, event):
+        self._drag_start = (event.x, event.y)
+
+    def _on_drag(self, event):
+        if self._drag_start is None:
+            return
+        self.viewport.pan(event.x - self._drag_start[0], event.y - self._drag_start[1])
+        self._drag_start = (event.x, event.y)
 
     def draw(self, simulation):
-        simulation.draw(self.canvas)
+        """Dibuja y retorna cuántas operaciones hizo sobre el canvas"""
+        self.renderer.render(simulation)
+        return self.renderer.items_updated
+
+    def show_overlay(self, text):
+        """Texto de rendimiento en la esquina superior izquierda"""
+        if not self.canvas.find_withtag("overlay"):
+            self.canvas.create_text(10, 10, anchor=tk.NW, text=text, fill="#00ff88",
+                                    font=("Courier", 10, "bold"), tags=("overlay",))
+        else:
+            self.canvas.itemconfig("overlay", text=text)
+        self.canvas.tag_raise("overlay")
+
+    def hide_overlay(self):
+        self.canvas.delete("overlay")
 
     def clear(self):
-        self.canvas.delete("all")
\ No newline at end of file
+        self.canvas.delete("all")
+        self.renderer.clear()
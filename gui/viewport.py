@@ -0,0 +1,65 @@
+# gui/viewport.py - TRANSFORMACIÓN MUNDO ↔ PANTALLA (PAN / ZOOM)
+from config import Config
+
+
+class Viewport:
+    """
+    Vista del canvas sobre el mundo de la simulación.
+    pantalla = mundo × escala + desplazamiento.
+    `version` cambia con cada pan/zoom para que el renderer sepa cuándo
+    recolocar lo que ya estaba dibujado.
+    """
+
+    def __init__(self, width=Config.CANVAS_WIDTH, height=Config.CANVAS_HEIGHT):
+        self.width = width
+        self.height = height
+        self.scale = 1.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.version = 0
+
+    def resize(self, width, height):
+        self.width = width
+        self.height = height
+        self.version += 1
+
+    def reset(self):
+        self.scale = 1.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.version += 1
+
+    def pan(self, dx, dy):
+        """Desplaza la vista dx, dy píxeles de pantalla"""
+        self.offset_x += dx
+        self.offset_y += dy
+        self.version += 1
+
+    def zoom_at(self, factor, sx, sy):
+        """Zoom manteniendo fijo el punto de pantalla (sx, sy)"""
+        new_scale = max(Config.VIEW_MIN_SCALE, min(Config.VIEW_MAX_SCALE, self.scale * factor))
+        factor = new_scale / self.scale
+        self.offset_x = sx - (sx - self.offset_x) * factor
+        self.offset_y = sy - (sy - self.offset_y) * factor
+        self.scale = new_scale
+        self.version += 1
+
+    def to_screen(self, x, y):
+        return x * self.scale + self.offset_x, y * self.scale + self.offset_y
+
+    def to_world(self, sx, sy):
+        return (sx - self.offset_x) / self.scale, (sy - self.offset_y) / self.scale
+
+    def visible_world(self, margin=0):
+        """Rectángulo del mundo visible (x1, y1, x2, y2) con un margen en mundo"""
+        x1, y1 = self.to_world(0, 0)
+        x2, y2 = self.to_world(self.width, self.height)
+        return x1 - margin, y1 - margin, x2 + margin, y2 + margin
+
+    def level_of_detail(self):
+        """'full', 'dots' o 'heatmap' según el zoom"""
+        if self.scale < Config.LOD_HEATMAP_SCALE:
+            return "heatmap"
+        if self.scale < Config.LOD_DOTS_SCALE:
+            return "dots"
+        return "full"
@@ -1,9 +1,12 @@
 # main.py
+import logging
 import tkinter as tk
 from gui.main_window import MainWindow
 from config import Config
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Crear la ventana principal
     root = tk.Tk()
     
@@ -0,0 +1,308 @@
+# metrics.py - SERIES DE TIEMPO DE KPIs DE LA SIMULACIÓN
+"""
+Muestrea los KPIs de la simulación cada `interval` segundos simulados y
+los exporta sin hacer E/S en el hilo del tick:
+
+    exporter = MetricsExporter(path="kpis.jsonl", port=9108)
+    exporter.attach(simulation)      # TrafficSimulation.update llama a observe()
+    ...
+    exporter.close()                 # vacía lo pendiente
+
+Muestrear solo guarda la instantánea inmutable (snapshot.py) en un anillo
+preasignado. Un hilo escritor drena el anillo por lotes, calcula los KPIs
+(percentiles de espera, colas por intersección) y los escribe en JSONL o
+CSV. Si se da `port`, un servidor HTTP local publica la última muestra en
+formato de texto Prometheus en /metrics.
+
+Sin interfaz:
+    python metrics.py --vehicles 200 --seconds 3600 --out kpis.csv --port 9108
+"""
+import argparse
+import csv
+import json
+import logging
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import Config
+
+log = logging.getLogger(__name__)
+
+PHASES = {("green", "red"): "ns_green", ("yellow", "red"): "ns_yellow",
+          ("red", "green"): "ew_green", ("red", "yellow"): "ew_yellow"}
+
+
+def percentile(sorted_values, q):
+    """Percentil por rango más cercano de una lista ya ordenada"""
+    if not sorted_values:
+        return 0.0
+    k = max(0, math.ceil(q * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+def kpi_row(snapshot):
+    """KPIs de una instantánea: una fila plana (escalares + columnas por semáforo)"""
+    waits = sorted(snapshot.wait_times)
+    n = len(waits)
+    row = {
+        "time": round(snapshot.time, 3),
+        "tick": snapshot.tick,
+        "run": snapshot.run,
+        "vehicles": n,
+        "spawned": snapshot.total_spawned,
+        "completed": snapshot.total_completed,
+        "waiting": sum(snapshot.waiting),
+        "avg_wait": round(sum(waits) / n, 3) if n else 0.0,
+        "p50_wait": round(percentile(waits, 0.50), 3),
+        "p90_wait": round(percentile(waits, 0.90), 3),
+        "p99_wait": round(percentile(waits, 0.99), 3),
+    }
+
+    xs, ys, waiting = snapshot.xs, snapshot.ys, snapshot.waiting
+    for light_id, x, y, ns_state, ew_state in snapshot.lights:
+        queue = 0
+        for k in range(n):
+            if waiting[k] and math.hypot(xs[k] - x, ys[k] - y) < Config.VEHICLE_DETECTION_RADIUS:
+                queue += 1
+        row[f"queue_{light_id}"] = queue
+        row[f"phase_{light_id}"] = PHASES.get((ns_state, ew_state), f"{ns_state}/{ew_state}")
+    return row
+
+
+# ==================== ANILLO DE MUESTRAS ====================
+
+class SampleRing:
+    """
+    Anillo preasignado de capacidad fija. `push` es O(1) y nunca bloquea
+    más que el tiempo de copiar una referencia; si el escritor se atrasa,
+    se descartan las muestras más viejas (ver `dropped`).
+    """
+
+    def __init__(self, capacity=Config.METRICS_BUFFER):
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._head = 0  # Muestras escritas desde el inicio
+        self._tail = 0  # Muestras leídas desde el inicio
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def push(self, item):
+        with self._lock:
+            self._slots[self._head % self.capacity] = item
+            self._head += 1
+            if self._head - self._tail > self.capacity:
+                self._tail += 1
+                self.dropped += 1
+
+    def drain(self):
+        """Muestras pendientes, de la más vieja a la más nueva"""
+        with self._lock:
+            items = [self._slots[k % self.capacity] for k in range(self._tail, self._head)]
+            for k in range(self._tail, self._head):
+                self._slots[k % self.capacity] = None  # No retener instantáneas viejas
+            self._tail = self._head
+        return items
+
+    def __len__(self):
+        return self._head - self._tail
+
+
+# ==================== DESTINOS ====================
+
+class MetricsFile:
+    """JSONL (una fila por línea) o CSV, según la extensión; escribe por lotes"""
+
+    def __init__(self, path):
+        self.path = path
+        self.columnar = path.endswith(".csv")
+        self._file = open(path, "a", newline="")
+        self._writer = None
+
+    def write(self, rows):
+        if not rows:
+            return
+        if self.columnar:
+            if self._writer is None:
+                # Columnas fijas: las de la primera fila (escalares + semáforos)
+                self._writer = csv.DictWriter(self._file, fieldnames=list(rows[0]),
+                                              extrasaction="ignore")
+                if self._file.tell() == 0:
+                    self._writer.writeheader()
+            self._writer.writerows(rows)
+        else:
+            self._file.write("".join(json.dumps(row) + "\n" for row in rows))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def prometheus_text(row, dropped=0):
+    """Última muestra en el formato de texto de Prometheus (versión 0.0.4)"""
+    if row is None:
+        return "# Sin muestras todavía\n"
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP traffic_{name} {help_text}")
+        lines.append(f"# TYPE traffic_{name} {kind}")
+        for labels, value in samples:
+            lines.append(f"traffic_{name}{labels} {value}")
+
+    metric("sim_time_seconds", "gauge", "Tiempo simulado", [("", row["time"])])
+    metric("vehicles", "gauge", "Vehículos en la red", [("", row["vehicles"])])
+    metric("waiting_vehicles", "gauge", "Vehículos detenidos", [("", row["waiting"])])
+    metric("spawned_total", "counter", "Vehículos generados", [("", row["spawned"])])
+    metric("completed_total", "counter", "Vehículos que salieron de la red", [("", row["completed"])])
+    metric("wait_seconds", "summary", "Espera acumulada de los vehículos en la red",
+           [('{quantile="0.5"}', row["p50_wait"]), ('{quantile="0.9"}', row["p90_wait"]),
+            ('{quantile="0.99"}', row["p99_wait"])])
+    metric("wait_seconds_mean", "gauge", "Espera media", [("", row["avg_wait"])])
+
+    light_ids = [key[len("queue_"):] for key in row if key.startswith("queue_")]
+    metric("queue_vehicles", "gauge", "Cola detectada por intersección",
+           [(f'{{intersection="{i}"}}', row[f"queue_{i}"]) for i in light_ids])
+    metric("phase", "gauge", "Fase activa por intersección (1 = activa)",
+           [(f'{{intersection="{i}",phase="{phase}"}}', int(row[f"phase_{i}"] == phase))
+            for i in light_ids for phase in PHASES.values()])
+    metric("metrics_dropped_total", "counter", "Muestras descartadas por anillo lleno",
+           [("", dropped)])
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    exporter = None  # Se fija en la subclase creada por MetricsExporter
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text(self.exporter.latest, self.exporter.ring.dropped).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug("📡 %s", format % args)
+
+
+# ==================== EXPORTADOR ====================
+
+class MetricsExporter:
+    def __init__(self, path=None, port=None, interval=Config.METRICS_INTERVAL,
+                 flush_every=Config.METRICS_FLUSH_SECONDS, capacity=Config.METRICS_BUFFER,
+                 host="127.0.0.1"):
+        self.interval = interval
+        self.flush_every = flush_every
+        self.ring = SampleRing(capacity)
+        self.latest = None      # Última fila calculada (la lee el servidor HTTP)
+        self.samples = 0
+        self._last_time = None
+        self._last_run = None
+        self._file = MetricsFile(path) if path else None
+        self._stop = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, name="metrics-writer",
+                                        daemon=True)
+        self._writer.start()
+
+        self.server = None
+        if port is not None:
+            handler = type("MetricsHandler", (_MetricsHandler,), {"exporter": self})
+            self.server = ThreadingHTTPServer((host, port), handler)
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, name="metrics-http",
+                             daemon=True).start()
+            log.info("📡 Métricas en http://%s:%d/metrics", host, self.server.server_port)
+
+    def attach(self, simulation):
+        simulation.metrics = self
+        self._last_time = None  # Simulación nueva (p. ej. tras Detener/Iniciar): su reloj arranca en 0
+        self._last_run = None
+
+    def observe(self, simulation):
+        """Llamado al final de cada tick; muestrea si pasó `interval` (O(1))"""
+        now = simulation.current_time
+        run = (id(simulation), simulation.run)
+        if (self._last_time is not None and run == self._last_run
+                and 0 <= now - self._last_time < self.interval):
+            return
+        self._last_time = now
+        self._last_run = run
+        self.ring.push(simulation.snapshot)
+        self.samples += 1
+
+    # ==================== HILO ESCRITOR ====================
+
+    def _write_loop(self):
+        while not self._stop.wait(self.flush_every):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        """Convierte las muestras pendientes en filas y las escribe en un lote"""
+        rows = [kpi_row(snapshot) for snapshot in self.ring.drain()]
+        if not rows:
+            return
+        self.latest = rows[-1]
+        if self._file is not None:
+            try:
+                self._file.write(rows)
+            except OSError as exc:
+                log.warning("⚠️ No se pudieron escribir las métricas: %s", exc)
+
+    def close(self):
+        self._stop.set()
+        self._writer.join()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        if self._file is not None:
+            self._file.close()
+        if self.ring.dropped:
+            log.warning("⚠️ %d muestras descartadas (anillo lleno)", self.ring.dropped)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulación sin interfaz con exportación de KPIs",
+                                     epilog="Ver el docstring de metrics.py")
+    parser.add_argument("--vehicles", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=600, help="Segundos simulados")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Archivo de muestras (.jsonl o .csv)")
+    parser.add_argument("--port", type=int, help="Servir /metrics en este puerto")
+    parser.add_argument("--interval", type=float, default=Config.METRICS_INTERVAL,
+                        help="Segundos simulados entre muestras")
+    parser.add_argument("--speed", type=float, default=0,
+                        help="Múltiplo del tiempo real (0 = lo más rápido posible)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    import random
+    from traffic_simulation import TrafficSimulation
+
+    simulation = TrafficSimulation(total_vehicles=args.vehicles, rng=random.Random(args.seed))
+    exporter = MetricsExporter(path=args.out, port=args.port, interval=args.interval)
+    exporter.attach(simulation)
+    simulation.start()
+
+    dt = Config.SIM_TIMESTEP
+    start = time.perf_counter()
+    try:
+        for tick in range(int(args.seconds / dt)):
+            simulation.update(dt)
+            if args.speed > 0:
+                delay = start + (tick + 1) * dt / args.speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        exporter.close()
+    log.info("✅ %d muestras en %.1fs", exporter.samples, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
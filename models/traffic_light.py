@@ -2,21 +2,37 @@
 from config import Config
 
 class TrafficLight:
+    STATE_COLORS = {"green": "#00ff00", "yellow": "#ffff00", "red": "#ff0000"}
+    # Fases del modo actuado: (estado NS, estado EO)
+    ACTUATED_PHASES = (("green", "red"), ("yellow", "red"), ("red", "green"), ("red", "yellow"))
+
     def __init__(self, intersection_id, x, y, green_time=30, offset=0, is_north_south=True):
         self.id = intersection_id
         self.x = x
         self.y = y
         self.green_time = green_time  # Tiempo que estará verde
-        self.yellow_time = 3  # Tiempo de amarillo
+        self.yellow_time = Config.LIGHT_YELLOW_TIME  # Tiempo de amarillo
         self.offset = offset  # Offset para sincronización
-        self.cycle_time = 60  # Ciclo completo
+        self.cycle_time = Config.GA_CYCLE_TIME  # Ciclo completo
         self.is_north_south = is_north_south  # True = controla Norte-Sur primero
+        
+        # Modo actuado (ver set_actuated): el plan fijo es la línea base
+        self.actuated = False
+        self.calls = [0, 0]       # Detecciones del tick actual por acceso (NS, EO)
+        self._phase = 0           # Índice en ACTUATED_PHASES
+        self._elapsed = 0.0       # Segundos en la fase actual
+        self._gap = 0.0           # Segundos sin detecciones en el acceso en verde
+        
+        self._target = None       # Plan pendiente (verde, offset), ver retime
 
     def get_states(self, current_time):
         """
         Devuelve el estado de AMBAS direcciones (NS y EW)
         REGLA: Si uno está verde, el otro DEBE estar rojo
         """
+        if self.actuated:
+            return self.ACTUATED_PHASES[self._phase]
+        
         effective_time = (current_time + self.offset) % self.cycle_time
         
         # Calcular tiempo de rojo (lo que queda del ciclo)
@@ -42,34 +58,128 @@ class TrafficLight:
         
         return ns_state, ew_state
 
+    # ==================== MODO ACTUADO ====================
+
+    def set_actuated(self, actuated, current_time=0.0):
+        """
+        Activa el control actuado partiendo del estado que tendría el plan
+        fijo en `current_time`, así el cambio de modo no produce saltos.
+        """
+        self.actuated = actuated
+        self.calls = [0, 0]
+        self._gap = 0.0
+        effective_time = (current_time + self.offset) % self.cycle_time
+        if effective_time < self.green_time:
+            self._phase, self._elapsed = 0, effective_time
+        elif effective_time < self.green_time + self.yellow_time:
+            self._phase, self._elapsed = 1, effective_time - self.green_time
+        else:
+            self._phase, self._elapsed = 2, effective_time - self.green_time - self.yellow_time
+
+    def detect(self, going_ns):
+        """Un vehículo en la zona de detección del acceso NS o EO (O(1))"""
+        self.calls[0 if going_ns else 1] += 1
+
+    def planned_green(self, approach):
+        """Verde del plan fijo (AG) para el acceso 0 = NS o 1 = EO"""
+        if approach == 0:
+            return self.green_time
+        return self.cycle_time - self.green_time - self.yellow_time
+
+    def advance(self, dt):
+        """
+        Un tick del controlador actuado, O(1): el verde dura al menos
+        ACTUATED_MIN_GREEN; después termina por brecha (ACTUATED_GAP sin
+        detecciones en su acceso) o al llegar al máximo (verde del plan ×
+        ACTUATED_MAX_FACTOR), y solo si el acceso contrario tiene demanda.
+        Consume las detecciones del tick anterior.
+        """
+        calls = self.calls
+        self._elapsed += dt
+        phase = self._phase
+        
+        if phase == 0 or phase == 2:
+            approach = phase // 2
+            self._gap = 0.0 if calls[approach] else self._gap + dt
+            if calls[1 - approach] and self._elapsed >= Config.ACTUATED_MIN_GREEN:
+                max_green = max(self.planned_green(approach) * Config.ACTUATED_MAX_FACTOR,
+                                Config.ACTUATED_MIN_GREEN)
+                if self._gap >= Config.ACTUATED_GAP or self._elapsed >= max_green:
+                    self._phase, self._elapsed = phase + 1, 0.0
+        elif self._elapsed >= self.yellow_time:
+            # Fin del amarillo: verde para el otro acceso
+            self._phase, self._elapsed, self._gap = (phase + 1) % 4, 0.0, 0.0
+        
+        calls[0] = calls[1] = 0
+
+    # ==================== TRANSICIÓN DE PLAN ====================
+
+    def retime(self, green_time, offset):
+        """Programa un plan nuevo sin cortar el ciclo en curso (ver advance_transition)"""
+        self._target = (green_time, offset % self.cycle_time)
+
+    def cancel_retime(self):
+        self._target = None
+
+    @property
+    def retiming(self):
+        return self._target is not None
+
+    @property
+    def planned(self):
+        """(verde, offset) vigente o, durante una transición, el de destino"""
+        return self._target or (self.green_time, self.offset)
+
+    def advance_transition(self, previous_time, current_time):
+        """
+        Al cruzar el inicio de un ciclo aplica el verde nuevo y mueve el
+        offset hacia el objetivo por el camino más corto, a lo sumo
+        ROLLING_OFFSET_STEP segundos por ciclo: ese ciclo se acorta o se
+        alarga un poco en vez de saltar a una fase arbitraria.
+        """
+        cycle = self.cycle_time
+        if (current_time + self.offset) % cycle >= (previous_time + self.offset) % cycle:
+            return  # Todavía dentro del mismo ciclo
+        green_time, offset = self._target
+        self.green_time = green_time
+        delta = (offset - self.offset) % cycle
+        if delta > cycle // 2:
+            delta -= cycle
+        step = max(-Config.ROLLING_OFFSET_STEP, min(Config.ROLLING_OFFSET_STEP, delta))
+        self.offset = (self.offset + step) % cycle
+        if self.offset == offset:
+            self._target = None
+
     def update_state(self, current_time):
         """Devuelve el estado para compatibilidad (ya no se usa mucho)"""
         ns_state, ew_state = self.get_states(current_time)
         return ns_state if self.is_north_south else ew_state
 
+    def get_colors(self, current_time):
+        """Colores (Norte-Sur, Este-Oeste) para dibujar"""
+        ns_state, ew_state = self.get_states(current_time)
+        return self.STATE_COLORS[ns_state], self.STATE_COLORS[ew_state]
+
+    def get_lamp_positions(self):
+        """Centros de las lámparas N, S, E, O"""
+        return self.lamp_positions(self.x, self.y)
+
+    @staticmethod
+    def lamp_positions(x, y, offset=38):
+        return {
+            "N": (x, y - offset),
+            "S": (x, y + offset),
+            "E": (x + offset, y),
+            "O": (x - offset, y),
+        }
+
     def draw(self, canvas, current_time):
         """Dibuja el semáforo con AMBAS direcciones"""
-        ns_state, ew_state = self.get_states(current_time)
+        ns_color, ew_color = self.get_colors(current_time)
         
         size = 14
         offset = 38
 
-        # NORTE-SUR (vertical)
-        if ns_state == "green":
-            ns_color = "#00ff00"
-        elif ns_state == "yellow":
-            ns_color = "#ffff00"
-        else:
-            ns_color = "#ff0000"
-
-        # ESTE-OESTE (horizontal)
-        if ew_state == "green":
-            ew_color = "#00ff00"
-        elif ew_state == "yellow":
-            ew_color = "#ffff00"
-        else:
-            ew_color = "#ff0000"
-
         # Dibujar semáforos verticales (Norte y Sur)
         # Norte
         canvas.create_oval(
@@ -77,10 +187,6 @@ class TrafficLight:
             self.x + size, self.y - offset + size,
             fill=ns_color, outline="white", width=2
         )
-        canvas.create_text(
-            self.x, self.y - offset - 22,
-            text="N", fill="white", font=("Arial", 9, "bold")
-        )
 
         # Sur
         canvas.create_oval(
@@ -88,10 +194,6 @@ class TrafficLight:
             self.x + size, self.y + offset + size,
             fill=ns_color, outline="white", width=2
         )
-        canvas.create_text(
-            self.x, self.y + offset + 22,
-            text="S", fill="white", font=("Arial", 9, "bold")
-        )
 
         # Dibujar semáforos horizontales (Este y Oeste)
         # Este
@@ -100,10 +202,6 @@ class TrafficLight:
             self.x + offset + size, self.y + size,
             fill=ew_color, outline="white", width=2
         )
-        canvas.create_text(
-            self.x + offset + 22, self.y,
-            text="E", fill="white", font=("Arial", 9, "bold")
-        )
 
         # Oeste
         canvas.create_oval(
@@ -111,15 +209,25 @@ class TrafficLight:
             self.x - offset + size, self.y + size,
             fill=ew_color, outline="white", width=2
         )
-        canvas.create_text(
-            self.x - offset - 22, self.y,
-            text="O", fill="white", font=("Arial", 9, "bold")
-        )
+
+        # Letras y etiqueta del semáforo
+        self.draw_labels(canvas)
+
+    def draw_labels(self, canvas, tags=()):
+        """Letras N/S/E/O y etiqueta S{id}: parte estática del semáforo"""
+        offset = 38
+        for text, x, y in (("N", self.x, self.y - offset - 22),
+                           ("S", self.x, self.y + offset + 22),
+                           ("E", self.x + offset + 22, self.y),
+                           ("O", self.x - offset - 22, self.y)):
+            canvas.create_text(x, y, text=text, fill="white",
+                               font=("Arial", 9, "bold"), tags=tags)
 
         # Etiqueta del semáforo
         canvas.create_text(
             self.x, self.y - 65,
             text=f"S{self.id}",
             fill="#f1c40f",
-            font=("Arial", 16, "bold")
-        )
\ No newline at end of file
+            font=("Arial", 16, "bold"),
+            tags=tags
+        )
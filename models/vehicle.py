@@ -1,5 +1,4 @@
 # models/vehicle.py - VERSIÓN CORREGIDA
-import random
 import math
 from config import Config
 
@@ -16,7 +15,7 @@ class Vehicle:
         self.target_x, self.target_y = self._get_target_position()
         
         # Velocidad
-        self.base_speed = random.uniform(Config.VEHICLE_SPEED_MIN, Config.VEHICLE_SPEED_MAX)
+        self.base_speed = simulation.rng.uniform(Config.VEHICLE_SPEED_MIN, Config.VEHICLE_SPEED_MAX)
         self.speed = self.base_speed
         
         # Estado
@@ -30,10 +29,11 @@ class Vehicle:
 
     def _get_spawn_position(self):
         x1, y1, x2, y2, direction = Config.LANES[self.lane_start]
+        rng = self.simulation.rng
         if direction == "horizontal":
-            return (random.choice([x1 - 40, x2 + 40]), y1 + random.uniform(-8, 8))
+            return (rng.choice([x1 - 40, x2 + 40]), y1 + rng.uniform(-8, 8))
         else:
-            return (x1 + random.uniform(-8, 8), random.choice([y1 - 40, y2 + 40]))
+            return (x1 + rng.uniform(-8, 8), rng.choice([y1 - 40, y2 + 40]))
 
     def _get_target_position(self):
         x1, y1, x2, y2, direction = Config.LANES[self.lane_end]
@@ -62,7 +62,7 @@ class Vehicle:
         for light in self.simulation.traffic_lights:
             dist = math.hypot(light.x - self.x, light.y - self.y)
             
-            if dist < 80:  # Solo si está cerca
+            if dist < Config.VEHICLE_DETECTION_RADIUS:  # Solo si está cerca
                 # Proyección: solo si la intersección está adelante
                 to_light_x = light.x - self.x
                 to_light_y = light.y - self.y
@@ -75,16 +75,23 @@ class Vehicle:
         return nearest
 
     def update(self, dt):
-        if self.completed:
+        if self.has_arrived():
             return
+        # Buscar semáforo adelante
+        self.step(dt, self.get_nearest_light())
 
-        # ¿Llegó al final?
-        if math.hypot(self.target_x - self.x, self.target_y - self.y) < 15:
+    def has_arrived(self):
+        """True si ya terminó o acaba de llegar a su destino"""
+        if self.completed:
+            return True
+        distance = math.hypot(self.target_x - self.x, self.target_y - self.y)
+        if distance < Config.VEHICLE_ARRIVAL_DISTANCE:
             self.completed = True
-            return
+            return True
+        return False
 
-        # Buscar semáforo adelante
-        light = self.get_nearest_light()
+    def step(self, dt, light):
+        """Frena ante `light` (el semáforo de adelante, o None) o avanza"""
         must_stop = False
 
         if light:
@@ -93,6 +100,8 @@ class Vehicle:
             
             going_ns = self.is_going_north_south()
             distance_to_light = math.hypot(self.x - light.x, self.y - light.y)
+            if light.actuated:
+                light.detect(going_ns)
 
             # Lógica CORRECTA:
             # - Si va N-S → verifica el estado NS
@@ -107,7 +116,7 @@ class Vehicle:
                     must_stop = True
 
             # Detenerse si está cerca de la intersección
-            if must_stop and distance_to_light < 35:
+            if must_stop and distance_to_light < Config.VEHICLE_STOP_DISTANCE:
                 self.waiting = True
                 self.speed = 0
                 self.wait_time += dt
@@ -120,30 +129,25 @@ class Vehicle:
         self.y += self.direction[1] * self.speed
         self.total_travel_time += dt
 
+    def get_color(self):
+        return Config.VEHICLE_COLOR_WAITING if self.waiting else Config.VEHICLE_COLOR_MOVING
+
+    def get_shape(self):
+        """Rectángulos (carrocería, ventanas) según la dirección"""
+        return self.shape_at(self.x, self.y, abs(self.direction[0]) > abs(self.direction[1]))
+
+    @staticmethod
+    def shape_at(x, y, horizontal):
+        """Forma de un vehículo en (x, y); también se usa con instantáneas"""
+        if horizontal:
+            return ((x - 15, y - 8, x + 15, y + 8),
+                    (x - 8, y - 6, x + 8, y + 6))
+        # Vertical
+        return ((x - 8, y - 15, x + 8, y + 15),
+                (x - 6, y - 8, x + 6, y + 8))
+
     def draw(self, canvas):
-        color = Config.VEHICLE_COLOR_WAITING if self.waiting else Config.VEHICLE_COLOR_MOVING
-        
-        # Dibujar carro según dirección
-        if abs(self.direction[0]) > abs(self.direction[1]):  # Horizontal
-            canvas.create_rectangle(
-                self.x - 15, self.y - 8,
-                self.x + 15, self.y + 8,
-                fill=color, outline="white", width=2
-            )
-            # Ventanas
-            canvas.create_rectangle(
-                self.x - 8, self.y - 6,
-                self.x + 8, self.y + 6,
-                fill="#2c3e50"
-            )
-        else:  # Vertical
-            canvas.create_rectangle(
-                self.x - 8, self.y - 15,
-                self.x + 8, self.y + 15,
-                fill=color, outline="white", width=2
-            )
-            canvas.create_rectangle(
-                self.x - 6, self.y - 8,
-                self.x + 6, self.y + 8,
-                fill="#2c3e50"
-            )
\ No newline at end of file
+        body, windows = self.get_shape()
+        canvas.create_rectangle(*body, fill=self.get_color(), outline="white", width=2)
+        # Ventanas
+        canvas.create_rectangle(*windows, fill="#2c3e50")
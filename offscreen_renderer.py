@@ -0,0 +1,338 @@
+# offscreen_renderer.py - DIBUJO SIN PANTALLA A BUFFERS NUMPY Y EXPORTACIÓN DE VIDEO
+import argparse
+import os
+import queue
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from config import Config
+from traffic_simulation import TrafficSimulation
+
+STATE_INDEX = {"green": 0, "yellow": 1, "red": 2}
+
+
+def hex_to_rgb(color):
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def scene_arrays(snapshot):
+    """
+    Estado dibujable de una instantánea (ver snapshot.py) como arreglos:
+    (xs, ys, horizontal, waiting, lights) con lights = [(x, y, ns, ew), ...]
+    """
+    xs = np.frombuffer(snapshot.xs, dtype=np.float64)
+    ys = np.frombuffer(snapshot.ys, dtype=np.float64)
+    horizontal = np.frombuffer(snapshot.horizontal, dtype=np.int8).astype(bool)
+    waiting = np.frombuffer(snapshot.waiting, dtype=np.int8).astype(bool)
+    lights = [(x, y, STATE_INDEX[ns], STATE_INDEX[ew]) for _, x, y, ns, ew in snapshot.lights]
+    return xs, ys, horizontal, waiting, lights
+
+
+def _rect_offsets(half_w, half_h):
+    """Desplazamientos (dy, dx) de todos los píxeles de un rectángulo centrado"""
+    dy, dx = np.mgrid[-half_h:half_h + 1, -half_w:half_w + 1]
+    return dy.ravel(), dx.ravel()
+
+
+def _disc_offsets(radius):
+    dy, dx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+    inside = dx * dx + dy * dy <= radius * radius
+    return dy[inside], dx[inside]
+
+
+class OffscreenRenderer:
+    """
+    Rasteriza la escena en un arreglo (alto, ancho, 3) uint8 sin Tk.
+    El fondo (carreteras) se dibuja una vez; por fotograma se copia y se
+    estampan todos los vehículos y lámparas con indexación vectorizada:
+    cada forma es una plantilla de desplazamientos que se suma a los centros.
+    Las etiquetas de texto del canvas no se dibujan.
+    """
+
+    def __init__(self, scale=1.0, width=Config.CANVAS_WIDTH, height=Config.CANVAS_HEIGHT):
+        self.scale = scale
+        self.width = max(1, int(round(width * scale)))
+        self.height = max(1, int(round(height * scale)))
+        self.background = self._draw_background(width, height)
+
+        s = lambda value: max(0, int(round(value * scale)))
+        # Vehículo horizontal (30×16) y vertical (16×30) como en Vehicle.get_shape
+        self._vehicle_templates = {
+            True: (_rect_offsets(s(15), s(8)), _rect_offsets(max(0, s(15) - s(2)), max(0, s(8) - s(2))),
+                   _rect_offsets(s(8), s(6))),
+            False: (_rect_offsets(s(8), s(15)), _rect_offsets(max(0, s(8) - s(2)), max(0, s(15) - s(2))),
+                    _rect_offsets(s(6), s(8))),
+        }
+        self._lamp_outline = _disc_offsets(s(14))
+        self._lamp_fill = _disc_offsets(max(0, s(14) - s(2)))
+        self._lamp_offset = 38 * scale
+
+        self._white = np.array(hex_to_rgb("#ffffff"), dtype=np.uint8)
+        self._window = np.array(hex_to_rgb(Config.COLOR_DARK), dtype=np.uint8)
+        self._vehicle_colors = np.array([hex_to_rgb(Config.VEHICLE_COLOR_MOVING),
+                                         hex_to_rgb(Config.VEHICLE_COLOR_WAITING)], dtype=np.uint8)
+        self._state_colors = np.array([hex_to_rgb(c) for c in ("#00ff00", "#ffff00", "#ff0000")],
+                                      dtype=np.uint8)
+
+    def _draw_background(self, width, height):
+        """Capa estática equivalente a TrafficSimulation._draw_roads"""
+        img = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        img[:] = hex_to_rgb(Config.BACKGROUND_COLOR)
+        road = hex_to_rgb(Config.ROAD_COLOR)
+        line = hex_to_rgb(Config.ROAD_LINE_COLOR)
+        px = lambda value: int(round(value * self.scale))
+        half_line = max(1, px(2))
+
+        rows = sorted({lane[1] for lane in Config.LANES if lane[4] == "horizontal"})
+        cols = sorted({lane[0] for lane in Config.LANES if lane[4] == "vertical"})
+        for y in rows:
+            img[max(0, px(y - 35)):px(y + 35), :] = road
+        for x in cols:
+            img[:, max(0, px(x - 35)):px(x + 35)] = road
+        for y in rows:
+            for i in range(0, width, 40):
+                img[max(0, px(y) - half_line):px(y) + half_line, px(i):px(i + 20)] = line
+        for x in cols:
+            for i in range(0, height, 40):
+                img[px(i):px(i + 20), max(0, px(x) - half_line):px(x) + half_line] = line
+        return img
+
+    def _stamp(self, flat, cx, cy, offsets, colors):
+        """Pinta la plantilla `offsets` en cada centro (cx, cy) con su color"""
+        if len(cx) == 0:
+            return
+        dy, dx = offsets
+        px = cx[:, None] + dx[None, :]
+        py = cy[:, None] + dy[None, :]
+        inside = (px >= 0) & (px < self.width) & (py >= 0) & (py < self.height)
+        index = (py * self.width + px)[inside]
+        if colors.ndim == 1:
+            flat[index] = colors
+        else:
+            flat[index] = np.broadcast_to(colors[:, None, :], px.shape + (3,))[inside]
+
+    def render_arrays(self, xs, ys, horizontal, waiting, lights):
+        """Un fotograma desde arreglos (ver scene_arrays); retorna un arreglo nuevo"""
+        img = self.background.copy()
+        flat = img.reshape(-1, 3)
+
+        cx = np.rint(np.asarray(xs) * self.scale).astype(np.intp)
+        cy = np.rint(np.asarray(ys) * self.scale).astype(np.intp)
+        horizontal = np.asarray(horizontal, dtype=bool)
+        colors = self._vehicle_colors[np.asarray(waiting, dtype=np.intp)]
+        for orientation in (True, False):
+            mask = horizontal == orientation
+            if not mask.any():
+                continue
+            outline, body, windows = self._vehicle_templates[orientation]
+            self._stamp(flat, cx[mask], cy[mask], outline, self._white)
+            self._stamp(flat, cx[mask], cy[mask], body, colors[mask])
+            self._stamp(flat, cx[mask], cy[mask], windows, self._window)
+
+        if lights:
+            lx, ly, ns, ew = (np.asarray(column) for column in zip(*lights))
+            d = self._lamp_offset
+            # Lámparas N, S (estado NS) y E, O (estado EW)
+            lamp_x = np.concatenate([lx, lx, lx + d, lx - d]) * self.scale
+            lamp_y = np.concatenate([ly - d, ly + d, ly, ly]) * self.scale
+            lamp_state = np.concatenate([ns, ns, ew, ew])
+            lamp_x = np.rint(lamp_x).astype(np.intp)
+            lamp_y = np.rint(lamp_y).astype(np.intp)
+            self._stamp(flat, lamp_x, lamp_y, self._lamp_outline, self._white)
+            self._stamp(flat, lamp_x, lamp_y, self._lamp_fill, self._state_colors[lamp_state])
+        return img
+
+    def render(self, snapshot):
+        """Un fotograma desde una instantánea (simulation.snapshot)"""
+        return self.render_arrays(*scene_arrays(snapshot))
+
+
+# ==================== SALIDAS ====================
+
+def encode_png(img):
+    """PNG RGB sin dependencias (zlib nivel 1: prioriza velocidad)"""
+    height, width, _ = img.shape
+    raw = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 0] = 0  # Filtro "None" por fila
+    raw[:, 1:] = img.reshape(height, width * 3)
+
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data +
+                struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) +
+            chunk(b"IDAT", zlib.compress(raw.tobytes(), 1)) + chunk(b"IEND", b""))
+
+
+def encode_ppm(img):
+    height, width, _ = img.shape
+    return f"P6 {width} {height} 255\n".encode() + img.tobytes()
+
+
+class ImageSequenceSink:
+    """Un archivo por fotograma: frame_000000.png, frame_000001.png, ..."""
+    ENCODERS = {"png": encode_png, "ppm": encode_ppm}
+
+    def __init__(self, directory, fmt=Config.VIDEO_FORMAT):
+        if fmt not in self.ENCODERS:
+            raise ValueError(f"Formato no soportado: {fmt}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fmt = fmt
+        self.encode = self.ENCODERS[fmt]
+
+    def write(self, index, img):
+        path = os.path.join(self.directory, f"frame_{index:06d}.{self.fmt}")
+        with open(path, "wb") as f:
+            f.write(self.encode(img))
+
+    def close(self):
+        pass
+
+
+class RawVideoSink:
+    """
+    Fotogramas RGB24 crudos concatenados hacia un flujo binario
+    (archivo, sys.stdout.buffer o la entrada de ffmpeg).
+    """
+
+    def __init__(self, stream, process=None):
+        self.stream = stream
+        self.process = process
+
+    @classmethod
+    def ffmpeg(cls, path, width, height, fps=Config.VIDEO_FPS):
+        """Codifica con ffmpeg leyendo rawvideo por su entrada estándar"""
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("ffmpeg no está instalado")
+        command = ["ffmpeg", "-loglevel", "error", "-y",
+                   "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}",
+                   "-r", str(fps), "-i", "-", "-pix_fmt", "yuv420p", path]
+        process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        return cls(process.stdin, process)
+
+    def write(self, index, img):
+        self.stream.write(memoryview(np.ascontiguousarray(img)).cast("B"))
+
+    def close(self):
+        self.stream.flush()
+        if self.process is not None:
+            self.stream.close()
+            self.process.wait()
+
+
+class FrameWriter:
+    """
+    Hilo en segundo plano que codifica y escribe fotogramas.
+    La cola es acotada: si el disco no da abasto, `submit` bloquea al
+    productor en vez de acumular fotogramas en memoria.
+    """
+
+    def __init__(self, sink, max_queue=Config.VIDEO_QUEUE_SIZE):
+        self.sink = sink
+        self.frames_written = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, img):
+        """`img` no debe modificarse después de enviarse"""
+        if self.error is not None:
+            raise self.error
+        self._queue.put(img)
+
+    def _run(self):
+        while True:
+            img = self._queue.get()
+            if img is None:
+                break
+            if self.error is not None:
+                continue  # Vaciar la cola sin escribir
+            try:
+                self.sink.write(self.frames_written, img)
+                self.frames_written += 1
+            except (OSError, ValueError) as exc:
+                self.error = exc
+
+    def close(self):
+        """Espera a que se escriban los fotogramas pendientes"""
+        self._queue.put(None)
+        self._thread.join()
+        self.sink.close()
+        if self.error is not None:
+            raise self.error
+
+
+def export_video(sink, total_vehicles=50, seconds=60.0, fps=Config.VIDEO_FPS,
+                 scale=Config.VIDEO_SCALE, seed=None, solution=None):
+    """
+    Corre una simulación sin interfaz y envía un fotograma cada 1/fps
+    segundos simulados. Retorna (fotogramas, segundos reales).
+    """
+    simulation = TrafficSimulation(total_vehicles=total_vehicles,
+                                   rng=random.Random(seed))
+    if solution:
+        simulation.apply_optimization(solution)
+    simulation.start()
+
+    renderer = OffscreenRenderer(scale)
+    writer = FrameWriter(sink)
+    dt = Config.SIM_TIMESTEP
+    frame_interval = 1.0 / fps
+    frames = int(seconds * fps)
+
+    start = time.perf_counter()
+    accumulator = 0.0  # Paso fijo como FrameScheduler: el video sigue al tiempo simulado
+    try:
+        for _ in range(frames):
+            accumulator += frame_interval
+            while accumulator >= dt - 1e-9:
+                simulation.update(dt)
+                accumulator -= dt
+            writer.submit(renderer.render(simulation.snapshot))
+    finally:
+        writer.close()
+    return frames, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta una simulación a video sin pantalla")
+    parser.add_argument("output", help="Directorio de imágenes, archivo de video (.mp4, .mkv...) "
+                                       "o '-' para video crudo RGB24 por stdout")
+    parser.add_argument("--vehicles", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=60.0, help="Segundos simulados")
+    parser.add_argument("--fps", type=int, default=Config.VIDEO_FPS)
+    parser.add_argument("--scale", type=float, default=Config.VIDEO_SCALE)
+    parser.add_argument("--format", choices=sorted(ImageSequenceSink.ENCODERS),
+                        default=Config.VIDEO_FORMAT, help="Formato de la secuencia de imágenes")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    width = int(round(Config.CANVAS_WIDTH * args.scale))
+    height = int(round(Config.CANVAS_HEIGHT * args.scale))
+    if args.output == "-":
+        sink = RawVideoSink(sys.stdout.buffer)
+    elif os.path.splitext(args.output)[1]:
+        sink = RawVideoSink.ffmpeg(args.output, width, height, args.fps)
+    else:
+        sink = ImageSequenceSink(args.output, args.format)
+
+    frames, elapsed = export_video(sink, args.vehicles, args.seconds, args.fps,
+                                   args.scale, args.seed)
+    print(f"🎬 {frames} fotogramas {width}x{height} en {elapsed:.1f}s "
+          f"({frames / max(elapsed, 1e-9):.0f} fps)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
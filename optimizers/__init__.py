@@ -0,0 +1,4 @@
+# optimizers/__init__.py
+"""
+Módulo de optimizadores de planes semafóricos
+"""
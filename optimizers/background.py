@@ -0,0 +1,148 @@
+# optimizers/background.py - OPTIMIZACIÓN EN UN PROCESO APARTE
+import multiprocessing
+import queue
+from config import Config
+
+
+class OptimizationCancelled(Exception):
+    pass
+
+
+def _run_job(messages, cancel, resume, optimizer_name, traffic_data, max_evaluations,
+             current_greens, num_intersections, seed_plans=None, time_budget=None,
+             fitness="snapshot"):
+    """
+    Cuerpo del proceso hijo: no toca Tk ni la simulación, solo recibe una
+    copia de `traffic_data` y se comunica por la cola `messages`.
+    """
+    # Importes aquí: el proceso se crea con "spawn" y arranca limpio
+    import logging
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    from corridor_optimizer import CorridorOptimizer
+    from optimizers.base import GenomeSpec
+    from optimizers.registry import create_evaluator, create_optimizer
+
+    try:
+        seeds = list(seed_plans or [])
+        if current_greens is not None:
+            corridor = CorridorOptimizer(num_intersections=num_intersections)
+            seeds.append(corridor.optimize(traffic_data, green_times=current_greens)['best_solution'])
+
+        fitness_fn, evaluator = create_evaluator(fitness, traffic_data, num_intersections)
+        optimizer = create_optimizer(optimizer_name, GenomeSpec(num_intersections=num_intersections),
+                                     fitness_fn, evaluator=evaluator,
+                                     max_evaluations=max_evaluations, time_budget=time_budget)
+
+        def progress(iteration, total, best_fitness):
+            messages.put(("progress", iteration, total, best_fitness, optimizer.history[-1],
+                          optimizer.avg_history[-1], optimizer.min_history[-1]))
+            # Pausa entre iteraciones; la cancelación también despierta la espera
+            while not resume.is_set() and not cancel.is_set():
+                resume.wait(0.1)
+            if cancel.is_set():
+                raise OptimizationCancelled()
+
+        result = optimizer.optimize(callback=progress, seed_individuals=seeds)
+        messages.put(("done", result))
+    except OptimizationCancelled:
+        messages.put(("cancelled", None))
+    except Exception as exc:
+        messages.put(("error", f"{type(exc).__name__}: {exc}"))
+
+
+class BackgroundOptimization:
+    """
+    Ejecuta un optimizador en otro proceso (sin competir por el GIL con la
+    animación). El hilo de Tk llama a `poll()` periódicamente; los mensajes
+    son tuplas ("progress", iter, total, mejor, mejor_iter, promedio, peor),
+    ("done", resultado), ("cancelled", None) o ("error", texto).
+
+    También guarda el historial recibido, así que sirve donde se espera un
+    optimizador para graficar (history, get_history_data, show_graph).
+    
+    `seed_plans` entran en la población inicial (arranque en caliente) y
+    `time_budget` limita los segundos de optimización. `fitness` elige la
+    función a minimizar (ver registry.create_evaluator): "snapshot" o "sim".
+    """
+
+    def __init__(self, optimizer_name, traffic_data, max_evaluations,
+                 current_greens=None, num_intersections=6, seed_plans=None, time_budget=None,
+                 fitness=Config.OPTIMIZATION_FITNESS):
+        from optimizers.registry import OPTIMIZERS
+        self.label = OPTIMIZERS[optimizer_name].label
+        self.history = []
+        self.avg_history = []
+        self.min_history = []
+        self.result = None
+        self.finished = False
+
+        context = multiprocessing.get_context("spawn")  # fork + Tk no es seguro
+        self._messages = context.Queue()
+        self._cancel = context.Event()
+        self._resume = context.Event()
+        self._resume.set()
+        self._process = context.Process(
+            target=_run_job, daemon=True,
+            args=(self._messages, self._cancel, self._resume, optimizer_name, traffic_data,
+                  max_evaluations, current_greens, num_intersections, seed_plans, time_budget,
+                  fitness))
+        self._process.start()
+
+    @property
+    def paused(self):
+        return not self._resume.is_set()
+
+    def pause(self):
+        self._resume.clear()
+
+    def resume(self):
+        self._resume.set()
+
+    def cancel(self):
+        self._cancel.set()
+        self._resume.set()
+
+    def poll(self, max_messages=Config.OPTIMIZATION_POLL_BATCH):
+        """Mensajes pendientes, sin bloquear"""
+        received = []
+        while len(received) < max_messages:
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            kind = message[0]
+            if kind == "progress":
+                self.history.append(message[4])
+                self.avg_history.append(message[5])
+                self.min_history.append(message[6])
+            else:
+                self.finished = True
+                self.result = message[1] if kind == "done" else None
+            received.append(message)
+
+        if self.finished:
+            # Sin bloquear el hilo de Tk: recoge al hijo si ya salió. Si todavía está
+            # vaciando la cola, lo recoge un poll posterior o el próximo start()
+            # (multiprocessing limpia los hijos terminados al lanzar otro)
+            self._process.join(timeout=0)
+
+        if not received and not self.finished and not self._process.is_alive():
+            # El hijo murió sin avisar (p. ej. lo mató el sistema)
+            self.finished = True
+            received.append(("error", f"El proceso terminó con código {self._process.exitcode}"))
+        return received
+
+    def terminate(self):
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join(timeout=1.0)
+
+    def get_history_data(self):
+        if not self.history:
+            return [], [], [], []
+        return list(range(1, len(self.history) + 1)), self.history, self.avg_history, self.min_history
+
+    def show_graph(self):
+        from gui.plots import plot_fitness_history
+        plot_fitness_history(self.history, self.avg_history, self.min_history,
+                             title=f"EVOLUCIÓN DEL FITNESS - {self.label.upper()}")
@@ -0,0 +1,172 @@
+# optimizers/base.py - INTERFAZ COMÚN DE OPTIMIZADORES
+import random
+import time
+from config import Config
+from optimizers.evaluation import BatchEvaluator
+
+
+class GenomeSpec:
+    """
+    Describe el genoma de un plan: por intersección [green_time, offset].
+    Los optimizadores continuos trabajan con un vector plano
+    [g0, o0, g1, o1, ...] que se decodifica a un plan entero válido.
+    """
+
+    def __init__(self, num_intersections=6,
+                 min_green=Config.GA_MIN_GREEN_TIME,
+                 max_green=Config.GA_MAX_GREEN_TIME,
+                 cycle_time=Config.GA_CYCLE_TIME):
+        self.num_intersections = num_intersections
+        self.min_green = min_green
+        self.max_green = max_green
+        self.cycle_time = cycle_time
+
+    @property
+    def size(self):
+        return 2 * self.num_intersections
+
+    @property
+    def bounds(self):
+        """Límites (mínimo, máximo) de cada posición del vector plano"""
+        return [(self.min_green, self.max_green), (0, self.cycle_time - 1)] * self.num_intersections
+
+    def decode(self, vector):
+        """Vector continuo → plan entero (verde recortado, offset circular)"""
+        plan = []
+        for i in range(self.num_intersections):
+            green = int(round(vector[2 * i]))
+            green = max(self.min_green, min(self.max_green, green))
+            offset = int(round(vector[2 * i + 1])) % self.cycle_time
+            plan.append([green, offset])
+        return plan
+
+    def encode(self, plan):
+        vector = []
+        for green, offset in plan:
+            vector.extend((float(green), float(offset)))
+        return vector
+
+    def random_vector(self, rng=random):
+        return [rng.uniform(low, high) for low, high in self.bounds]
+
+
+class Optimizer:
+    """
+    Interfaz común: recibe un GenomeSpec y una función de fitness sobre planes
+    y retorna el mismo diccionario que GeneticAlgorithm.optimize:
+    best_solution, best_fitness, history, avg_history, min_history.
+
+    Además registra `trace`: (segundos, evaluaciones, mejor fitness) por
+    iteración, que usa el arnés de comparación para medir tiempo a objetivo.
+    """
+    name = "base"
+    label = "Optimizador"
+
+    def __init__(self, spec, fitness_fn, max_evaluations=None, evaluator=None,
+                 target_fitness=None, seed=None, time_budget=None):
+        self.spec = spec
+        self.fitness_fn = fitness_fn
+        self.evaluator = evaluator or BatchEvaluator(fitness_fn)
+        self.max_evaluations = max_evaluations or Config.GA_POPULATION_SIZE * Config.GA_GENERATIONS
+        self.target_fitness = target_fitness  # Si se alcanza, termina antes
+        self.time_budget = time_budget        # Segundos; al agotarse, termina antes
+        self.rng = random.Random(seed)
+
+        self.history = []
+        self.avg_history = []
+        self.min_history = []
+        self.trace = []
+        self.total_iterations = 1
+
+        self.best_individual = None
+        self.best_fitness = float('inf')
+        self._callback = None
+        self._start = 0.0
+        self._evaluations = 0
+
+    # ==================== PLANTILLA ====================
+
+    def optimize(self, callback=None, seed_individuals=None):
+        """Ejecuta el optimizador. `callback(iter, total, best_fitness)`"""
+        self.history = []
+        self.avg_history = []
+        self.min_history = []
+        self.trace = []
+        self.best_individual = None
+        self.best_fitness = float('inf')
+        self._callback = callback
+        self._evaluations = 0
+        self._start = time.perf_counter()
+
+        self._run(list(seed_individuals or []))
+
+        return {
+            'best_solution': self.best_individual,
+            'best_fitness': self.best_fitness,
+            'history': self.history,
+            'avg_history': self.avg_history,
+            'min_history': self.min_history
+        }
+
+    def _run(self, seed_individuals):
+        raise NotImplementedError
+
+    # ==================== UTILIDADES PARA SUBCLASES ====================
+
+    def _evaluate(self, vectors):
+        """Decodifica y evalúa un lote de vectores con la capa compartida"""
+        plans = [self.spec.decode(v) for v in vectors]
+        fitnesses = self.evaluator.evaluate(plans)
+        self._evaluations += len(plans)
+
+        for plan, fit in zip(plans, fitnesses):
+            if fit < self.best_fitness:
+                self.best_fitness = fit
+                self.best_individual = [g[:] for g in plan]
+        return fitnesses
+
+    def _record_iteration(self, iteration, fitnesses):
+        """Guarda estadísticas de la iteración y notifica el progreso"""
+        self.history.append(min(fitnesses))
+        self.avg_history.append(sum(fitnesses) / len(fitnesses))
+        self.min_history.append(max(fitnesses))
+        self.trace.append((self._elapsed(), self._evaluations, self.best_fitness))
+
+        if self._callback:
+            self._callback(iteration, self.total_iterations, self.best_fitness)
+
+    def _elapsed(self):
+        return time.perf_counter() - self._start
+
+    def _should_stop(self):
+        if self._evaluations >= self.max_evaluations:
+            return True
+        if self.time_budget is not None and self._elapsed() >= self.time_budget:
+            return True
+        return self.target_fitness is not None and self.best_fitness <= self.target_fitness
+
+    def _clip(self, vector):
+        """Recorta verdes a sus límites y envuelve offsets en el ciclo"""
+        result = []
+        for k, (low, high) in enumerate(self.spec.bounds):
+            if k % 2 == 1:
+                result.append(vector[k] % self.spec.cycle_time)
+            else:
+                result.append(max(low, min(high, vector[k])))
+        return result
+
+    # ==================== HISTORIAL ====================
+
+    def get_history_data(self):
+        """Retorna datos para gráficos"""
+        if not self.history:
+            return [], [], [], []
+
+        iterations = list(range(1, len(self.history) + 1))
+        return iterations, self.history, self.avg_history, self.min_history
+
+    def show_graph(self):
+        """Muestra gráfico"""
+        from gui.plots import plot_fitness_history
+        plot_fitness_history(self.history, self.avg_history, self.min_history,
+                             title=f"EVOLUCIÓN DEL FITNESS - {self.label.upper()}")
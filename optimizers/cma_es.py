@@ -0,0 +1,102 @@
+# optimizers/cma_es.py - ESTRATEGIA DE EVOLUCIÓN CON ADAPTACIÓN DE COVARIANZA
+import math
+from optimizers.base import Optimizer
+
+
+class CMAESOptimizer(Optimizer):
+    """
+    CMA-ES separable (covarianza diagonal, sep-CMA-ES).
+    Cada paso es O(λ·d) en vez de O(d³), lo que escala a redes grandes
+    sin necesitar una descomposición propia de la matriz completa.
+    Trabaja en el espacio normalizado [0, 1]^d de los límites del genoma.
+    """
+    name = "cmaes"
+    label = "CMA-ES"
+
+    def __init__(self, spec, fitness_fn, population_size=None, sigma0=0.3, **kwargs):
+        super().__init__(spec, fitness_fn, **kwargs)
+        d = spec.size
+        self.lam = population_size or 4 + int(3 * math.log(d))
+        self.sigma0 = sigma0
+        self.total_iterations = max(1, self.max_evaluations // self.lam)
+
+    def _to_genome(self, z):
+        return self._clip([low + zi * (high - low) for zi, (low, high) in zip(z, self.spec.bounds)])
+
+    def _from_genome(self, vector):
+        return [(v - low) / (high - low) for v, (low, high) in zip(vector, self.spec.bounds)]
+
+    def _run(self, seed_individuals):
+        d = self.spec.size
+        lam = self.lam
+        mu = lam // 2
+
+        # Pesos de recombinación logarítmicos
+        raw = [math.log(mu + 0.5) - math.log(i + 1) for i in range(mu)]
+        total = sum(raw)
+        weights = [w / total for w in raw]
+        mueff = 1.0 / sum(w * w for w in weights)
+
+        # Parámetros de adaptación (versión separable: c1 y cmu escalados)
+        cc = (4 + mueff / d) / (d + 4 + 2 * mueff / d)
+        cs = (mueff + 2) / (d + mueff + 5)
+        c1 = 2 / ((d + 1.3) ** 2 + mueff)
+        cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((d + 2) ** 2 + mueff))
+        c1 *= (d + 2) / 3
+        cmu = min(1 - c1, cmu * (d + 2) / 3)
+        damps = 1 + 2 * max(0, math.sqrt((mueff - 1) / (d + 1)) - 1) + cs
+        chi_n = math.sqrt(d) * (1 - 1 / (4 * d) + 1 / (21 * d * d))
+
+        if seed_individuals:
+            mean = self._from_genome(self.spec.encode(seed_individuals[0]))
+        else:
+            mean = [self.rng.random() for _ in range(d)]
+        sigma = self.sigma0
+        diag_c = [1.0] * d
+        ps = [0.0] * d
+        pc = [0.0] * d
+
+        iteration = 0
+        while not self._should_stop():
+            # Muestreo: x = m + σ·sqrt(C)·z
+            samples = []
+            for _ in range(lam):
+                z = [self.rng.gauss(0, 1) for _ in range(d)]
+                y = [math.sqrt(c) * zi for c, zi in zip(diag_c, z)]
+                samples.append(y)
+            points = [[m + sigma * yi for m, yi in zip(mean, y)] for y in samples]
+            fitnesses = self._evaluate([self._to_genome(p) for p in points])
+
+            order = sorted(range(lam), key=lambda k: fitnesses[k])
+            selected = [samples[k] for k in order[:mu]]
+
+            # Nueva media
+            y_w = [sum(w * y[i] for w, y in zip(weights, selected)) for i in range(d)]
+            mean = [m + sigma * yi for m, yi in zip(mean, y_w)]
+
+            # Caminos de evolución
+            coef = math.sqrt(cs * (2 - cs) * mueff)
+            ps = [(1 - cs) * p + coef * yi / math.sqrt(c) for p, yi, c in zip(ps, y_w, diag_c)]
+            ps_norm = math.sqrt(sum(p * p for p in ps))
+            hsig = ps_norm / math.sqrt(1 - (1 - cs) ** (2 * (iteration + 1))) / chi_n < 1.4 + 2 / (d + 1)
+
+            coef = math.sqrt(cc * (2 - cc) * mueff)
+            pc = [(1 - cc) * p + (coef * yi if hsig else 0.0) for p, yi in zip(pc, y_w)]
+
+            # Covarianza diagonal
+            for i in range(d):
+                rank_mu = sum(w * y[i] * y[i] for w, y in zip(weights, selected))
+                correction = 0.0 if hsig else cc * (2 - cc) * diag_c[i]
+                diag_c[i] = ((1 - c1 - cmu) * diag_c[i]
+                             + c1 * (pc[i] * pc[i] + correction)
+                             + cmu * rank_mu)
+
+            # Tamaño de paso
+            sigma *= math.exp((cs / damps) * (ps_norm / chi_n - 1))
+            sigma = min(sigma, 1.0)
+
+            # Mantener la media dentro del espacio normalizado
+            mean = [min(1.0, max(0.0, m)) for m in mean]
+
+            self._record_iteration(iteration, fitnesses)
+            iteration += 1
@@ -0,0 +1,102 @@
+# optimizers/comparison.py - COMPARACIÓN DE VELOCIDAD DE CONVERGENCIA
+import argparse
+import statistics
+from corridor_optimizer import CorridorOptimizer
+from optimizers.base import GenomeSpec
+from optimizers.evaluation import BatchEvaluator
+from optimizers.registry import FITNESS_MODES, OPTIMIZERS, create_evaluator, create_optimizer
+
+
+def time_to_target(trace, target):
+    """Primer (segundos, evaluaciones) en que el mejor fitness alcanza el objetivo"""
+    for seconds, evaluations, best in trace:
+        if best <= target:
+            return seconds, evaluations
+    return None, None
+
+
+def compare_optimizers(traffic_data, names=None, target=None, max_evaluations=6000,
+                       repeats=3, workers=0, num_intersections=6, fitness_mode="snapshot"):
+    """
+    Ejecuta cada optimizador `repeats` veces con el mismo presupuesto y
+    reporta el tiempo y las evaluaciones hasta alcanzar `target`.
+    Sin objetivo explícito se usa el plan de CorridorOptimizer como referencia
+    (con fitness por simulación, ese plan evaluado por el mismo evaluador).
+    `fitness_mode` como en registry.create_evaluator.
+    """
+    names = names or list(OPTIMIZERS)
+    spec = GenomeSpec(num_intersections)
+    fitness, evaluator = create_evaluator(fitness_mode, traffic_data, num_intersections, workers)
+    evaluator = evaluator or BatchEvaluator(fitness, workers=workers)
+
+    if target is None:
+        corridor = CorridorOptimizer(num_intersections).optimize(traffic_data)
+        target = (corridor['best_fitness'] if fitness_mode == "snapshot"
+                  else evaluator.evaluate([corridor['best_solution']])[0])
+
+    rows = []
+    with evaluator:
+        for name in names:
+            times, evals, finals = [], [], []
+            for seed in range(repeats):
+                optimizer = create_optimizer(name, spec, fitness, evaluator=evaluator,
+                                             max_evaluations=max_evaluations,
+                                             target_fitness=target, seed=seed)
+                result = optimizer.optimize()
+                seconds, evaluations = time_to_target(optimizer.trace, target)
+                if seconds is not None:
+                    times.append(seconds)
+                    evals.append(evaluations)
+                finals.append(result['best_fitness'])
+
+            rows.append({
+                'optimizer': name,
+                'success_rate': len(times) / repeats,
+                'median_time_to_target': statistics.median(times) if times else None,
+                'median_evals_to_target': statistics.median(evals) if evals else None,
+                'median_final_fitness': statistics.median(finals),
+            })
+
+    _print_report(rows, target)
+    return rows
+
+
+def _print_report(rows, target):
+    print("\n" + "=" * 70)
+    print(f"🏁 COMPARACIÓN DE OPTIMIZADORES (objetivo: fitness ≤ {target:.2f})")
+    print("=" * 70)
+    print(f"{'Método':<10}{'Éxito':>8}{'Tiempo (s)':>14}{'Evaluaciones':>15}{'Final':>12}")
+    for row in sorted(rows, key=lambda r: (r['median_time_to_target'] is None,
+                                           r['median_time_to_target'] or 0)):
+        t = row['median_time_to_target']
+        e = row['median_evals_to_target']
+        print(f"{row['optimizer']:<10}{row['success_rate']:>7.0%} "
+              f"{(f'{t:.3f}' if t is not None else '-'):>13}"
+              f"{(f'{e:.0f}' if e is not None else '-'):>15}"
+              f"{row['median_final_fitness']:>12.2f}")
+    print("=" * 70 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara optimizadores por tiempo a fitness objetivo")
+    parser.add_argument("--target", type=float, default=None)
+    parser.add_argument("--evaluations", type=int, default=6000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--optimizers", nargs="*", default=None, choices=list(OPTIMIZERS))
+    parser.add_argument("--fitness", choices=FITNESS_MODES, default="snapshot",
+                        help="snapshot: tráfico observado; sim: microsimulación con réplicas adaptativas")
+    args = parser.parse_args()
+
+    # Escenario de referencia: colas y flujos moderados
+    traffic_data = {}
+    for i in range(6):
+        traffic_data[f"queue_{i}"] = 2
+        traffic_data[f"flow_{i}"] = 3
+    compare_optimizers(traffic_data, names=args.optimizers, target=args.target,
+                       max_evaluations=args.evaluations, repeats=args.repeats,
+                       workers=args.workers, fitness_mode=args.fitness)
+
+
+if __name__ == "__main__":
+    main()
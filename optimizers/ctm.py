@@ -0,0 +1,260 @@
+# optimizers/ctm.py - MODELO DE TRANSMISIÓN POR CELDAS (CTM) COMO FITNESS RÁPIDO
+"""
+Modelo macroscópico de la misma red que TrafficSimulation: cada recorrido
+(network_routes, como en la evaluación robusta) se divide en celdas del
+largo que un vehículo recorre en `dt` a la velocidad media, y el estado es
+la cantidad (continua) de vehículos por celda. Cada paso:
+
+    envío     S_c = min(n_c, Q)                  (lo que la celda c puede mandar)
+    recepción R_c = min(Q, N − n_c)              (lo que la celda c puede recibir)
+    flujo     y_c = min(S_c−1, R_c) · verde_c    (de c−1 a c)
+
+donde Q es la capacidad por paso, N la densidad de saturación por celda y
+`verde_c` vale 0 si en el límite entre c−1 y c hay línea de detención
+(35 px antes del semáforo) y su acceso no está en verde. Las fases salen
+del mismo ciclo que TrafficLight (verde NS, amarillo 3 s, verde EO).
+
+La demanda llega como fluido (tasas del DemandProfile por carril, mitad
+por cada extremo) y la espera es la cantidad de vehículos que no avanzaron
+en el paso, como el tiempo detenido de la microsimulación. Todo se
+vectoriza sobre (plan, recorrido, celda): una población completa del AG
+avanza en un solo paso por segundo simulado.
+
+    evaluator = CTMEvaluator(DemandProfile.constant(0.25, 3600))
+    evaluator(plan)          # espera media por vehículo (menor = mejor)
+    ga.evaluator = evaluator # evaluate(batch) para el AG
+
+    python -m optimizers.ctm --plans 12 --seeds 3   # calibración contra la microsimulación
+"""
+import argparse
+import logging
+import math
+import random
+import time
+from config import Config
+from optimizers.robust_evaluation import network_routes
+
+log = logging.getLogger(__name__)
+
+
+class CTMEvaluator:
+    """
+    Misma interfaz que BatchEvaluator (`evaluate(batch)` → fitness) y que
+    las funciones de fitness por plan (`evaluator(plan)`). Sin estado entre
+    llamadas: es picklable y determinista.
+    """
+
+    def __init__(self, profile=None, dt=Config.CTM_DT, capacity=Config.CTM_CAPACITY,
+                 jam_density=Config.CTM_JAM_DENSITY):
+        import numpy as np
+
+        if profile is None:
+            from demand import DemandProfile
+            profile = DemandProfile.constant(Config.DEMAND_BASE_RATE, Config.CTM_HORIZON)
+        self.profile = profile
+        self.dt = dt
+        self.capacity = capacity * dt  # Vehículos por paso
+        self.jam_density = jam_density
+        self.steps = int(round(profile.duration / dt))
+        self.evaluations = 0
+
+        # Celdas: lo recorrido en `dt` a la velocidad media (px/tick → px/s)
+        speed = (Config.VEHICLE_SPEED_MIN + Config.VEHICLE_SPEED_MAX) / 2 / Config.SIM_TIMESTEP
+        self.cell_length = speed * dt
+        routes = network_routes()
+        arrival = Config.VEHICLE_ARRIVAL_DISTANCE
+        reach = [abs(target - start) - arrival for _, start, target, _ in routes]
+        cells = [max(1, math.ceil(length / self.cell_length)) for length in reach]
+        width = max(cells) + 1  # Al menos una celda de salida por recorrido
+
+        # Celdas más allá del final de cada recorrido: sumidero que se vacía en cada paso
+        self._inside = np.arange(width)[None, :] < np.array(cells)[:, None]
+        self._jam = np.where(self._inside, float(jam_density), np.inf)
+        # Línea de detención: límite de entrada a la celda `b` controlado por un semáforo
+        self._gated = np.zeros((len(routes), width), dtype=bool)
+        self._gate_light = np.zeros((len(routes), width), dtype=np.intp)
+        self._approach = np.array([int(horizontal) for horizontal, _, _, _ in routes])
+        for r, (_, start, target, stops) in enumerate(routes):
+            sign = 1 if target > start else -1
+            for pos, light in stops:
+                distance = (pos - start) * sign
+                if distance <= 0:
+                    continue  # Semáforo a espaldas del origen
+                b = int(round((distance - Config.VEHICLE_STOP_DISTANCE) / self.cell_length))
+                if 1 <= b < cells[r]:
+                    self._gated[r, b] = True
+                    self._gate_light[r, b] = light
+
+        # Llegadas por paso y recorrido: la tasa del carril se reparte entre sus dos extremos
+        self._inflow = np.zeros((self.steps, len(routes)))
+        for current in profile.slices:
+            lane_rate = [0.0] * len(Config.LANES)
+            for (origin, _), rate in current.rates.items():
+                lane_rate[origin] += rate
+            first = max(0, int(math.ceil(current.start / dt - 1e-9)))
+            last = min(self.steps, int(math.ceil(current.end / dt - 1e-9)))
+            self._inflow[first:last] = np.repeat(lane_rate, 2) / 2 * dt
+        self.arrivals = float(self._inflow.sum())
+
+    # ==================== SIMULACIÓN VECTORIZADA ====================
+
+    def delays(self, plans):
+        """Espera media por vehículo llegado, por plan (arreglo de P)"""
+        import numpy as np
+
+        p_count = len(plans)
+        green = np.array([[max(20, min(55, int(g))) for g, _ in plan] for plan in plans], dtype=float)
+        offset = np.array([[int(o) % Config.GA_CYCLE_TIME for _, o in plan] for plan in plans],
+                          dtype=float)
+        lights = green.shape[1]
+
+        routes, width = self._gated.shape
+        n = np.zeros((p_count, routes, width))
+        origin = np.zeros((p_count, routes))  # Cola de entrada (la primera celda está llena)
+        waited = np.zeros(p_count)
+        q = self.capacity
+        jam = self._jam
+        inside = self._inside
+        # Índice en la tabla aplanada de verdes (plan, semáforo, acceso) por límite de celda
+        key = (np.arange(p_count)[:, None, None] * (2 * lights)
+               + (2 * self._gate_light + self._approach[:, None])[None])
+        gated = self._gated[None]
+        open_ = np.empty((p_count, lights, 2), dtype=bool)
+        flat_open = open_.reshape(-1)
+
+        for k in range(self.steps):
+            effective = (k * self.dt + offset) % Config.GA_CYCLE_TIME
+            open_[..., 0] = effective < green                  # NS en verde
+            open_[..., 1] = effective >= green + Config.LIGHT_YELLOW_TIME   # EO en verde
+            gate = ~gated | flat_open[key]
+
+            send = np.minimum(n, q)
+            receive = np.minimum(q, jam - n)
+            flow = np.minimum(send[..., :-1], receive[..., 1:]) * gate[..., 1:]
+
+            arriving = origin + self._inflow[k]
+            entry = np.minimum(arriving, receive[..., 0])
+            origin = arriving - entry
+
+            # Detenidos: lo que había en la red (el sumidero ya está vacío) y no avanzó,
+            # más la cola de entrada
+            waited += n.sum(axis=(1, 2)) - flow.sum(axis=(1, 2)) + origin.sum(axis=1)
+            n[..., :-1] -= flow
+            n[..., 1:] += flow
+            n[..., 0] += entry
+            n *= inside  # Lo que pasó al sumidero salió de la red
+
+        return waited * self.dt / max(self.arrivals, 1e-9)
+
+    def evaluate(self, batch):
+        self.evaluations += len(batch)
+        return [round(value, 4) for value in self.delays(batch).tolist()]
+
+    def __call__(self, individual, seed=0):
+        return self.evaluate([individual])[0]
+
+    def close(self):
+        pass
+
+
+# ==================== CALIBRACIÓN CONTRA LA MICROSIMULACIÓN ====================
+
+def microsimulation_delay(plan, profile, seed=0, dt=Config.SIM_TIMESTEP):
+    """Espera media por vehículo de TrafficSimulation con las llegadas de `profile`"""
+    from traffic_simulation import TrafficSimulation
+
+    simulation = TrafficSimulation(total_vehicles=0, rng=random.Random(seed),
+                                   snapshots=False, demand=profile.sample(seed))
+    simulation.apply_optimization(plan)
+    simulation.start()
+    for _ in range(int(profile.duration / dt)):
+        simulation.update(dt)
+    total_wait = simulation.total_wait_completed + sum(v.wait_time for v in simulation.vehicles)
+    return total_wait / max(simulation.total_spawned, 1)
+
+
+def _ranks(values):
+    """Rangos 0..n−1; los empates reciben el rango promedio"""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2
+        i = j + 1
+    return ranks
+
+
+def spearman(a, b):
+    """Correlación de rangos de Spearman (0 si alguna serie es constante)"""
+    ra, rb = _ranks(a), _ranks(b)
+    n = len(ra)
+    ma, mb = sum(ra) / n, sum(rb) / n
+    cov = sum((x - ma) * (y - mb) for x, y in zip(ra, rb))
+    var = math.sqrt(sum((x - ma) ** 2 for x in ra) * sum((y - mb) ** 2 for y in rb))
+    return cov / var if var else 0.0
+
+
+def calibrate(plans, profile, seeds=3, evaluator=None):
+    """
+    Evalúa los mismos planes con el CTM y con la microsimulación (promedio
+    de `seeds` muestras de llegadas) y compara los ordenamientos:
+    {"ctm", "microsimulation", "spearman", "same_best", "ctm_seconds",
+    "microsimulation_seconds"}
+    """
+    evaluator = evaluator or CTMEvaluator(profile)
+    start = time.perf_counter()
+    ctm = evaluator.evaluate(plans)
+    ctm_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    micro = [sum(microsimulation_delay(plan, profile, seed) for seed in range(seeds)) / seeds
+             for plan in plans]
+    micro_seconds = time.perf_counter() - start
+
+    return {"ctm": ctm, "microsimulation": micro, "spearman": spearman(ctm, micro),
+            "same_best": min(range(len(plans)), key=ctm.__getitem__)
+            == min(range(len(plans)), key=micro.__getitem__),
+            "ctm_seconds": ctm_seconds, "microsimulation_seconds": micro_seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibración del CTM contra la microsimulación")
+    parser.add_argument("--plans", type=int, default=12, help="Planes aleatorios a ordenar")
+    parser.add_argument("--seeds", type=int, default=3, help="Muestras de llegadas por plan")
+    parser.add_argument("--duration", type=float, default=600, help="Segundos simulados")
+    parser.add_argument("--rate", type=float, default=Config.DEMAND_BASE_RATE,
+                        help="Vehículos/s en toda la red")
+    parser.add_argument("--profile", help="Perfil de demanda JSON (reemplaza --duration/--rate)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Cada réplica de la microsimulación anuncia inicio y plan: solo quedan los avisos
+    logging.getLogger("traffic_simulation").setLevel(logging.WARNING)
+
+    from demand import DemandProfile
+    profile = (DemandProfile.load(args.profile) if args.profile
+               else DemandProfile.constant(args.rate, args.duration))
+    rng = random.Random(args.seed)
+    plans = [[[rng.randint(20, 55), rng.randint(0, Config.GA_CYCLE_TIME - 1)]
+              for _ in Config.INTERSECTIONS] for _ in range(args.plans)]
+
+    log.info("🧮 Calibrando el CTM con %d planes × %d muestras (%.0f s simulados)...",
+             args.plans, args.seeds, profile.duration)
+    result = calibrate(plans, profile, seeds=args.seeds)
+    for k, (ctm, micro) in enumerate(zip(result["ctm"], result["microsimulation"])):
+        log.info("   Plan %2d: CTM %7.2f s   microsimulación %7.2f s", k, ctm, micro)
+    log.info("📈 Spearman %.3f · mejor plan %s · CTM %.0f ms · microsimulación %.1f s",
+             result["spearman"], "coincide" if result["same_best"] else "NO coincide",
+             result["ctm_seconds"] * 1000, result["microsimulation_seconds"])
+    if result["spearman"] < Config.CTM_MIN_SPEARMAN:
+        log.warning("⚠️ El CTM no ordena como la microsimulación (mínimo %.2f)",
+                    Config.CTM_MIN_SPEARMAN)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# optimizers/differential_evolution.py - EVOLUCIÓN DIFERENCIAL
+from optimizers.base import Optimizer
+
+
+class DifferentialEvolutionOptimizer(Optimizer):
+    """
+    Evolución diferencial DE/rand/1/bin.
+    Cada generación crea todos los ensayos y los evalúa en un solo lote,
+    luego reemplaza a cada padre si su ensayo es mejor (selección voraz).
+    """
+    name = "de"
+    label = "Evolución Diferencial"
+
+    def __init__(self, spec, fitness_fn, population_size=None,
+                 differential_weight=0.6, crossover_rate=0.9, **kwargs):
+        super().__init__(spec, fitness_fn, **kwargs)
+        self.population_size = population_size or max(20, 5 * spec.size)
+        self.differential_weight = differential_weight
+        self.crossover_rate = crossover_rate
+        self.total_iterations = max(1, self.max_evaluations // self.population_size - 1)
+
+    def _run(self, seed_individuals):
+        n = self.population_size
+        d = self.spec.size
+
+        population = [self.spec.encode(seed) for seed in seed_individuals][:n]
+        while len(population) < n:
+            population.append(self.spec.random_vector(self.rng))
+        fitnesses = self._evaluate(population)
+
+        iteration = 0
+        while not self._should_stop():
+            trials = []
+            for k in range(n):
+                a, b, c = self.rng.sample([i for i in range(n) if i != k], 3)
+                forced = self.rng.randrange(d)  # Al menos un gen del mutante
+                trial = []
+                for i in range(d):
+                    if i == forced or self.rng.random() < self.crossover_rate:
+                        trial.append(population[a][i] + self.differential_weight *
+                                     (population[b][i] - population[c][i]))
+                    else:
+                        trial.append(population[k][i])
+                trials.append(self._clip(trial))
+
+            trial_fitnesses = self._evaluate(trials)
+
+            for k in range(n):
+                if trial_fitnesses[k] <= fitnesses[k]:
+                    population[k] = trials[k]
+                    fitnesses[k] = trial_fitnesses[k]
+
+            self._record_iteration(iteration, fitnesses)
+            iteration += 1
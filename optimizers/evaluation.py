@@ -0,0 +1,52 @@
+# optimizers/evaluation.py - CAPA DE EVALUACIÓN POR LOTES
+from genetic_algorithm import GeneticAlgorithm
+
+
+class PlanFitness:
+    """
+    Fitness del AG como función de un plan [[green_time, offset], ...].
+    Es picklable para poder enviarse a procesos trabajadores.
+    """
+
+    def __init__(self, traffic_data, num_intersections=6):
+        self.traffic_data = traffic_data
+        self.ga = GeneticAlgorithm(num_intersections)
+
+    def __call__(self, individual):
+        return self.ga._fitness(individual, self.traffic_data)
+
+
+class BatchEvaluator:
+    """
+    Evalúa lotes de planes, en serie o repartidos en un pool de procesos.
+    Todos los optimizadores evalúan a través de esta clase.
+    """
+
+    def __init__(self, fitness_fn, workers=0):
+        self.fitness_fn = fitness_fn
+        self.workers = workers
+        self.evaluations = 0
+        self._pool = None
+
+    def evaluate(self, batch):
+        """Retorna la lista de fitness (menor = mejor) en el mismo orden"""
+        self.evaluations += len(batch)
+        if self.workers <= 1 or len(batch) < 2:
+            return [self.fitness_fn(ind) for ind in batch]
+
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor  # Solo si hay trabajadores
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        chunksize = max(1, len(batch) // (self.workers * 4))
+        return list(self._pool.map(self.fitness_fn, batch, chunksize=chunksize))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,113 @@
+# optimizers/noisy_evaluation.py - EVALUACIÓN CON RUIDO: RÉPLICAS ADAPTATIVAS
+import math
+from config import Config
+from optimizers.evaluation import BatchEvaluator
+from optimizers.simulation_fitness import Replication
+
+
+class AdaptiveReplicationEvaluator:
+    """
+    Evaluador por lotes para fitness ruidosos f(plan, semilla).
+
+    - Números aleatorios comunes: la réplica k de TODOS los candidatos usa la
+      misma semilla de escenario `scenario_seeds[k]` (misma demanda).
+    - Carrera adaptativa: tras `min_replications`, solo los candidatos cuyo
+      intervalo de confianza se solapa con el umbral de la élite reciben
+      réplicas extra, hasta `max_replications`. Los claramente buenos o
+      claramente malos no gastan más simulaciones.
+
+    Las muestras se guardan por plan, así que un élite que sobrevive varias
+    generaciones no se vuelve a simular.
+    Misma interfaz que BatchEvaluator: evaluate(batch) → medias.
+    """
+
+    def __init__(self, fitness_fn, scenario_seeds=None,
+                 min_replications=Config.SIM_MIN_REPLICATIONS,
+                 max_replications=Config.SIM_MAX_REPLICATIONS,
+                 elite_fraction=Config.SIM_ELITE_FRACTION,
+                 z=Config.SIM_RACING_Z, workers=0, max_cache=50000):
+        self.scenario_seeds = list(scenario_seeds or range(max_replications))
+        self.min_replications = min_replications
+        self.max_replications = min(max_replications, len(self.scenario_seeds))
+        self.elite_fraction = elite_fraction
+        self.z = z
+        self.max_cache = max_cache
+        self.runner = BatchEvaluator(Replication(fitness_fn), workers=workers)
+
+        self.samples = {}       # plan → [muestra por escenario k]
+        self.evaluations = 0    # Planes evaluados
+        self.replications = 0   # Simulaciones realmente ejecutadas
+
+    def _key(self, individual):
+        return tuple(tuple(gene) for gene in individual)
+
+    def _replicate(self, keys, plans_by_key):
+        """Agrega una réplica (siguiente escenario común) a cada clave"""
+        jobs = []
+        for key in keys:
+            k = len(self.samples[key])
+            jobs.append((plans_by_key[key], self.scenario_seeds[k]))
+        results = self.runner.evaluate(jobs)
+        self.replications += len(jobs)
+        for key, value in zip(keys, results):
+            self.samples[key].append(value)
+
+    @staticmethod
+    def _stats(values):
+        n = len(values)
+        mean = sum(values) / n
+        if n < 2:
+            return mean, float('inf')
+        var = sum((v - mean) ** 2 for v in values) / (n - 1)
+        return mean, math.sqrt(var / n)
+
+    def evaluate(self, batch):
+        self.evaluations += len(batch)
+        if len(self.samples) > self.max_cache:
+            self.samples.clear()
+
+        plans_by_key = {}
+        keys = []
+        for individual in batch:
+            key = self._key(individual)
+            keys.append(key)
+            plans_by_key[key] = individual
+            self.samples.setdefault(key, [])
+        unique = list(plans_by_key)
+
+        # 1. Réplicas mínimas para todos
+        while True:
+            pending = [key for key in unique if len(self.samples[key]) < self.min_replications]
+            if not pending:
+                break
+            self._replicate(pending, plans_by_key)
+
+        # 2. Carrera: más réplicas solo para los cercanos al umbral de la élite
+        elite_count = max(1, int(math.ceil(self.elite_fraction * len(unique))))
+        while True:
+            stats = {key: self._stats(self.samples[key]) for key in unique}
+            ranked = sorted(unique, key=lambda key: stats[key][0])
+            threshold, threshold_se = stats[ranked[elite_count - 1]]
+
+            close = []
+            for key in unique:
+                mean, se = stats[key]
+                if len(self.samples[key]) >= self.max_replications:
+                    continue
+                margin = self.z * math.hypot(se, threshold_se) if math.isfinite(se) else float('inf')
+                if abs(mean - threshold) <= margin:
+                    close.append(key)
+            if not close:
+                break
+            self._replicate(close, plans_by_key)
+
+        return [self._stats(self.samples[key])[0] for key in keys]
+
+    def close(self):
+        self.runner.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
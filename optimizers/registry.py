@@ -0,0 +1,43 @@
+# optimizers/registry.py - REGISTRO DE OPTIMIZADORES DISPONIBLES
+from optimizers.cma_es import CMAESOptimizer
+from optimizers.differential_evolution import DifferentialEvolutionOptimizer
+from optimizers.genetic import GeneticOptimizer
+from optimizers.simulated_annealing import SimulatedAnnealingOptimizer
+
+OPTIMIZERS = {
+    cls.name: cls
+    for cls in (GeneticOptimizer, CMAESOptimizer,
+                DifferentialEvolutionOptimizer, SimulatedAnnealingOptimizer)
+}
+
+
+def create_optimizer(name, spec, fitness_fn, **kwargs):
+    """Crea un optimizador por nombre ('ga', 'cmaes', 'de', 'sa')"""
+    if name not in OPTIMIZERS:
+        raise ValueError(f"Optimizador desconocido: {name!r} "
+                         f"(disponibles: {', '.join(OPTIMIZERS)})")
+    return OPTIMIZERS[name](spec, fitness_fn, **kwargs)
+
+
+FITNESS_MODES = ("snapshot", "sim")
+
+
+def create_evaluator(mode, traffic_data, num_intersections=6, workers=0):
+    """
+    (fitness_fn, evaluator) según el modo de fitness:
+    - "snapshot": PlanFitness determinista sobre el tráfico observado;
+      evaluator None = el de cada optimizador (el AG usa su evaluación
+      incremental).
+    - "sim": espera media por microsimulación (SimulationFitness) con
+      números aleatorios comunes y réplicas adaptativas
+      (AdaptiveReplicationEvaluator).
+    """
+    if mode == "snapshot":
+        from optimizers.evaluation import PlanFitness
+        return PlanFitness(traffic_data, num_intersections), None
+    if mode == "sim":
+        from optimizers.noisy_evaluation import AdaptiveReplicationEvaluator
+        from optimizers.simulation_fitness import SimulationFitness
+        fitness = SimulationFitness()
+        return fitness, AdaptiveReplicationEvaluator(fitness, workers=workers)
+    raise ValueError(f"Fitness desconocido: {mode!r} (disponibles: {', '.join(FITNESS_MODES)})")
@@ -0,0 +1,105 @@
+# optimizers/rolling.py - RE-OPTIMIZACIÓN CONTINUA (HORIZONTE RODANTE)
+import logging
+from config import Config
+from optimizers.background import BackgroundOptimization
+
+log = logging.getLogger(__name__)
+
+
+class RollingHorizon:
+    """
+    Re-optimiza cada `period` segundos simulados con el tráfico observado
+    en ese momento, en otro proceso (BackgroundOptimization), y aplica el
+    resultado con TrafficSimulation.retime: sin reinicio, en los límites de
+    ciclo. Cada corrida arranca desde el plan vigente y dura a lo sumo
+    `time_budget` segundos reales.
+
+    No usa hilos propios: el hilo de Tk (o el bucle sin interfaz) llama a
+    `poll()` periódicamente.
+    """
+
+    def __init__(self, simulation, optimizer_name="ga", period=Config.ROLLING_PERIOD,
+                 time_budget=Config.ROLLING_TIME_BUDGET,
+                 max_evaluations=Config.ROLLING_MAX_EVALUATIONS, on_applied=None, cache=None,
+                 fitness=Config.OPTIMIZATION_FITNESS):
+        self.simulation = simulation
+        self.optimizer_name = optimizer_name
+        self.period = period
+        self.time_budget = time_budget
+        self.max_evaluations = max_evaluations
+        self.on_applied = on_applied  # on_applied(resultado) tras aplicar un plan
+        self.cache = cache            # PlanCache opcional (plan_cache.py)
+        self.fitness = fitness        # "snapshot" o "sim" (registry.create_evaluator)
+        self.job = None
+        self.runs = 0
+        self.applied = 0
+        self._launched_at = None   # Tiempo simulado del último lanzamiento
+        self._launched_run = None  # simulation.run del último lanzamiento
+        self._network = None       # network_version para la que se optimiza
+        self._traffic_data = None  # Tráfico con el que se lanzó la optimización
+
+    def current_plan(self):
+        """Plan vigente; si hay una transición en curso, el plan hacia el que va"""
+        return [list(light.planned) for light in self.simulation.traffic_lights]
+
+    def poll(self):
+        """Atiende la optimización en curso o lanza la siguiente si toca"""
+        if self.job is not None:
+            for message in self.job.poll():
+                if message[0] == "done":
+                    self._apply(message[1])
+                elif message[0] == "error":
+                    log.warning("⚠️ Re-optimización fallida: %s", message[1])
+            if self.job.finished:
+                self.job = None
+            return
+
+        simulation = self.simulation
+        if not simulation.is_running:
+            return
+        if (self._launched_at is None or simulation.run != self._launched_run
+                or simulation.current_time - self._launched_at >= self.period):
+            self._launch()
+
+    def _launch(self):
+        simulation = self.simulation
+        plan = self.current_plan()
+        self._launched_at = simulation.current_time
+        self._launched_run = simulation.run
+        self._network = simulation.network_version
+        self._traffic_data = simulation.snapshot.traffic_data()
+        self.runs += 1
+
+        seeds = [plan]
+        if self.cache is not None:
+            hit = self.cache.lookup(self._traffic_data)
+            if hit is not None:
+                log.info("⚡ Re-optimización %d resuelta desde el caché", self.runs)
+                self._apply({'best_solution': hit['plan'], 'best_fitness': hit['fitness']},
+                            store=False)
+                return
+            seeds += self.cache.neighbours(self._traffic_data)
+
+        self.job = BackgroundOptimization(
+            self.optimizer_name, self._traffic_data, self.max_evaluations,
+            current_greens=[green for green, _ in plan], num_intersections=len(plan),
+            seed_plans=seeds, time_budget=self.time_budget, fitness=self.fitness)
+        log.info("🔁 Re-optimización %d (t=%.0fs)", self.runs, simulation.current_time)
+
+    def _apply(self, result, store=True):
+        plan = result['best_solution']
+        if store and self.cache is not None and plan:
+            self.cache.store(self._traffic_data, plan)
+        if self.simulation.network_version != self._network:
+            return  # Los semáforos se recrearon mientras tanto: el plan ya no aplica
+        if plan and plan != self.current_plan():
+            self.simulation.retime(plan)
+            self.applied += 1
+            log.info("🔁 Plan actualizado (fitness %.2f)", result['best_fitness'])
+        if self.on_applied:
+            self.on_applied(result)
+
+    def stop(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
@@ -0,0 +1,60 @@
+# optimizers/simulated_annealing.py - RECOCIDO SIMULADO
+import math
+from optimizers.base import Optimizer
+
+
+class SimulatedAnnealingOptimizer(Optimizer):
+    """
+    Recocido simulado con enfriamiento geométrico.
+    En cada iteración genera un lote de vecinos (un gen cambiado cada uno),
+    los evalúa juntos y aplica el criterio de Metropolis al mejor de ellos.
+    """
+    name = "sa"
+    label = "Recocido Simulado"
+
+    def __init__(self, spec, fitness_fn, batch_size=8, initial_temperature=200.0,
+                 final_temperature=1.0, **kwargs):
+        super().__init__(spec, fitness_fn, **kwargs)
+        self.batch_size = batch_size
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+        self.total_iterations = max(1, self.max_evaluations // batch_size)
+
+    def _neighbor(self, vector):
+        """Cambia un solo gen: paso local en el verde o salto en el offset"""
+        neighbor = vector[:]
+        i = self.rng.randrange(self.spec.size)
+        low, high = self.spec.bounds[i]
+        if i % 2 == 0:
+            neighbor[i] += self.rng.choice((-1, 1)) * self.rng.randint(1, 5)
+        elif self.rng.random() < 0.5:
+            neighbor[i] += self.rng.randint(-6, 6)
+        else:
+            neighbor[i] = self.rng.uniform(low, high)
+        return self._clip(neighbor)
+
+    def _run(self, seed_individuals):
+        if seed_individuals:
+            current = self.spec.encode(seed_individuals[0])
+        else:
+            current = self.spec.random_vector(self.rng)
+        current_fitness = self._evaluate([current])[0]
+
+        # Enfriamiento geométrico de T0 a Tf a lo largo del presupuesto
+        steps = max(1, self.total_iterations - 1)
+        alpha = (self.final_temperature / self.initial_temperature) ** (1 / steps)
+        temperature = self.initial_temperature
+
+        iteration = 0
+        while not self._should_stop():
+            neighbors = [self._neighbor(current) for _ in range(self.batch_size)]
+            fitnesses = self._evaluate(neighbors)
+
+            k = min(range(len(neighbors)), key=lambda idx: fitnesses[idx])
+            delta = fitnesses[k] - current_fitness
+            if delta <= 0 or self.rng.random() < math.exp(-delta / temperature):
+                current, current_fitness = neighbors[k], fitnesses[k]
+
+            self._record_iteration(iteration, fitnesses)
+            temperature = max(self.final_temperature, temperature * alpha)
+            iteration += 1
@@ -0,0 +1,45 @@
+# optimizers/simulation_fitness.py - FITNESS POR MICROSIMULACIÓN
+import random
+from config import Config
+from traffic_simulation import TrafficSimulation
+
+
+class SimulationFitness:
+    """
+    Evalúa un plan ejecutando TrafficSimulation sin interfaz.
+    La demanda sale de random.Random(semilla): con la misma semilla todos
+    los planes ven exactamente los mismos vehículos (números aleatorios
+    comunes), así que las diferencias se deben al plan y no al azar.
+    Retorna la espera media por vehículo generado (menor = mejor).
+    """
+
+    def __init__(self, total_vehicles=Config.SIM_FITNESS_VEHICLES,
+                 duration=Config.SIM_FITNESS_DURATION,
+                 dt=Config.UPDATE_INTERVAL / 1000.0):
+        self.total_vehicles = total_vehicles
+        self.duration = duration
+        self.dt = dt
+
+    def __call__(self, individual, seed=0):
+        simulation = TrafficSimulation(total_vehicles=self.total_vehicles,
+                                       rng=random.Random(seed),
+                                       snapshots=False)
+        simulation.apply_optimization(individual)
+        simulation.start()
+
+        for _ in range(int(self.duration / self.dt)):
+            simulation.update(self.dt)
+
+        total_wait = simulation.total_wait_completed + sum(v.wait_time for v in simulation.vehicles)
+        return round(total_wait / max(simulation.total_spawned, 1), 4)
+
+
+class Replication:
+    """Trabajo picklable (plan, semilla) → muestra de fitness"""
+
+    def __init__(self, fitness_fn):
+        self.fitness_fn = fitness_fn
+
+    def __call__(self, job):
+        individual, seed = job
+        return self.fitness_fn(individual, seed)
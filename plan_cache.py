@@ -0,0 +1,156 @@
+# plan_cache.py - CACHÉ PERSISTENTE DE PLANES POR HUELLA DEL TRÁFICO
+"""
+Guarda los planes optimizados indexados por una huella cuantizada del
+estado de los detectores (queue_i / flow_i de get_real_traffic_data):
+
+    cache = PlanCache()                       # carga Config.PLAN_CACHE_PATH
+    hit = cache.lookup(traffic_data)          # plan casi instantáneo...
+    seeds = cache.neighbours(traffic_data)    # ...o semillas para el AG
+    cache.store(traffic_data, plan)           # tras optimizar
+
+Dos huellas se comparan con la distancia máxima por componente (en
+pasos de cuantización). Dentro de `tolerance` el plan se reutiliza tal cual; dentro de
+`seed_radius` solo siembra la población inicial. Al superar `max_entries`
+se descarta la entrada usada hace más tiempo.
+
+El "fitness" de cada entrada es el puntaje del AG sin su ruido de ±8
+(plan_score), no el que reportó el optimizador: ese trae ruido o, con
+fitness por simulación, otra escala, y no serviría para decidir si un
+plan nuevo mejora al guardado.
+"""
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from config import Config
+from genetic_algorithm import GeneticAlgorithm
+
+log = logging.getLogger(__name__)
+
+
+def fingerprint(traffic_data, quantum=Config.PLAN_CACHE_QUANTUM):
+    """(cola_0, flujo_0, cola_1, flujo_1, ...) cuantizados en pasos de `quantum` vehículos"""
+    values = []
+    i = 0
+    while f"queue_{i}" in traffic_data:
+        values.append(int(traffic_data[f"queue_{i}"] // quantum))
+        values.append(int(traffic_data.get(f"flow_{i}", 0) // quantum))
+        i += 1
+    return tuple(values)
+
+
+def distance(a, b):
+    """Máxima diferencia por componente (inf si las redes no coinciden)"""
+    if len(a) != len(b):
+        return float("inf")
+    return max((abs(x - y) for x, y in zip(a, b)), default=0)
+
+
+def plan_score(traffic_data, plan):
+    """Fitness determinista del AG (sin ruido) de `plan` para este tráfico: menor es mejor"""
+    ga = GeneticAlgorithm(num_intersections=len(plan))
+    return round(ga._score_terms(ga._compute_terms(plan, traffic_data)), 2)
+
+
+class PlanCache:
+    def __init__(self, path=Config.PLAN_CACHE_PATH, max_entries=Config.PLAN_CACHE_SIZE,
+                 quantum=Config.PLAN_CACHE_QUANTUM, tolerance=Config.PLAN_CACHE_TOLERANCE,
+                 seed_radius=Config.PLAN_CACHE_SEED_RADIUS):
+        self.path = path
+        self.max_entries = max_entries
+        self.quantum = quantum
+        self.tolerance = tolerance
+        self.seed_radius = seed_radius
+        # huella → {"plan", "fitness", "hits"}; el orden es el de uso (LRU)
+        self.entries = OrderedDict()
+        if path:
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    # ==================== CONSULTAS ====================
+
+    def _nearest(self, key, radius):
+        """(distancia, huella) de las entradas a `radius` o menos, de la más cercana"""
+        found = []
+        for other in self.entries:
+            d = distance(key, other)
+            if d <= radius:
+                found.append((d, other))
+        found.sort()
+        return found
+
+    def lookup(self, traffic_data):
+        """Entrada {"plan", "fitness", "hits", "distance"} dentro de la tolerancia, o None"""
+        key = fingerprint(traffic_data, self.quantum)
+        if key in self.entries:
+            d, match = 0, key
+        else:
+            found = self._nearest(key, self.tolerance)
+            if not found:
+                return None
+            d, match = found[0]
+        entry = self.entries[match]
+        entry["hits"] += 1
+        self.entries.move_to_end(match)
+        return dict(entry, plan=[list(g) for g in entry["plan"]], distance=d)
+
+    def neighbours(self, traffic_data, k=Config.PLAN_CACHE_SEEDS):
+        """Hasta `k` planes de huellas cercanas (radio `seed_radius`) para sembrar el AG"""
+        key = fingerprint(traffic_data, self.quantum)
+        return [[list(g) for g in self.entries[match]["plan"]]
+                for _, match in self._nearest(key, self.seed_radius)[:k]]
+
+    # ==================== ALTAS ====================
+
+    def store(self, traffic_data, plan):
+        """Guarda (o mejora) el plan de esta huella y persiste el caché"""
+        key = fingerprint(traffic_data, self.quantum)
+        fitness = plan_score(traffic_data, plan)
+        old = self.entries.get(key)
+        if old is not None and old["fitness"] <= fitness:
+            self.entries.move_to_end(key)
+            return  # Ya había uno igual o mejor para este estado
+        self.entries[key] = {"plan": [list(g) for g in plan], "fitness": fitness,
+                             "hits": old["hits"] if old else 0}
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        if self.path:
+            self.save()
+
+    # ==================== PERSISTENCIA ====================
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as exc:
+            log.warning("⚠️ Caché de planes ilegible (%s): se empieza vacío", exc)
+            return
+        if data.get("quantum") != self.quantum:
+            log.info("🗃️ Caché de planes con otra cuantización: se descarta")
+            return
+        for item in data.get("entries", [])[-self.max_entries:]:
+            self.entries[tuple(item["key"])] = {"plan": item["plan"], "fitness": item["fitness"],
+                                                "hits": item.get("hits", 0)}
+
+    def save(self):
+        """Escritura atómica (temporal + os.replace), de la entrada más vieja a la más nueva"""
+        data = {"quantum": self.quantum,
+                "entries": [dict(entry, key=list(key)) for key, entry in self.entries.items()]}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,135 @@
+# plan_scheduler.py - PLANES POR PERÍODO DEL DÍA, OPTIMIZADOS EN PARALELO
+"""
+Divide el día en períodos, optimiza un plan por período en procesos
+separados y guarda el horario resultante:
+
+    python plan_scheduler.py --out horario.json --workers 8
+    python plan_scheduler.py --profile demanda.json --period 900 --out horario.json
+
+En ejecución la simulación solo consulta la tabla (ver
+TrafficSimulation.set_timetable): el índice del período es una división,
+y el cambio de plan en el límite usa la misma transición suave que la
+re-optimización continua (TrafficSimulation.retime).
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from config import Config
+
+log = logging.getLogger(__name__)
+
+
+class PlanTimetable:
+    """Un plan por período de `period_seconds`; el último se mantiene al final del día"""
+
+    def __init__(self, period_seconds, plans, fitnesses=None):
+        if not plans:
+            raise ValueError("Horario sin planes")
+        self.period_seconds = period_seconds
+        self.plans = plans
+        self.fitnesses = fitnesses or [None] * len(plans)
+
+    def __len__(self):
+        return len(self.plans)
+
+    def index_at(self, t):
+        """Período vigente en el instante `t` (O(1))"""
+        return min(max(int(t // self.period_seconds), 0), len(self.plans) - 1)
+
+    def plan_at(self, t):
+        return self.plans[self.index_at(t)]
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({"period_seconds": self.period_seconds, "plans": self.plans,
+                       "fitnesses": self.fitnesses}, f, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["period_seconds"], data["plans"], data.get("fitnesses"))
+
+
+def optimize_period(job):
+    """
+    Trabajo de un proceso: simula el comienzo del período con su demanda,
+    toma el tráfico observado y optimiza un plan con el AG
+    """
+    from demand import DemandProfile
+    from genetic_algorithm import GeneticAlgorithm
+    from traffic_simulation import TrafficSimulation
+
+    start = time.perf_counter()
+    profile = DemandProfile.from_dict(job["profile"]).window(job["start"], job["end"])
+    simulation = TrafficSimulation(total_vehicles=0, rng=random.Random(job["seed"]),
+                                   snapshots=False, demand=profile.sample(job["seed"]))
+    simulation.start()
+    dt = Config.SIM_TIMESTEP
+    for _ in range(int(min(job["warmup"], job["end"] - job["start"]) / dt)):
+        simulation.update(dt)
+
+    random.seed(job["seed"])  # El AG usa el generador global
+    ga = GeneticAlgorithm(num_intersections=len(simulation.traffic_lights))
+    ga.generations = job["generations"]
+    result = ga.optimize(simulation.snapshot.traffic_data())
+    return {"index": job["index"], "plan": result["best_solution"],
+            "fitness": result["best_fitness"], "seconds": time.perf_counter() - start}
+
+
+def build_timetable(profile, period_seconds, workers=None, seed=0,
+                    warmup=Config.SCHEDULE_WARMUP, generations=Config.SCHEDULE_GENERATIONS):
+    """Optimiza todos los períodos en paralelo y arma el PlanTimetable"""
+    count = max(1, int(-(-profile.duration // period_seconds)))  # Techo
+    data = profile.to_dict()
+    jobs = [{"index": k, "start": k * period_seconds, "end": (k + 1) * period_seconds,
+             "profile": data, "seed": seed + k, "warmup": warmup, "generations": generations}
+            for k in range(count)]
+
+    plans = [None] * count
+    fitnesses = [None] * count
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(optimize_period, jobs):
+            k = result["index"]
+            plans[k] = result["plan"]
+            fitnesses[k] = result["fitness"]
+            log.info("   Período %2d [%6.0f-%6.0f s] tasa %.2f veh/s → fitness %8.2f (%.1fs)",
+                     k, k * period_seconds, (k + 1) * period_seconds,
+                     profile.rate_at(k * period_seconds), result["fitness"], result["seconds"])
+    return PlanTimetable(period_seconds, plans, fitnesses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Horario de planes por período, en paralelo",
+                                     epilog="Ver el docstring de plan_scheduler.py")
+    parser.add_argument("--profile", help="Perfil de demanda JSON (por defecto DemandProfile.daily)")
+    parser.add_argument("--period", type=float, default=Config.DEMAND_SLICE_SECONDS,
+                        help="Segundos simulados por período")
+    parser.add_argument("--out", default="horario.json", help="Archivo del horario")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--generations", type=int, default=Config.SCHEDULE_GENERATIONS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Los procesos hijos no configuran logging: solo quedan los avisos
+    logging.getLogger("genetic_algorithm").setLevel(logging.WARNING)
+
+    from demand import DemandProfile
+    profile = DemandProfile.load(args.profile) if args.profile else DemandProfile.daily()
+
+    start = time.perf_counter()
+    log.info("🗓️ Optimizando %d períodos con %d procesos...",
+             max(1, int(-(-profile.duration // args.period))), args.workers)
+    timetable = build_timetable(profile, args.period, workers=args.workers, seed=args.seed,
+                                generations=args.generations)
+    timetable.save(args.out)
+    log.info("✅ Horario de %d planes guardado en %s (%.1fs)",
+             len(timetable), args.out, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
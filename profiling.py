@@ -0,0 +1,160 @@
+# profiling.py - TEMPORIZADORES POR FASE ACTIVABLES EN TIEMPO DE EJECUCIÓN
+"""
+Uso en un camino caliente:
+
+    laps = PROFILER.laps("simulation.update")   # None si está apagado
+    ...fase 1...
+    if laps: laps.lap("spawn")
+    ...fase 2...
+    if laps: laps.lap("movement")
+    if laps: laps.finish()                      # total de la llamada
+
+Apagado, el costo es obtener None y un `if` por fase. Las fases se
+nombran como pilas separadas por ';' ("simulation.update;spawn"), el
+formato que usan flamegraph.pl y speedscope.
+
+Se activa con PROFILER.enable(), desde el menú de la interfaz o con la
+variable de entorno TRAFFIC_PROFILE=1.
+"""
+import json
+import os
+import threading
+import time
+
+_perf_counter = time.perf_counter
+
+
+class PhaseStats:
+    """Conteo, total, extremos e histograma (cubetas log2 en µs) de una fase"""
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = {}  # k → mediciones en [2^(k-1), 2^k) µs
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        k = int(seconds * 1e6).bit_length()
+        self.buckets[k] = self.buckets.get(k, 0) + 1
+
+    def percentile(self, q):
+        """Estimación desde el histograma: límite superior de la cubeta"""
+        target = q * self.count
+        seen = 0
+        for k in sorted(self.buckets):
+            seen += self.buckets[k]
+            if seen >= target:
+                return min(2 ** k / 1e6, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "min_ms": self.min * 1000 if self.count else 0.0,
+            "max_ms": self.max * 1000,
+            "p50_ms": self.percentile(0.5) * 1000,
+            "p90_ms": self.percentile(0.9) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "histogram_us": {f"<{2 ** k}": n for k, n in sorted(self.buckets.items())},
+        }
+
+
+class Laps:
+    """Cronómetro de una llamada: cada `lap` mide desde la marca anterior"""
+    __slots__ = ("profiler", "root", "start", "mark")
+
+    def __init__(self, profiler, root):
+        self.profiler = profiler
+        self.root = root
+        self.start = self.mark = _perf_counter()
+
+    def lap(self, phase, exclude=0.0):
+        """Registra la fase; `exclude` descuenta tiempo ya medido aparte"""
+        now = _perf_counter()
+        self.profiler.add(f"{self.root};{phase}", now - self.mark - exclude)
+        self.mark = now
+
+    def add(self, phase, seconds):
+        """Fase medida por partes (p. ej. acumulada dentro de un bucle)"""
+        self.profiler.add(f"{self.root};{phase}", seconds)
+
+    def finish(self):
+        self.profiler.add(self.root, _perf_counter() - self.start)
+
+
+class Profiler:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.phases = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.phases = {}
+
+    def laps(self, root):
+        return Laps(self, root) if self.enabled else None
+
+    def add(self, name, seconds):
+        with self._lock:
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = PhaseStats()
+            stats.add(seconds)
+
+    # ==================== REPORTES ====================
+
+    def report(self):
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self.phases.items())}
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def folded(self):
+        """
+        Líneas "pila valor" (µs) para flamegraph.pl / speedscope. A cada
+        pila se le resta lo que miden sus hijas, así nada se cuenta dos veces.
+        """
+        with self._lock:
+            totals = {name: stats.total for name, stats in self.phases.items()}
+        lines = []
+        for name, total in sorted(totals.items()):
+            children = sum(t for other, t in totals.items()
+                           if other.startswith(name + ";") and ";" not in other[len(name) + 1:])
+            own = int(max(0.0, total - children) * 1e6)
+            if own:
+                lines.append(f"{name} {own}")
+        return lines
+
+    def export_folded(self, path):
+        with open(path, "w") as f:
+            f.write("\n".join(self.folded()) + "\n")
+
+    def summary(self):
+        """Tabla breve para consola"""
+        rows = [f"{'Fase':<40}{'N':>8}{'Media ms':>11}{'p90 ms':>10}{'Total ms':>11}"]
+        for name, data in self.report().items():
+            rows.append(f"{name:<40}{data['count']:>8}{data['mean_ms']:>11.3f}"
+                        f"{data['p90_ms']:>10.3f}{data['total_ms']:>11.1f}")
+        return "\n".join(rows)
+
+
+PROFILER = Profiler(enabled=os.environ.get("TRAFFIC_PROFILE") == "1")
@@ -0,0 +1,130 @@
+# snapshot.py - INSTANTÁNEAS INMUTABLES DEL ESTADO DE LA SIMULACIÓN
+import math
+from array import array
+from config import Config
+
+
+class SimulationSnapshot:
+    """
+    Estado de la simulación al final de un tick, en arreglos compactos
+    (módulo array, expuestos como memoryview de solo lectura) en vez de
+    objetos Vehicle vivos. No se modifica después
+    de creada: cualquier hilo puede leerla sin locks mientras la simulación
+    sigue avanzando y construyendo la siguiente.
+
+    Vehículos (mismo índice en todos los arreglos):
+        ids, xs, ys, wait_times, horizontal (0/1), waiting (0/1)
+    Semáforos: tupla de (id, x, y, estado NS, estado EO)
+    """
+    __slots__ = ("tick", "time", "run", "network_version", "ids", "xs", "ys", "wait_times",
+                 "horizontal", "waiting", "lights", "total_spawned", "total_completed",
+                 "total_wait_completed", "is_optimized")
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SimulationSnapshot es inmutable")
+
+    @classmethod
+    def capture(cls, simulation, tick=0):
+        """Copia el estado actual de `simulation` (llamar desde el hilo del tick)"""
+        vehicles = simulation.vehicles
+        ids, xs, ys = array('l'), array('d'), array('d')
+        wait_times, horizontal, waiting = array('d'), array('b'), array('b')
+        for v in vehicles:
+            ids.append(v.id)
+            xs.append(v.x)
+            ys.append(v.y)
+            wait_times.append(v.wait_time)
+            horizontal.append(abs(v.direction[0]) > abs(v.direction[1]))
+            waiting.append(v.waiting)
+
+        now = simulation.current_time
+        lights = tuple((light.id, light.x, light.y) + light.get_states(now)
+                       for light in simulation.traffic_lights)
+
+        # Vistas de solo lectura: la instantánea no puede modificarse por error
+        frozen = lambda a: memoryview(a).toreadonly()
+        return cls(tick=tick, time=now, run=simulation.run, network_version=simulation.network_version,
+                   ids=frozen(ids), xs=frozen(xs), ys=frozen(ys), wait_times=frozen(wait_times),
+                   horizontal=frozen(horizontal), waiting=frozen(waiting), lights=lights, total_spawned=simulation.total_spawned,
+                   total_completed=simulation.total_completed,
+                   total_wait_completed=simulation.total_wait_completed,
+                   is_optimized=simulation.is_optimized)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def statistics(self):
+        """Mismo diccionario que TrafficSimulation.get_statistics"""
+        n = len(self.ids)
+        avg_wait = sum(self.wait_times) / n if n else 0
+        return {
+            "total_vehicles": n,
+            "total_spawned": self.total_spawned,
+            "completed": self.total_completed,
+            "waiting": sum(self.waiting),
+            "avg_wait_time": round(avg_wait, 2),
+            "time": round(self.time, 1),
+            "optimized": "✅ Sí" if self.is_optimized else "❌ No"
+        }
+
+    def traffic_data(self):
+        """Colas y flujos por semáforo, como TrafficSimulation.get_real_traffic_data"""
+        data = {}
+        total_waiting = 0
+        total_moving = 0
+        xs, ys, waiting = self.xs, self.ys, self.waiting
+
+        for light_id, x, y, _, _ in self.lights:
+            queue = 0
+            flow = 0
+            for k in range(len(xs)):
+                dist = math.hypot(xs[k] - x, ys[k] - y)
+                if dist < Config.VEHICLE_DETECTION_RADIUS:
+                    if waiting[k]:
+                        queue += 1
+                        total_waiting += 1
+                    elif dist < 40:
+                        flow += 1
+                        total_moving += 1
+
+            # Valores mínimos garantizados
+            data[f"queue_{light_id}"] = max(queue, 1)
+            data[f"flow_{light_id}"] = max(flow, 1)
+
+        data["total_waiting"] = total_waiting
+        data["total_moving"] = total_moving
+        data["total_vehicles"] = len(xs)
+        return data
+
+
+class SnapshotBuffer:
+    """
+    Publicación por intercambio atómico de referencia: el escritor arma la
+    instantánea completa y recién entonces la asigna a `latest` (una sola
+    asignación de atributo, atómica en CPython). Los lectores toman
+    `latest` una vez por fotograma y nunca ven un estado a medias ni
+    frenan el tick.
+
+    Conserva las últimas `size` instantáneas (triple buffer por defecto)
+    para lectores que necesitan el fotograma anterior, p. ej. interpolar.
+    """
+
+    def __init__(self, size=Config.SNAPSHOT_BUFFERS):
+        self.size = size
+        self._ring = [None] * size
+        self._next = 0
+        self.latest = None
+
+    def publish(self, snapshot):
+        self._ring[self._next] = snapshot
+        self._next = (self._next + 1) % self.size
+        self.latest = snapshot
+
+    def recent(self):
+        """Instantáneas retenidas, de la más antigua a la más nueva"""
+        # Copia de la lista: el escritor puede seguir rotando mientras tanto
+        return sorted((s for s in self._ring[:] if s is not None), key=lambda s: s.tick)
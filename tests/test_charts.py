@@ -0,0 +1,36 @@
+# tests/test_charts.py - SUBMUESTREO INCREMENTAL DEL GRÁFICO EN VIVO
+"""
+    python -m pytest -q tests
+"""
+import random
+
+import pytest
+
+pytest.importorskip("tkinter")
+from gui.charts import LTTBStream
+
+
+def test_stream_matches_fresh_computation():
+    rng = random.Random(0)
+    stream = LTTBStream(50)
+    ys = []
+    for i in range(3000):
+        ys.append(rng.gauss(0, 1) + (40 if i == 1234 else 0))
+        stream.append(ys[-1])
+        if i % 97 == 0:
+            fresh = LTTBStream(50)
+            for y in ys:
+                fresh.append(y)
+            points = stream.points()
+            assert points == fresh.points()
+            assert len(points) <= 50
+            assert points[0][0] == 0 and points[-1][0] == len(ys) - 1
+
+    assert any(x == 1234 for x, _ in stream.points())  # El pico sobrevive al submuestreo
+
+
+def test_short_series_are_kept_whole():
+    stream = LTTBStream(50)
+    for y in range(30):
+        stream.append(float(y))
+    assert stream.points() == [(x, float(x)) for x in range(30)]
@@ -0,0 +1,98 @@
+# tests/test_fitness_regression.py - REGRESIÓN DE LOS ATAJOS DE EVALUACIÓN
+"""
+Cada atajo debe dar lo mismo que el cálculo directo:
+evaluación incremental del AG vs completa, DP por corredor vs fuerza bruta,
+y los evaluadores vectorizados (CTM, robusto) por lote vs plan a plan.
+
+    python -m pytest -q tests
+"""
+import itertools
+import random
+
+import pytest
+
+from config import Config
+from corridor_optimizer import CorridorOptimizer
+from genetic_algorithm import GeneticAlgorithm
+
+
+def _random_plan(rng, n=6):
+    return [[rng.randint(Config.GA_MIN_GREEN_TIME, Config.GA_MAX_GREEN_TIME),
+             rng.randint(0, Config.GA_CYCLE_TIME - 1)] for _ in range(n)]
+
+
+def _traffic_data(n=6):
+    data = {}
+    for i in range(n):
+        data[f"queue_{i}"] = i % 4
+        data[f"flow_{i}"] = (7 * i) % 5
+    return data
+
+
+# ==================== EVALUACIÓN INCREMENTAL ====================
+
+def test_delta_terms_match_full_evaluation():
+    ga = GeneticAlgorithm(6)
+    data = _traffic_data()
+    rng = random.Random(0)
+    for _ in range(500):
+        parent = _random_plan(rng)
+        parent_terms = ga._compute_terms(parent, data)
+        child = [g[:] for g in parent]
+        changed = set(rng.sample(range(6), rng.randint(0, 6)))
+        for i in changed:
+            child[i] = [rng.randint(Config.GA_MIN_GREEN_TIME, Config.GA_MAX_GREEN_TIME),
+                        rng.randint(0, Config.GA_CYCLE_TIME - 1)]
+
+        delta = ga._score_terms(ga._delta_terms(parent_terms, parent, child, changed))
+        full = ga._score_terms(ga._compute_terms(child, data))
+        assert delta == pytest.approx(full, abs=1e-9)
+
+
+# ==================== PROGRAMACIÓN DINÁMICA POR CORREDOR ====================
+
+@pytest.mark.parametrize("seed", range(3))
+def test_solve_chain_matches_brute_force(seed):
+    corridor = CorridorOptimizer(6)
+    rng = random.Random(seed)
+    chain = corridor.rows[0]
+    c = corridor.cycle_time
+    unary = [[rng.randint(0, 30) for _ in range(c)] for _ in chain]
+
+    cost, offsets = corridor.solve_chain(chain, corridor.h_cost, unary)
+
+    def total(combo):
+        value = sum(unary[k][o] for k, o in enumerate(combo))
+        return value + sum(corridor.h_cost[a][b] for a, b in zip(combo, combo[1:]))
+
+    best = min(total(combo) for combo in itertools.product(range(c), repeat=len(chain)))
+    assert cost == best
+    assert total(offsets) == best
+
+
+# ==================== EVALUADORES VECTORIZADOS ====================
+
+def test_ctm_batch_matches_single_plans():
+    pytest.importorskip("numpy")
+    from demand import DemandProfile
+    from optimizers.ctm import CTMEvaluator
+
+    evaluator = CTMEvaluator(DemandProfile.constant(0.4, 300))
+    rng = random.Random(1)
+    plans = [_random_plan(rng) for _ in range(5)]
+    batch = evaluator.evaluate(plans)
+    assert batch == [evaluator(plan) for plan in plans]
+    assert all(value >= 0 for value in batch)
+
+
+def test_robust_batch_matches_single_plans():
+    pytest.importorskip("numpy")
+    from demand import DemandProfile
+    from optimizers.robust_evaluation import RobustBatchEvaluator, ScenarioBatch
+
+    evaluator = RobustBatchEvaluator(ScenarioBatch(DemandProfile.constant(0.4, 30), scenarios=3))
+    rng = random.Random(2)
+    plans = [_random_plan(rng) for _ in range(3)]
+    batch = evaluator.delays(plans)
+    for k, plan in enumerate(plans):
+        assert evaluator.delays([plan])[0].tolist() == pytest.approx(batch[k].tolist())
@@ -0,0 +1,32 @@
+# tests/test_plan_cache.py - CACHÉ DE PLANES POR HUELLA DEL TRÁFICO
+"""
+    python -m pytest -q tests
+"""
+from plan_cache import PlanCache, plan_score
+
+DATA = {}
+for i in range(6):
+    DATA[f"queue_{i}"] = 4 + i
+    DATA[f"flow_{i}"] = 2
+GOOD = [[35, 10 * i] for i in range(6)]
+BAD = [[25, 0] for _ in range(6)]
+
+
+def test_store_keeps_the_better_plan_by_noise_free_score():
+    assert plan_score(DATA, GOOD) < plan_score(DATA, BAD)
+    assert plan_score(DATA, GOOD) == plan_score(DATA, GOOD)  # Sin ruido: repetible
+
+    cache = PlanCache(path=None)
+    cache.store(DATA, BAD)
+    cache.store(DATA, GOOD)
+    cache.store(DATA, BAD)  # No reemplaza a uno mejor
+    hit = cache.lookup(DATA)
+    assert hit["plan"] == GOOD
+    assert hit["fitness"] == plan_score(DATA, GOOD)
+
+
+def test_cache_roundtrip(tmp_path):
+    path = str(tmp_path / "plan_cache.json")
+    PlanCache(path=path).store(DATA, GOOD)
+    hit = PlanCache(path=path).lookup(DATA)
+    assert hit["plan"] == GOOD and hit["distance"] == 0
@@ -0,0 +1,43 @@
+# tests/test_timetable.py - HORARIO DE PLANES EN UNA SIMULACIÓN EN MARCHA
+"""
+    python -m pytest -q tests
+"""
+import random
+
+from config import Config
+from plan_scheduler import PlanTimetable
+from traffic_simulation import TrafficSimulation
+
+PLANS = [[[30, 0]] * 6, [[45, 20]] * 6]
+
+
+def test_timetable_roundtrip(tmp_path):
+    path = tmp_path / "horario.json"
+    PlanTimetable(5.0, PLANS, [1.0, 2.0]).save(path)
+    loaded = PlanTimetable.load(path)
+    assert loaded.period_seconds == 5.0
+    assert loaded.plans == PLANS
+    assert [loaded.index_at(t) for t in (0, 4.9, 5.0, 99)] == [0, 0, 1, 1]
+
+
+def test_period_boundary_triggers_retime():
+    simulation = TrafficSimulation(total_vehicles=5, rng=random.Random(0), snapshots=False)
+    simulation.start()
+    simulation.set_timetable(PlanTimetable(5.0, PLANS))
+    assert simulation.period == 0
+    assert [light.green_time for light in simulation.traffic_lights] == [30] * 6
+
+    calls = []
+    retime = simulation.retime
+    simulation.retime = lambda plan: (calls.append(plan), retime(plan))
+
+    dt = Config.SIM_TIMESTEP
+    while simulation.current_time < 4.5:
+        simulation.update(dt)
+    assert calls == []
+
+    while simulation.current_time < 5.5:
+        simulation.update(dt)
+    assert calls == [PLANS[1]]
+    assert simulation.period == 1
+    assert [list(light.planned) for light in simulation.traffic_lights] == PLANS[1]
@@ -1,12 +1,20 @@
 # traffic_simulation.py - VERSIÓN CON DEPURACIÓN
+import logging
 import random
-import math
+import time
 from models.vehicle import Vehicle
 from models.traffic_light import TrafficLight
+from snapshot import SimulationSnapshot, SnapshotBuffer
+from profiling import PROFILER
 from config import Config
 
+log = logging.getLogger(__name__)
+
 class TrafficSimulation:
-    def __init__(self, total_vehicles=20):
+    def __init__(self, total_vehicles=20, rng=None, snapshots=True, demand=None):
+        # Generador aleatorio propio: con random.Random(semilla) la demanda es
+        # reproducible (números aleatorios comunes entre planes candidatos)
+        self.rng = rng if rng is not None else random
         self.total_vehicles_initial = total_vehicles
         self.spawn_rate_infinite = 0.5
         self.vehicles = []
@@ -19,51 +27,81 @@ class TrafficSimulation:
         self.is_optimized = False
         self.total_spawned = 0
         self.total_completed = 0
+        self.total_wait_completed = 0.0
+        self.network_version = 0  # Cambia cada vez que se recrean los semáforos
+        self.run = 0              # Cambia cuando se reinician los ids de vehículos
+        self.tick = 0
+        # Instantánea inmutable publicada al final de cada tick (ver snapshot.py);
+        # las simulaciones sin interfaz pueden desactivarla
+        self.snapshots = SnapshotBuffer() if snapshots else None
+        self.metrics = None  # MetricsExporter opcional (ver metrics.py)
+        self.actuated = False  # Semáforos actuados por detectores (ver set_actuated)
+        self.retiming = False  # Algún semáforo en transición hacia un plan nuevo (ver retime)
+        # Calendario de llegadas pre-muestreado (demand.ArrivalSchedule); si es
+        # None se usa la generación aleatoria tick a tick de siempre
+        self.demand = demand
+        # Horario de planes por período (plan_scheduler.PlanTimetable), opcional
+        self.timetable = None
+        self.period = None
         self._create_traffic_lights()
+        self.publish_snapshot()
 
     def _create_traffic_lights(self):
         """Crea semáforos DESORGANIZADOS al inicio"""
         self.traffic_lights = []
+        self.network_version += 1
         for inter in Config.INTERSECTIONS:
             iid = inter['id']
             is_north_south = iid in [0, 1, 2]  # S0-S2: vertical, S3-S5: horizontal
             
             # VALORES ALEATORIOS DESORGANIZADOS
-            green_time = random.randint(20, 50)
-            offset = random.randint(0, 59)
+            green_time = self.rng.randint(20, 50)
+            offset = self.rng.randint(0, 59)
             
             light = TrafficLight(iid, inter['x'], inter['y'], green_time, offset, is_north_south)
+            if self.actuated:
+                light.set_actuated(True, self.current_time)
             self.traffic_lights.append(light)
         
-        print(f"🚦 Semáforos creados: {len(self.traffic_lights)} con configuraciones aleatorias")
+        log.debug("🚦 Semáforos creados: %d con configuraciones aleatorias", len(self.traffic_lights))
 
     def start(self):
         self.is_running = True
         self.current_time = 0.0
+        if self.demand is not None:
+            self.demand.rewind()  # Misma demanda desde el inicio
         self.next_spawn_time = 1.5
-        print("▶️ Simulación iniciada")
+        self.publish_snapshot()
+        log.info("▶️ Simulación iniciada")
 
     def stop(self):
         self.is_running = False
-        print("⏹️ Simulación detenida")
+        log.info("⏹️ Simulación detenida")
 
     def reset(self):
         """Reinicia completamente la simulación"""
         self.vehicles.clear()
         self.vehicle_id_counter = 0
         self.current_time = 0.0
+        if self.demand is not None:
+            self.demand.rewind()  # Misma demanda desde el inicio
         self.next_spawn_time = 0.0
         self.total_spawned = 0
         self.total_completed = 0
+        self.total_wait_completed = 0.0
         self.is_optimized = False
+        self.run += 1
         self._create_traffic_lights()
-        print("🔄 Simulación reiniciada completamente")
+        if self.timetable is not None:
+            self.set_timetable(self.timetable)
+        self.publish_snapshot()
+        log.info("🔄 Simulación reiniciada completamente")
 
     def apply_optimization(self, solution):
         """
         APLICA LA SOLUCIÓN DEL AG Y REINICIA LA SIMULACIÓN VISUALMENTE
         """
-        print("🎯 Aplicando optimización del algoritmo genético...")
+        log.info("🎯 Aplicando optimización del algoritmo genético...")
         
         # 1. Aplicar nueva configuración a los semáforos
         for i, light in enumerate(self.traffic_lights):
@@ -71,26 +109,79 @@ class TrafficSimulation:
                 new_green = max(20, min(55, int(solution[i][0])))
                 new_offset = int(solution[i][1]) % 60
                 
-                print(f"   Semáforo S{i}: {light.green_time}s→{new_green}s, "
-                      f"offset {light.offset}→{new_offset}")
+                log.debug("   Semáforo S%d: %ss→%ss, offset %s→%s",
+                          i, light.green_time, new_green, light.offset, new_offset)
                 
                 light.green_time = new_green
                 light.offset = new_offset
+                light.cancel_retime()  # Reemplaza cualquier transición pendiente
         
         # 2. REINICIAR SIMULACIÓN VISUAL
         self.vehicles.clear()
         self.vehicle_id_counter = 0
         self.current_time = 0.0
+        if self.demand is not None:
+            self.demand.rewind()  # Misma demanda desde el inicio
         self.next_spawn_time = 0.5
         self.total_spawned = 0
         self.total_completed = 0
+        self.total_wait_completed = 0.0
         self.is_optimized = True
+        self.retiming = False
+        self.timetable = None  # Un plan puesto a mano reemplaza al horario
+        self.run += 1
+        if self.actuated:
+            self.set_actuated(True)  # El reloj volvió a 0: reiniciar desde el nuevo plan
+        self.publish_snapshot()
         
-        print("✅ Optimización aplicada - Simulación reiniciada")
+        log.info("✅ Optimización aplicada - Simulación reiniciada")
+
+    def retime(self, solution):
+        """
+        Aplica un plan SIN reiniciar: cada semáforo adopta el verde nuevo en
+        su próximo inicio de ciclo y acerca el offset de a poco (ver
+        TrafficLight.advance_transition). Los vehículos siguen circulando.
+        """
+        for light, (green, offset) in zip(self.traffic_lights, solution):
+            light.retime(max(20, min(55, int(green))), int(offset))
+        self.retiming = True
+        self.is_optimized = True
 
-    def spawn_vehicle(self):
-        lane_idx = random.randint(0, len(Config.LANES) - 1)
-        vehicle = Vehicle(self.vehicle_id_counter, lane_idx, lane_idx, self.current_time, self)
+    def set_timetable(self, timetable):
+        """
+        Sigue un horario de planes (ver plan_scheduler.py): el plan del
+        período actual se aplica de inmediato y los siguientes con retime
+        en cada límite de período. None vuelve al plan fijo vigente.
+        """
+        self.timetable = timetable
+        self.period = None
+        if timetable is None:
+            return
+        self.period = timetable.index_at(self.current_time)
+        for light, (green, offset) in zip(self.traffic_lights, timetable.plans[self.period]):
+            light.green_time = max(20, min(55, int(green)))
+            light.offset = int(offset) % light.cycle_time
+            light.cancel_retime()
+            if light.actuated:
+                light.set_actuated(True, self.current_time)
+        self.retiming = False
+        self.is_optimized = True
+
+    def set_actuated(self, actuated):
+        """
+        Cambia entre plan fijo y control actuado. En modo actuado el plan
+        (verde y offset del AG) es la línea base: fija la fase inicial y el
+        verde máximo, y los detectores alargan o cortan cada verde.
+        """
+        self.actuated = actuated
+        for light in self.traffic_lights:
+            light.set_actuated(actuated, self.current_time)
+        log.info("🚦 Semáforos en modo %s", "actuado" if actuated else "de tiempo fijo")
+
+    def spawn_vehicle(self, lane_start=None, lane_end=None):
+        if lane_start is None:
+            lane_start = lane_end = self.rng.randint(0, len(Config.LANES) - 1)
+        vehicle = Vehicle(self.vehicle_id_counter, lane_start, lane_end, self.current_time, self)
         self.vehicles.append(vehicle)
         self.vehicle_id_counter += 1
         self.total_spawned += 1
@@ -98,67 +189,109 @@ class TrafficSimulation:
     def update(self, dt):
         if not self.is_running:
             return
+        laps = PROFILER.laps("simulation.update")  # None si el perfilado está apagado
+        previous_time = self.current_time
         self.current_time += dt
 
+        if self.demand is not None:
+            for origin, destination in self.demand.due(self.current_time):
+                self.spawn_vehicle(origin, destination)
         # Spawn inicial de vehículos
-        if self.total_spawned < self.total_vehicles_initial:
+        elif self.total_spawned < self.total_vehicles_initial:
             if self.current_time >= self.next_spawn_time:
                 self.spawn_vehicle()
                 self.next_spawn_time = self.current_time + self.spawn_interval
         else:
             # Spawn continuo después del inicial
             if self.current_time >= self.next_spawn_time:
-                if random.random() < self.spawn_rate_infinite:
+                if self.rng.random() < self.spawn_rate_infinite:
                     self.spawn_vehicle()
-                self.next_spawn_time = self.current_time + random.uniform(1.7, 2.9)
+                self.next_spawn_time = self.current_time + self.rng.uniform(1.7, 2.9)
+        if laps:
+            laps.lap("spawn")
+
+        # Horario de planes: al cambiar de período, transición al plan siguiente
+        if self.timetable is not None:
+            period = self.timetable.index_at(self.current_time)
+            if period != self.period:
+                self.period = period
+                self.retime(self.timetable.plans[period])
+
+        # Transición hacia un plan nuevo en los límites de ciclo
+        if self.retiming:
+            self.retiming = False
+            for light in self.traffic_lights:
+                if light.retiming:
+                    light.advance_transition(previous_time, self.current_time)
+                    self.retiming |= light.retiming
+
+        # Controladores actuados: O(1) por semáforo
+        if self.actuated:
+            for light in self.traffic_lights:
+                light.advance(dt)
+            if laps:
+                laps.lap("signals")
 
         # Actualizar vehículos
-        for vehicle in self.vehicles[:]:
-            vehicle.update(dt)
-            if vehicle.completed:
-                self.vehicles.remove(vehicle)
-                self.total_completed += 1
+        if laps is None:
+            for vehicle in self.vehicles:
+                vehicle.update(dt)
+        else:
+            # Igual que Vehicle.update, separando la búsqueda del semáforo
+            lookup = 0.0
+            for vehicle in self.vehicles:
+                if vehicle.has_arrived():
+                    continue
+                t = time.perf_counter()
+                light = vehicle.get_nearest_light()
+                lookup += time.perf_counter() - t
+                vehicle.step(dt, light)
+            laps.add("light_lookup", lookup)
+            laps.lap("movement", exclude=lookup)
+
+        # Retirar los que llegaron (una pasada, mismo orden)
+        if any(vehicle.completed for vehicle in self.vehicles):
+            remaining = []
+            for vehicle in self.vehicles:
+                if vehicle.completed:
+                    self.total_completed += 1
+                    self.total_wait_completed += vehicle.wait_time
+                else:
+                    remaining.append(vehicle)
+            self.vehicles[:] = remaining
+        if laps:
+            laps.lap("removal")
+
+        self.tick += 1
+        self.publish_snapshot()
+        if self.metrics is not None:
+            self.metrics.observe(self)
+        if laps:
+            laps.lap("snapshot")
+            laps.finish()
+
+    def publish_snapshot(self):
+        """Publica el estado actual como instantánea inmutable (fin del tick)"""
+        if self.snapshots is not None:
+            self.snapshots.publish(SimulationSnapshot.capture(self, self.tick))
+
+    @property
+    def snapshot(self):
+        """Última instantánea publicada (o una nueva si están desactivadas)"""
+        if self.snapshots is None:
+            return SimulationSnapshot.capture(self, self.tick)
+        return self.snapshots.latest
 
     def get_real_traffic_data(self):
         """Obtiene datos REALES del tráfico actual para el AG"""
-        print(f"\n📊 OBTENIENDO DATOS DE TRÁFICO PARA AG")
-        print(f"   Vehículos en simulación: {len(self.vehicles)}")
-        
-        data = {}
-        total_waiting = 0
-        total_moving = 0
-        
-        for light in self.traffic_lights:
-            x, y = light.x, light.y
-            queue = 0
-            flow = 0
-            
-            for v in self.vehicles:
-                dist = math.hypot(v.x - x, v.y - y)
-                if dist < 80:  # Radio de detección
-                    if v.waiting:
-                        queue += 1
-                        total_waiting += 1
-                    elif dist < 40:
-                        flow += 1
-                        total_moving += 1
-            
-            # Valores mínimos garantizados
-            queue = max(queue, 1)
-            flow = max(flow, 1)
-            
-            data[f"queue_{light.id}"] = queue
-            data[f"flow_{light.id}"] = flow
-            
-            print(f"   S{light.id}: {queue} en cola, {flow} en movimiento")
-        
-        # Métricas globales
-        data["total_waiting"] = total_waiting
-        data["total_moving"] = total_moving
-        data["total_vehicles"] = len(self.vehicles)
-        
-        print(f"   Total: {total_waiting} esperando, {total_moving} en movimiento")
-        print(f"📦 Datos enviados al AG: {len(data)} valores\n")
+        snapshot = self.snapshot
+        data = snapshot.traffic_data()
+
+        log.info("📊 Datos de tráfico para el AG: %d vehículos, %s esperando, %s en movimiento",
+                 len(snapshot), data['total_waiting'], data['total_moving'])
+        for light_id, _, _, _, _ in snapshot.lights:
+            log.debug("   S%s: %s en cola, %s en movimiento",
+                      light_id, data[f'queue_{light_id}'], data[f'flow_{light_id}'])
         
         return data
 
@@ -189,22 +322,30 @@ class TrafficSimulation:
         for vehicle in self.vehicles:
             vehicle.draw(canvas)
 
-    def _draw_roads(self, canvas):
-        """Dibuja las carreteras con líneas amarillas"""
+    def _draw_roads(self, canvas, width=Config.CANVAS_WIDTH, height=Config.CANVAS_HEIGHT, tags=(),
+                    x0=0, y0=0):
+        """Dibuja las carreteras con líneas amarillas entre (x0, y0) y (width, height)"""
         # Carreteras horizontales
         for y in [200, 450]:
-            canvas.create_rectangle(0, y-35, Config.CANVAS_WIDTH, y+35, fill="#2c3e50")
+            canvas.create_rectangle(x0, y-35, width, y+35, fill="#2c3e50", tags=tags)
         
         # Carreteras verticales
         for x in [250, 550, 850]:
-            canvas.create_rectangle(x-35, 0, x+35, Config.CANVAS_HEIGHT, fill="#2c3e50")
+            canvas.create_rectangle(x-35, y0, x+35, height, fill="#2c3e50", tags=tags)
         
-        # Líneas amarillas horizontales
+        # Líneas amarillas horizontales (alineadas a la grilla de 40 px del mundo)
         for y in [200, 450]:
-            for i in range(0, Config.CANVAS_WIDTH, 40):
-                canvas.create_line(i, y, i+20, y, fill="#ffeb3b", width=4)
+            for i in range(int(x0 // 40) * 40, int(width), 40):
+                canvas.create_line(i, y, i+20, y, fill="#ffeb3b", width=4, tags=tags)
         
         # Líneas amarillas verticales
         for x in [250, 550, 850]:
-            for i in range(0, Config.CANVAS_HEIGHT, 40):
-                canvas.create_line(x, i, x, i+20, fill="#ffeb3b", width=4)
\ No newline at end of file
+            for i in range(int(y0 // 40) * 40, int(height), 40):
+                canvas.create_line(x, i, x, i+20, fill="#ffeb3b", width=4, tags=tags)
+
+    def draw_static(self, canvas, width=Config.CANVAS_WIDTH, height=Config.CANVAS_HEIGHT,
+                    tags=(), label_tags=None, x0=0, y0=0):
+        """Capa que no cambia durante la corrida: carreteras y etiquetas"""
+        self._draw_roads(canvas, width, height, tags, x0, y0)
+        for light in self.traffic_lights:
+            light.draw_labels(canvas, tags if label_tags is None else label_tags)